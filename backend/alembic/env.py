@@ -17,6 +17,22 @@ from src.config import settings  # noqa: E402
 target_metadata = Base.metadata
 
 
+def _is_partition(table_name: str) -> bool:
+    # City partitions are named <table>__<city> and created by add_city(), not by models.
+    return "__" in table_name
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table":
+        return not (reflected and _is_partition(name))
+    if type_ == "index" and reflected:
+        return not _is_partition(obj.table.name)
+    if type_ == "foreign_key_constraint" and reflected:
+        # Postgres clones foreign keys onto the partitions of the referenced table.
+        return not _is_partition(obj.referred_table.name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = settings.DB.url_sync
@@ -26,6 +42,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -33,7 +50,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,164 @@
+"""district_summary as a table refreshed after loads; room for HOT indicator_latest updates
+
+Revision ID: 5c1d8e3a9f24
+Revises: a3d8e6f19c27
+Create Date: 2026-10-18 16:02:37.104518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d8e3a9f24'
+down_revision: Union[str, None] = 'a3d8e6f19c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUMMARY_COLUMNS = (
+    'city',
+    'district_id',
+    'name',
+    'code',
+    'district_type',
+    'normalized_score',
+    'rhythm_score',
+    'green_life_score',
+    'digital_noise_score',
+    'social_availability_score',
+    'life_balance_score',
+    'safety_index',
+    'safety_level',
+    'traffic_morning',
+    'traffic_noon',
+    'traffic_evening',
+    'traffic_night',
+    'refreshed_at',
+)
+
+
+def _summary_select(where: str = "") -> str:
+    """One row per district: the newest headline scores and daypart traffic of its latest periods."""
+    def latest(table: str, column: str) -> str:
+        return (
+            f"(SELECT {column} FROM {table} t WHERE t.city = d.city AND t.district_id = d.id "
+            f"AND t.period = (SELECT l.period FROM indicator_latest l "
+            f"WHERE l.city = d.city AND l.indicator = '{table}' AND l.district_id = d.id) "
+            f"ORDER BY t.id DESC LIMIT 1) AS {column}"
+        )
+
+    def daypart(name: str) -> str:
+        return (
+            f"(array_agg(a.score_0_100 ORDER BY a.id DESC) "
+            f"FILTER (WHERE lower(a.daypart) = '{name}' AND a.score_0_100 IS NOT NULL))[1] AS traffic_{name}"
+        )
+
+    return f"""
+        SELECT
+            d.city,
+            d.id AS district_id,
+            d.name,
+            d.code,
+            d.district_type,
+            {latest('social_life', 'normalized_score')},
+            {latest('district_rhythm', 'rhythm_score')},
+            {latest('green_places', 'green_life_score')},
+            {latest('digital_noise', 'digital_noise_score')},
+            {latest('social_availability', 'social_availability_score')},
+            {latest('life_balance', 'life_balance_score')},
+            {latest('safety', 'safety_index')},
+            {latest('safety', 'safety_level')},
+            agg.traffic_morning,
+            agg.traffic_noon,
+            agg.traffic_evening,
+            agg.traffic_night,
+            now() AS refreshed_at
+        FROM districts d
+        LEFT JOIN LATERAL (
+            SELECT {daypart('morning')}, {daypart('noon')}, {daypart('evening')}, {daypart('night')}
+            FROM district_aggregates a
+            WHERE a.city = d.city AND a.district_id = d.id
+            AND a.period = (SELECT l.period FROM indicator_latest l
+                            WHERE l.city = d.city AND l.indicator = 'district_aggregates' AND l.district_id = d.id)
+        ) agg ON true
+        {where}
+    """
+
+
+def upgrade() -> None:
+    # A materialized view can only be rebuilt whole, and the dataset_version trigger did
+    # that (CONCURRENTLY, for every city) inside each load's transaction. The table is
+    # refreshed instead for just the districts a load wrote.
+    op.execute("DROP TRIGGER IF EXISTS dataset_version_refresh_summary ON dataset_version")
+    op.execute("DROP FUNCTION IF EXISTS refresh_district_summary()")
+    op.execute("DROP MATERIALIZED VIEW district_summary")
+
+    op.create_table('district_summary',
+    sa.Column('district_id', postgresql.BIGINT(), autoincrement=False, nullable=False),
+    sa.Column('city', sa.String(length=32), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('code', sa.String(length=100), nullable=False),
+    sa.Column('district_type', postgresql.ENUM(name='district_type', create_type=False), nullable=True),
+    sa.Column('normalized_score', sa.Float(), nullable=True),
+    sa.Column('rhythm_score', sa.Float(), nullable=True),
+    sa.Column('green_life_score', sa.Float(), nullable=True),
+    sa.Column('digital_noise_score', sa.Float(), nullable=True),
+    sa.Column('social_availability_score', sa.Float(), nullable=True),
+    sa.Column('life_balance_score', sa.Float(), nullable=True),
+    sa.Column('safety_index', sa.Float(), nullable=True),
+    sa.Column('safety_level', sa.String(), nullable=True),
+    sa.Column('traffic_morning', sa.Float(), nullable=True),
+    sa.Column('traffic_noon', sa.Float(), nullable=True),
+    sa.Column('traffic_evening', sa.Float(), nullable=True),
+    sa.Column('traffic_night', sa.Float(), nullable=True),
+    sa.Column('refreshed_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('district_id')
+    )
+    op.create_index(op.f('ix_district_summary_city'), 'district_summary', ['city'], unique=False)
+
+    # Rows of p_city's districts in p_districts (all of them when NULL) are rebuilt; rows
+    # of districts that no longer exist are dropped.
+    columns = ', '.join(SUMMARY_COLUMNS)
+    op.execute(f"""
+        CREATE FUNCTION refresh_district_summary(p_city text, p_districts bigint[] DEFAULT NULL)
+        RETURNS void LANGUAGE sql AS $$
+            DELETE FROM district_summary
+            WHERE city = p_city AND (p_districts IS NULL OR district_id IN (SELECT unnest(p_districts)));
+            INSERT INTO district_summary ({columns})
+            {_summary_select("WHERE d.city = p_city AND (p_districts IS NULL OR d.id IN (SELECT unnest(p_districts)))")};
+        $$
+    """)
+    op.execute("SELECT refresh_district_summary(code) FROM cities")
+
+    # A load moves every loaded district's pointer to the new period. With free space on
+    # the page that is a HOT update, which skips the primary key index; CLUSTER rewrites
+    # the existing rows with it.
+    op.execute("ALTER TABLE indicator_latest SET (fillfactor = 50)")
+    op.execute("CLUSTER indicator_latest USING indicator_latest_pkey")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE indicator_latest RESET (fillfactor)")
+
+    op.execute("DROP FUNCTION IF EXISTS refresh_district_summary(text, bigint[])")
+    op.drop_index(op.f('ix_district_summary_city'), table_name='district_summary')
+    op.drop_table('district_summary')
+
+    op.execute(f"CREATE MATERIALIZED VIEW district_summary AS {_summary_select()} WITH DATA")
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+    op.execute("""
+        CREATE FUNCTION refresh_district_summary() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW CONCURRENTLY district_summary;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER dataset_version_refresh_summary
+        AFTER INSERT OR UPDATE ON dataset_version
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_district_summary()
+    """)
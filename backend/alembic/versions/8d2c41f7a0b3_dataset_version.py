@@ -0,0 +1,32 @@
+"""dataset version
+
+Revision ID: 8d2c41f7a0b3
+Revises: 360fb2fa1e6f
+Create Date: 2026-10-16 09:12:41.402113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2c41f7a0b3'
+down_revision: Union[str, None] = '360fb2fa1e6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dataset_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BIGINT(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO dataset_version (id, version) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    op.drop_table('dataset_version')
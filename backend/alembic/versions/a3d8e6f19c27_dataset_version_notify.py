@@ -0,0 +1,39 @@
+"""notify API processes when a city's dataset version changes
+
+Revision ID: a3d8e6f19c27
+Revises: f7c2a9d4b816
+Create Date: 2026-10-18 10:24:06.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8e6f19c27'
+down_revision: Union[str, None] = 'f7c2a9d4b816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Delivered when the writing transaction commits; the payload is the city code.
+    op.execute("""
+        CREATE FUNCTION notify_dataset_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('dataset_version', NEW.city);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER dataset_version_notify
+        AFTER INSERT OR UPDATE ON dataset_version
+        FOR EACH ROW EXECUTE FUNCTION notify_dataset_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS dataset_version_notify ON dataset_version")
+    op.execute("DROP FUNCTION IF EXISTS notify_dataset_version()")
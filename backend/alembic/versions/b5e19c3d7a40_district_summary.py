@@ -0,0 +1,86 @@
+"""district summary
+
+Revision ID: b5e19c3d7a40
+Revises: 8d2c41f7a0b3
+Create Date: 2026-10-16 14:03:27.918350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e19c3d7a40'
+down_revision: Union[str, None] = '8d2c41f7a0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _latest(table: str, column: str) -> str:
+    return f"(SELECT {column} FROM {table} t WHERE t.district_id = d.id ORDER BY t.id DESC LIMIT 1) AS {column}"
+
+
+def _daypart(daypart: str) -> str:
+    return (
+        f"(array_agg(a.score_0_100 ORDER BY a.id DESC) "
+        f"FILTER (WHERE lower(a.daypart) = '{daypart}' AND a.score_0_100 IS NOT NULL))[1] AS traffic_{daypart}"
+    )
+
+
+def upgrade() -> None:
+    # One row per district: the newest headline score of every indicator plus per-daypart traffic.
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW district_summary AS
+        SELECT
+            d.id AS district_id,
+            d.name,
+            d.code,
+            d.district_type,
+            {_latest('social_life', 'normalized_score')},
+            {_latest('district_rhythm', 'rhythm_score')},
+            {_latest('green_places', 'green_life_score')},
+            {_latest('digital_noise', 'digital_noise_score')},
+            {_latest('social_availability', 'social_availability_score')},
+            {_latest('life_balance', 'life_balance_score')},
+            {_latest('safety', 'safety_index')},
+            {_latest('safety', 'safety_level')},
+            agg.traffic_morning,
+            agg.traffic_noon,
+            agg.traffic_evening,
+            agg.traffic_night,
+            now() AS refreshed_at
+        FROM districts d
+        LEFT JOIN LATERAL (
+            SELECT
+                {_daypart('morning')},
+                {_daypart('noon')},
+                {_daypart('evening')},
+                {_daypart('night')}
+            FROM district_aggregates a
+            WHERE a.district_id = d.id
+        ) agg ON true
+        WITH DATA
+    """)
+    # Unique index: the primary-key lookup, and a requirement for REFRESH ... CONCURRENTLY.
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+    # Every load bumps dataset_version, so the summary is rebuilt inside the load's transaction.
+    op.execute("""
+        CREATE FUNCTION refresh_district_summary() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW CONCURRENTLY district_summary;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER dataset_version_refresh_summary
+        AFTER INSERT OR UPDATE ON dataset_version
+        FOR EACH STATEMENT EXECUTE FUNCTION refresh_district_summary()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS dataset_version_refresh_summary ON dataset_version")
+    op.execute("DROP FUNCTION IF EXISTS refresh_district_summary()")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS district_summary")
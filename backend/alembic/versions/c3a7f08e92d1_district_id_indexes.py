@@ -0,0 +1,65 @@
+"""district_id indexes and BIGINT foreign keys
+
+Revision ID: c3a7f08e92d1
+Revises: b5e19c3d7a40
+Create Date: 2026-10-16 16:21:09.553071
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7f08e92d1'
+down_revision: Union[str, None] = 'b5e19c3d7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICATOR_TABLES = (
+    'social_life',
+    'district_rhythm',
+    'green_places',
+    'digital_noise',
+    'social_availability',
+    'life_balance',
+    'safety',
+)
+
+
+def _recreate_summary(alter) -> None:
+    """district_summary reads district_id, so it has to be dropped around a type change."""
+    definition = op.get_bind().execute(
+        sa.text("SELECT pg_get_viewdef('district_summary'::regclass)")
+    ).scalar_one()
+    op.execute("DROP MATERIALIZED VIEW district_summary")
+    alter()
+    op.execute(f"CREATE MATERIALIZED VIEW district_summary AS {definition.rstrip().rstrip(';')} WITH DATA")
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+
+
+def upgrade() -> None:
+    def alter() -> None:
+        for table in INDICATOR_TABLES:
+            # The primary key already indexes id.
+            op.drop_index(op.f(f'ix_{table}_id'), table_name=table)
+            op.alter_column(table, 'district_id', existing_type=sa.Integer(), type_=sa.BIGINT(), existing_nullable=False)
+            op.create_index(f'ix_{table}_district_id', table, ['district_id', 'id'], unique=False)
+
+    _recreate_summary(alter)
+    op.create_index(
+        'ix_district_aggregates_district_id_daypart', 'district_aggregates', ['district_id', 'daypart'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_district_aggregates_district_id_daypart', table_name='district_aggregates')
+
+    def alter() -> None:
+        for table in INDICATOR_TABLES:
+            op.drop_index(f'ix_{table}_district_id', table_name=table)
+            op.alter_column(table, 'district_id', existing_type=sa.BIGINT(), type_=sa.Integer(), existing_nullable=False)
+            op.create_index(op.f(f'ix_{table}_id'), table, ['id'], unique=False)
+
+    _recreate_summary(alter)
@@ -0,0 +1,229 @@
+"""cities and city-partitioned district tables
+
+Revision ID: e41b7d9c05a2
+Revises: c3a7f08e92d1
+Create Date: 2026-10-16 18:47:52.206114
+
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7d9c05a2'
+down_revision: Union[str, None] = 'c3a7f08e92d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_CITY = 'warszawa'
+
+INDICATOR_TABLES = (
+    'social_life',
+    'district_rhythm',
+    'green_places',
+    'digital_noise',
+    'social_availability',
+    'life_balance',
+    'safety',
+    'district_aggregates',
+)
+
+
+def _index_names(table: str) -> List[str]:
+    return list(
+        op.get_bind().execute(
+            sa.text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"),
+            {"t": table},
+        ).scalars()
+    )
+
+
+def _columns(table: str) -> List[str]:
+    return list(
+        op.get_bind().execute(
+            sa.text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = :t ORDER BY ordinal_position"
+            ),
+            {"t": table},
+        ).scalars()
+    )
+
+
+def _set_aside(table: str) -> None:
+    """Rename ``table`` and its indexes (and so its constraints) out of the way of the replacement."""
+    op.execute(f'ALTER TABLE {table} RENAME TO {table}__legacy')
+    for index in _index_names(f'{table}__legacy'):
+        op.execute(f'ALTER INDEX {index} RENAME TO {index}__legacy')
+
+
+def _indicator_indexes(table: str) -> None:
+    if table == 'district_aggregates':
+        op.create_index('ix_district_aggregates_district_id_daypart', table, ['district_id', 'daypart'])
+    else:
+        op.create_index(f'ix_{table}_district_id', table, ['district_id', 'id'])
+
+
+def _summary_sql(city_column: bool) -> str:
+    scope = "t.city = d.city AND " if city_column else ""
+
+    def latest(table: str, column: str) -> str:
+        return (
+            f"(SELECT {column} FROM {table} t WHERE {scope}t.district_id = d.id "
+            f"ORDER BY t.id DESC LIMIT 1) AS {column}"
+        )
+
+    def daypart(name: str) -> str:
+        return (
+            f"(array_agg(a.score_0_100 ORDER BY a.id DESC) "
+            f"FILTER (WHERE lower(a.daypart) = '{name}' AND a.score_0_100 IS NOT NULL))[1] AS traffic_{name}"
+        )
+
+    return f"""
+        CREATE MATERIALIZED VIEW district_summary AS
+        SELECT
+            {"d.city," if city_column else ""}
+            d.id AS district_id,
+            d.name,
+            d.code,
+            d.district_type,
+            {latest('social_life', 'normalized_score')},
+            {latest('district_rhythm', 'rhythm_score')},
+            {latest('green_places', 'green_life_score')},
+            {latest('digital_noise', 'digital_noise_score')},
+            {latest('social_availability', 'social_availability_score')},
+            {latest('life_balance', 'life_balance_score')},
+            {latest('safety', 'safety_index')},
+            {latest('safety', 'safety_level')},
+            agg.traffic_morning,
+            agg.traffic_noon,
+            agg.traffic_evening,
+            agg.traffic_night,
+            now() AS refreshed_at
+        FROM districts d
+        LEFT JOIN LATERAL (
+            SELECT {daypart('morning')}, {daypart('noon')}, {daypart('evening')}, {daypart('night')}
+            FROM district_aggregates a
+            WHERE {scope.replace('t.', 'a.')}a.district_id = d.id
+        ) agg ON true
+        WITH DATA
+    """
+
+
+def upgrade() -> None:
+    op.create_table('cities',
+    sa.Column('code', sa.String(length=32), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('geocoder_query', sa.String(length=200), nullable=False),
+    sa.Column('country_code', sa.String(length=2), nullable=False),
+    sa.CheckConstraint("code ~ '^[a-z][a-z0-9_]*$'", name='ck_cities_code'),
+    sa.PrimaryKeyConstraint('code')
+    )
+    op.execute(
+        "INSERT INTO cities (code, name, geocoder_query, country_code) "
+        f"VALUES ('{DEFAULT_CITY}', 'Warszawa', 'Warszawa, Polska', 'pl')"
+    )
+
+    op.add_column('dataset_version', sa.Column('city', sa.String(length=32), nullable=True))
+    op.execute(f"UPDATE dataset_version SET city = '{DEFAULT_CITY}'")
+    op.alter_column('dataset_version', 'city', nullable=False)
+    op.create_foreign_key('dataset_version_city_fkey', 'dataset_version', 'cities', ['city'], ['code'])
+    op.create_unique_constraint('dataset_version_city_key', 'dataset_version', ['city'])
+
+    op.execute("DROP MATERIALIZED VIEW district_summary")
+
+    for table in ('districts',) + INDICATOR_TABLES:
+        _set_aside(table)
+
+    # Partitioned replacements: same columns plus city, keys widened to include the partition key.
+    op.execute(
+        "CREATE TABLE districts (LIKE districts__legacy INCLUDING DEFAULTS, "
+        "city varchar(32) NOT NULL REFERENCES cities (code)) PARTITION BY LIST (city)"
+    )
+    op.create_primary_key('districts_pkey', 'districts', ['city', 'id'])
+    op.create_unique_constraint('districts_city_code_key', 'districts', ['city', 'code'])
+    op.create_index('ix_districts_name', 'districts', ['name'])
+    for table in INDICATOR_TABLES:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}__legacy INCLUDING DEFAULTS, city varchar(32) NOT NULL) "
+            "PARTITION BY LIST (city)"
+        )
+        op.create_primary_key(f'{table}_pkey', table, ['city', 'id'])
+        op.create_foreign_key(
+            f'{table}_district_id_fkey', table, 'districts', ['city', 'district_id'], ['city', 'id'], ondelete='CASCADE'
+        )
+        _indicator_indexes(table)
+
+    for table in ('districts',) + INDICATOR_TABLES:
+        op.execute(f"CREATE TABLE {table}__{DEFAULT_CITY} PARTITION OF {table} FOR VALUES IN ('{DEFAULT_CITY}')")
+        op.execute(f"INSERT INTO {table} SELECT *, '{DEFAULT_CITY}' FROM {table}__legacy")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    for table in INDICATOR_TABLES + ('districts',):
+        op.execute(f"DROP TABLE {table}__legacy")
+
+    op.execute(_summary_sql(city_column=True))
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+
+    # One call registers a city and gives it a partition in every partitioned table.
+    op.execute("""
+        CREATE FUNCTION add_city(p_code text, p_name text, p_geocoder_query text, p_country_code text)
+        RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            parent text;
+        BEGIN
+            INSERT INTO cities (code, name, geocoder_query, country_code)
+            VALUES (p_code, p_name, p_geocoder_query, p_country_code);
+            FOR parent IN
+                SELECT c.relname FROM pg_partitioned_table p
+                JOIN pg_class c ON c.oid = p.partrelid
+                WHERE c.relnamespace = current_schema()::regnamespace
+            LOOP
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%L)', parent || '__' || p_code, parent, p_code);
+            END LOOP;
+            INSERT INTO dataset_version (id, version, city)
+            SELECT coalesce(max(id), 0) + 1, 1, p_code FROM dataset_version;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS add_city(text, text, text, text)")
+    op.execute("DROP MATERIALIZED VIEW district_summary")
+
+    for table in ('districts',) + INDICATOR_TABLES:
+        _set_aside(table)
+
+    op.execute("CREATE TABLE districts (LIKE districts__legacy INCLUDING DEFAULTS)")
+    op.drop_column('districts', 'city')
+    op.create_primary_key('districts_pkey', 'districts', ['id'])
+    op.create_unique_constraint('districts_code_key', 'districts', ['code'])
+    op.create_index('ix_districts_name', 'districts', ['name'])
+    for table in INDICATOR_TABLES:
+        op.execute(f"CREATE TABLE {table} (LIKE {table}__legacy INCLUDING DEFAULTS)")
+        op.drop_column(table, 'city')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        op.create_foreign_key(
+            f'{table}_district_id_fkey', table, 'districts', ['district_id'], ['id'], ondelete='CASCADE'
+        )
+        _indicator_indexes(table)
+
+    for table in ('districts',) + INDICATOR_TABLES:
+        columns = ", ".join(c for c in _columns(f'{table}__legacy') if c != 'city')
+        op.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}__legacy WHERE city = '{DEFAULT_CITY}'"
+        )
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    for table in INDICATOR_TABLES + ('districts',):
+        op.execute(f"DROP TABLE {table}__legacy CASCADE")
+
+    op.execute(_summary_sql(city_column=False))
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+
+    op.execute(f"DELETE FROM dataset_version WHERE city <> '{DEFAULT_CITY}'")
+    op.drop_constraint('dataset_version_city_key', 'dataset_version', type_='unique')
+    op.drop_constraint('dataset_version_city_fkey', 'dataset_version', type_='foreignkey')
+    op.drop_column('dataset_version', 'city')
+    op.drop_table('cities')
@@ -0,0 +1,208 @@
+"""indicator reporting periods and latest-period pointer
+
+Revision ID: f7c2a9d4b816
+Revises: e41b7d9c05a2
+Create Date: 2026-10-17 09:12:41.530872
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c2a9d4b816'
+down_revision: Union[str, None] = 'e41b7d9c05a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICATOR_TABLES = (
+    'social_life',
+    'district_rhythm',
+    'green_places',
+    'digital_noise',
+    'social_availability',
+    'life_balance',
+    'safety',
+    'district_aggregates',
+)
+
+
+def _district_index(table: str) -> tuple:
+    if table == 'district_aggregates':
+        return 'ix_district_aggregates_district_id_daypart', ['district_id', 'daypart']
+    return f'ix_{table}_district_id', ['district_id', 'id']
+
+
+def _summary_sql(latest_pointer: bool) -> str:
+    def period(table: str, alias: str) -> str:
+        if not latest_pointer:
+            return ""
+        return (
+            f" AND {alias}.period = (SELECT l.period FROM indicator_latest l "
+            f"WHERE l.city = d.city AND l.indicator = '{table}' AND l.district_id = d.id)"
+        )
+
+    def latest(table: str, column: str) -> str:
+        return (
+            f"(SELECT {column} FROM {table} t WHERE t.city = d.city AND t.district_id = d.id{period(table, 't')} "
+            f"ORDER BY t.id DESC LIMIT 1) AS {column}"
+        )
+
+    def daypart(name: str) -> str:
+        return (
+            f"(array_agg(a.score_0_100 ORDER BY a.id DESC) "
+            f"FILTER (WHERE lower(a.daypart) = '{name}' AND a.score_0_100 IS NOT NULL))[1] AS traffic_{name}"
+        )
+
+    return f"""
+        CREATE MATERIALIZED VIEW district_summary AS
+        SELECT
+            d.city,
+            d.id AS district_id,
+            d.name,
+            d.code,
+            d.district_type,
+            {latest('social_life', 'normalized_score')},
+            {latest('district_rhythm', 'rhythm_score')},
+            {latest('green_places', 'green_life_score')},
+            {latest('digital_noise', 'digital_noise_score')},
+            {latest('social_availability', 'social_availability_score')},
+            {latest('life_balance', 'life_balance_score')},
+            {latest('safety', 'safety_index')},
+            {latest('safety', 'safety_level')},
+            agg.traffic_morning,
+            agg.traffic_noon,
+            agg.traffic_evening,
+            agg.traffic_night,
+            now() AS refreshed_at
+        FROM districts d
+        LEFT JOIN LATERAL (
+            SELECT {daypart('morning')}, {daypart('noon')}, {daypart('evening')}, {daypart('night')}
+            FROM district_aggregates a
+            WHERE a.city = d.city AND a.district_id = d.id{period('district_aggregates', 'a')}
+        ) agg ON true
+        WITH DATA
+    """
+
+
+def _recreate_summary(latest_pointer: bool) -> None:
+    op.execute("DROP MATERIALIZED VIEW district_summary")
+    op.execute(_summary_sql(latest_pointer))
+    op.execute("CREATE UNIQUE INDEX ix_district_summary_district_id ON district_summary (district_id)")
+
+
+def upgrade() -> None:
+    for table in INDICATOR_TABLES:
+        op.add_column(table, sa.Column(
+            'period', sa.Date(), server_default=sa.text("date_trunc('month', now())::date"), nullable=False
+        ))
+        # Existing rows describe the month their city was last loaded.
+        op.execute(
+            f"UPDATE {table} t SET period = date_trunc('month', v.updated_at)::date "
+            "FROM dataset_version v WHERE v.city = t.city"
+        )
+        name, columns = _district_index(table)
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, [columns[0], 'period', columns[1]])
+        op.create_index(f'ix_{table}_period', table, ['period'], postgresql_using='brin')
+
+    op.create_table('indicator_latest',
+    sa.Column('city', sa.String(length=32), nullable=False),
+    sa.Column('indicator', sa.String(length=64), nullable=False),
+    sa.Column('district_id', postgresql.BIGINT(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['city', 'district_id'], ['districts.city', 'districts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('city', 'indicator', 'district_id')
+    )
+
+    # Inserts can only move a pointer forward; updates and deletes recompute the
+    # touched districts from the table itself.
+    op.execute("""
+        CREATE FUNCTION indicator_latest_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO indicator_latest (city, indicator, district_id, period)
+            SELECT city, TG_TABLE_NAME, district_id, max(period) FROM new_rows GROUP BY city, district_id
+            ON CONFLICT (city, indicator, district_id)
+            DO UPDATE SET period = greatest(indicator_latest.period, excluded.period);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE FUNCTION indicator_latest_recompute() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            touched text := 'SELECT city, district_id FROM old_rows';
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                touched := touched || ' UNION SELECT city, district_id FROM new_rows';
+            END IF;
+            EXECUTE format(
+                'DELETE FROM indicator_latest l USING (%s) o '
+                'WHERE l.city = o.city AND l.district_id = o.district_id AND l.indicator = %L',
+                touched, TG_TABLE_NAME
+            );
+            EXECUTE format(
+                'INSERT INTO indicator_latest (city, indicator, district_id, period) '
+                'SELECT t.city, %L, t.district_id, max(t.period) FROM %I t '
+                'JOIN (%s) o ON o.city = t.city AND o.district_id = t.district_id '
+                'GROUP BY t.city, t.district_id',
+                TG_TABLE_NAME, TG_TABLE_NAME, touched
+            );
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE FUNCTION indicator_latest_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM indicator_latest WHERE indicator = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for table in INDICATOR_TABLES:
+        op.execute(
+            f"INSERT INTO indicator_latest (city, indicator, district_id, period) "
+            f"SELECT city, '{table}', district_id, max(period) FROM {table} GROUP BY city, district_id"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_latest_insert AFTER INSERT ON {table} "
+            "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION indicator_latest_insert()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_latest_update AFTER UPDATE ON {table} "
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION indicator_latest_recompute()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_latest_delete AFTER DELETE ON {table} "
+            "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION indicator_latest_recompute()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_latest_truncate AFTER TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION indicator_latest_truncate()"
+        )
+
+    _recreate_summary(latest_pointer=True)
+
+
+def downgrade() -> None:
+    _recreate_summary(latest_pointer=False)
+
+    for table in INDICATOR_TABLES:
+        for event in ('insert', 'update', 'delete', 'truncate'):
+            op.execute(f"DROP TRIGGER {table}_latest_{event} ON {table}")
+    op.execute("DROP FUNCTION indicator_latest_truncate()")
+    op.execute("DROP FUNCTION indicator_latest_recompute()")
+    op.execute("DROP FUNCTION indicator_latest_insert()")
+    op.drop_table('indicator_latest')
+
+    for table in INDICATOR_TABLES:
+        name, columns = _district_index(table)
+        op.drop_index(f'ix_{table}_period', table_name=table, postgresql_using='brin')
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns)
+        op.drop_column(table, 'period')
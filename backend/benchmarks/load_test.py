@@ -0,0 +1,487 @@
+"""HTTP load test: drive every district route against a scaled synthetic city and report latency percentiles.
+
+Seeds a scratch city (``loadtest`` by default, via add_city()) from fixtures/districts.json,
+multiplied into thousands of jittered districts with a few months of history each, plus
+synthetic boundaries and embeddings so /by_point and /similar have data. One API replica
+(uvicorn, one worker) is started against it with the geocoder pointed at a local stub, so
+the suite runs offline. Needs a migrated database; the city is dropped again unless --keep.
+
+Results are JSON. --baseline compares against a stored run and exits non-zero when an
+endpoint's p95/p99 latency or throughput regresses beyond the tolerances, or errors appear.
+
+    uv run python -m benchmarks.load_test --multiplier 100 --concurrency 16
+    uv run python -m benchmarks.load_test --save-baseline benchmarks/baselines/load_test.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import numpy as np
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.db import engine
+from src.models import Base, District
+from src.routes.district import router
+from src.services.loader import fixture_rows
+from src.services.ranking import COLUMNS
+from src.services.registry import INDICATORS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES = BACKEND_DIR / "fixtures" / "districts.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "load_test.json"
+
+# Synthetic districts are laid out as squares of this many degrees on a grid.
+GRID_STEP = 0.01
+GRID_ORIGIN = (20.85, 52.10)
+EMBEDDING_DIM = 16
+# Distinct addresses sent to /by_address; repeats are served by the geocode cache.
+ADDRESS_POOL = 500
+
+Request = Tuple[str, str, Optional[dict]]
+
+
+# --- seeding -------------------------------------------------------------------------
+
+
+def _jitter(value, rng: random.Random, score: bool = False):
+    if not isinstance(value, float):
+        return value
+    value *= rng.uniform(0.85, 1.15)
+    return min(max(value, 0.0), 100.0) if score else value
+
+
+def _indicator_rows(fixture: dict, rng: random.Random) -> Dict[type, List[dict]]:
+    """One period's rows of every indicator table for a district cloned from ``fixture``."""
+    scores = {i.score for i in INDICATORS.values() if i.score} | {"score_0_100"}
+    return {
+        model: [
+            {k: round(v) if k == "unique_users" else _jitter(v, rng, score=k in scores) for k, v in row.items()}
+            for row in model_rows
+        ]
+        for model, model_rows in fixture_rows(fixture).items()
+    }
+
+
+def _periods(count: int) -> List[date]:
+    today = date.today()
+    months = [today.year * 12 + today.month - 1 - i for i in range(count)]
+    return sorted(date(m // 12, m % 12 + 1, 1) for m in months)
+
+
+async def drop_city(db: AsyncEngine, city: str) -> None:
+    async with db.begin() as conn:
+        exists = (await conn.execute(text("SELECT 1 FROM cities WHERE code = :c"), {"c": city})).scalar()
+        if not exists:
+            return
+        # Cascades to every indicator table and indicator_latest.
+        await conn.execute(text("DELETE FROM districts WHERE city = :c"), {"c": city})
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.dialect_options["postgresql"]["partition_by"]:
+                await conn.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {table.name}__{city}"))
+                await conn.execute(text(f"DROP TABLE {table.name}__{city}"))
+        await conn.execute(text("DELETE FROM dataset_version WHERE city = :c"), {"c": city})
+        await conn.execute(text("DELETE FROM cities WHERE code = :c"), {"c": city})
+        await conn.execute(text("SELECT refresh_district_summary(:c)"), {"c": city})
+
+
+async def seed(db: AsyncEngine, city: str, multiplier: int, periods: int, rng: random.Random) -> List[Tuple[int, str]]:
+    """Create ``city`` with len(fixtures) * multiplier districts; returns their (id, name)."""
+    fixtures = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    await drop_city(db, city)
+    async with db.begin() as conn:
+        await conn.execute(
+            text("SELECT add_city(:c, :name, :query, 'pl')"),
+            {"c": city, "name": city.title(), "query": f"{city.title()}, Polska"},
+        )
+        clones = [(fixture, k) for k in range(multiplier) for fixture in fixtures]
+        result = await conn.execute(
+            insert(District).returning(District.id, District.name, sort_by_parameter_order=True),
+            [
+                {"city": city, "name": f"{fixture['name']} {k}", "code": f"{fixture['code']}_{k}"}
+                for fixture, k in clones
+            ],
+        )
+        districts = [(row.id, row.name) for row in result]
+
+        for period in _periods(periods):
+            batches: Dict[type, List[dict]] = {}
+            for (fixture, _), (district_id, _) in zip(clones, districts):
+                for model, rows in _indicator_rows(fixture, rng).items():
+                    batches.setdefault(model, []).extend(
+                        {**row, "city": city, "district_id": district_id, "period": period} for row in rows
+                    )
+            for model, rows in batches.items():
+                await conn.execute(insert(model), rows)
+        await conn.execute(text("SELECT refresh_district_summary(:c)"), {"c": city})
+        await conn.execute(text("ANALYZE"))
+        await conn.execute(text("UPDATE dataset_version SET version = version + 1 WHERE city = :c"), {"c": city})
+    return districts
+
+
+def _square(i: int, columns: int) -> Tuple[float, float]:
+    """South-west corner of district ``i``'s grid square."""
+    return GRID_ORIGIN[0] + (i % columns) * GRID_STEP, GRID_ORIGIN[1] + (i // columns) * GRID_STEP
+
+
+def write_spatial_files(directory: Path, city: str, districts: List[Tuple[int, str]], rng: random.Random) -> None:
+    """``<city>.geojson`` grid boundaries and ``<city>.csv`` embeddings for the synthetic districts."""
+    columns = math.ceil(math.sqrt(len(districts)))
+    features = []
+    for i, (_, name) in enumerate(districts):
+        lon, lat = _square(i, columns)
+        ring = [[lon, lat], [lon + GRID_STEP, lat], [lon + GRID_STEP, lat + GRID_STEP], [lon, lat + GRID_STEP], [lon, lat]]
+        features.append({"type": "Feature", "properties": {"name": name}, "geometry": {"type": "Polygon", "coordinates": [ring]}})
+    (directory / f"{city}.geojson").write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+    with open(directory / f"{city}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["district_tok", *(f"emb_{j}" for j in range(EMBEDDING_DIM)), "district"])
+        for _, name in districts:
+            writer.writerow([name, *(round(rng.gauss(0, 1), 6) for _ in range(EMBEDDING_DIM)), name])
+
+
+# --- stub geocoder and server ----------------------------------------------------------
+
+
+class StubGeocoder(ThreadingHTTPServer):
+    """Answers Nominatim /search queries offline, mapping each address to a district name."""
+
+    daemon_threads = True
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/search"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+        names = self.server.names
+        body = json.dumps([{"address": {"city_district": names[zlib.crc32(query.encode()) % len(names)]}}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, env: Dict[str, str], log_path: Path) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+    ]
+    with open(log_path, "wb") as log:
+        return subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **env}, stdout=log, stderr=log)
+
+
+async def wait_ready(base_url: str, process: Optional[subprocess.Popen], timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"API server exited with status {process.returncode}")
+            try:
+                if (await client.get(f"{base_url}/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise TimeoutError(f"API server at {base_url} did not come up within {timeout:.0f}s")
+
+
+# --- scenarios -------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Scenario:
+    label: str
+    # "<METHOD> <route path>" of the district router route this exercises.
+    route: str
+    make: Callable[[random.Random], Request]
+
+
+def scenarios(districts: List[Tuple[int, str]]) -> List[Scenario]:
+    ids = [district_id for district_id, _ in districts]
+    names = [name for _, name in districts]
+    columns = math.ceil(math.sqrt(len(districts)))
+
+    def pages(size: int) -> int:
+        return max(1, math.ceil(len(districts) / size))
+
+    def point(rng: random.Random) -> Dict[str, float]:
+        lon, lat = _square(rng.randrange(len(districts)), columns)
+        return {"lat": lat + rng.uniform(0.1, 0.9) * GRID_STEP, "lon": lon + rng.uniform(0.1, 0.9) * GRID_STEP}
+
+    def get(label: str, route: str, url: Callable[[random.Random], str]) -> Scenario:
+        return Scenario(label, f"GET {route}", lambda rng: ("GET", url(rng), None))
+
+    found = [
+        get("list base", "/districts/base", lambda r: f"/districts/base?page={r.randint(1, pages(100))}&size=100"),
+        get("list", "/districts/", lambda r: f"/districts/?page={r.randint(1, pages(20))}&include_total=true"),
+        get("snapshot (city)", "/districts/snapshot", lambda r: "/districts/snapshot"),
+        get(
+            "snapshot (ids)", "/districts/snapshot",
+            lambda r: "/districts/snapshot?ids=" + ",".join(map(str, r.sample(ids, min(20, len(ids))))),
+        ),
+        get("detailed", "/districts/detailed", lambda r: f"/districts/detailed?page={r.randint(1, pages(20))}"),
+        get("search", "/districts/search", lambda r: f"/districts/search?q={r.choice(names)[:r.randint(3, 8)]}"),
+        get("by_point", "/districts/by_point", lambda r: "/districts/by_point?lat={lat}&lon={lon}".format(**point(r))),
+        Scenario(
+            "by_point (batch of 100)", "POST /districts/by_point",
+            lambda r: ("POST", "/districts/by_point", {"points": [point(r) for _ in range(100)]}),
+        ),
+        get("rank (snapshot)", "/districts/rank", lambda r: f"/districts/rank?indicator={r.choice(COLUMNS)}&limit=50"),
+        get(
+            "rank (summary)", "/districts/rank",
+            lambda r: f"/districts/rank?indicator={r.choice(COLUMNS)}&limit=50&source=summary",
+        ),
+        get(
+            "score", "/districts/score",
+            lambda r: "/districts/score?weights=" + ",".join(f"{c}:{r.choice((-1, 1, 2))}" for c in r.sample(COLUMNS, 3)),
+        ),
+        get(
+            "similar (batch of 5)", "/districts/similar",
+            lambda r: "/districts/similar?ids=" + ",".join(map(str, r.sample(ids, min(5, len(ids))))),
+        ),
+        get("similar", "/districts/{id}/similar", lambda r: f"/districts/{r.choice(ids)}/similar?k=10"),
+        get("summary", "/districts/{id}/summary", lambda r: f"/districts/{r.choice(ids)}/summary"),
+        get(
+            "history", "/districts/{id}/history",
+            lambda r: f"/districts/{r.choice(ids)}/history?indicator={r.choice(list(INDICATORS))}",
+        ),
+        get("detail", "/districts/{id}/detail", lambda r: f"/districts/{r.choice(ids)}/detail"),
+        get(
+            "indicators", "/districts/indicators/{name}",
+            lambda r: f"/districts/indicators/{r.choice(list(INDICATORS))}?page={r.randint(1, pages(100))}",
+        ),
+        get(
+            "export parquet", "/districts/export/districts.{fmt}",
+            lambda r: "/districts/export/districts.parquet?indicators=safety,life_balance",
+        ),
+        # The default: every indicator, aggregates included.
+        get("export parquet (all)", "/districts/export/districts.{fmt}", lambda r: "/districts/export/districts.parquet"),
+        get("export csv", "/districts/export/{name}.{fmt}", lambda r: f"/districts/export/{r.choice(list(INDICATORS))}.csv"),
+        Scenario(
+            "by_address", "POST /districts/by_address",
+            lambda r: ("POST", "/districts/by_address", {"address": f"Testowa {r.randrange(ADDRESS_POOL) + 1}"}),
+        ),
+    ]
+    for name in INDICATORS:
+        path = "/districts/aggregates" if name == "aggregates" else f"/districts/{name}"
+        found.append(get(f"list {name}", path, lambda r, path=path: f"{path}?page={r.randint(1, pages(100))}"))
+    return found
+
+
+def uncovered_routes(found: List[Scenario]) -> List[str]:
+    routes = {f"{method} {route.path}" for route in router.routes for method in route.methods}
+    return sorted(routes - {s.route for s in found})
+
+
+# --- driver ----------------------------------------------------------------------------
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining: Iterator[int] = iter(range(requests))
+
+    async def worker(n: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + n)
+        for _ in remaining:
+            method, url, body = scenario.make(rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    wall = time.perf_counter() - start
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "route": scenario.route,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / wall, 1),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], latency_tolerance: float, throughput_tolerance: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``, as human-readable lines."""
+    regressions = []
+    for label, current in results["endpoints"].items():
+        base = baseline["endpoints"].get(label)
+        if base is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            limit = base[key] * (1 + latency_tolerance)
+            if current[key] > limit:
+                regressions.append(f"{label}: {key} {current[key]} > {limit:.2f} (baseline {base[key]})")
+        floor = base["rps"] * (1 - throughput_tolerance)
+        if current["rps"] < floor:
+            regressions.append(f"{label}: rps {current['rps']} < {floor:.1f} (baseline {base['rps']})")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{label}: {current['errors']} errors (baseline {base['errors']})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    rng = random.Random(args.seed)
+    found = scenarios([(1, "x")])
+    missing = uncovered_routes(found)
+    if missing:
+        print(f"no load-test scenario for: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    districts = await seed(engine, args.city, args.multiplier, args.periods, rng)
+    print(f"seeded {len(districts):,} districts x {args.periods} periods in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    found = [s for s in scenarios(districts) if not args.only or args.only in s.label]
+
+    stub = StubGeocoder([name for _, name in districts])
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    process = None
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_spatial_files(directory, args.city, districts, rng)
+        base_url = args.url
+        if base_url is None:
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = start_server(
+                port,
+                {
+                    "GEOCODER_URL": stub.url,
+                    "GEOCODE_CACHE_PATH": "",
+                    "DISTRICT_BOUNDARIES_PATH": str(directory / "{city}.geojson"),
+                    "DISTRICT_EMBEDDINGS_PATH": str(directory / "{city}.csv"),
+                },
+                Path(args.server_log),
+            )
+        results: Dict[str, Any] = {
+            "meta": {
+                "districts": len(districts),
+                "multiplier": args.multiplier,
+                "periods": args.periods,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "cpus": os.cpu_count(),
+                "python": platform.python_version(),
+            },
+            "endpoints": {},
+        }
+        try:
+            await wait_ready(base_url, process)
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"{base_url}/api/{args.city}", limits=limits, timeout=60.0) as client:
+                for n, scenario in enumerate(found):
+                    # Warm-up: snapshot build, similarity index, prepared statements.
+                    await drive(client, scenario, min(args.requests, 2 * args.concurrency), args.concurrency, n)
+                    stats = await drive(client, scenario, args.requests, args.concurrency, n)
+                    results["endpoints"][scenario.label] = stats
+                    print(
+                        f"{scenario.label:<28} {stats['rps']:>9,.1f} rps  p50 {stats['p50_ms']:>8.2f}  "
+                        f"p95 {stats['p95_ms']:>8.2f}  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}",
+                        file=sys.stderr,
+                    )
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+            stub.shutdown()
+            if not args.keep:
+                await drop_city(engine, args.city)
+            await engine.dispose()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.save_baseline}", file=sys.stderr)
+        return 0
+
+    failures = [f"{label}: {r['errors']} errors" for label, r in results["endpoints"].items() if r["errors"]]
+    baseline_path = Path(args.baseline)
+    if args.baseline and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        changed = {k: (v, results["meta"].get(k)) for k, v in baseline["meta"].items() if results["meta"].get(k) != v}
+        if changed:
+            print(f"warning: run differs from the baseline in {changed}", file=sys.stderr)
+        failures = compare(results, baseline, args.latency_tolerance, args.throughput_tolerance)
+    for line in failures:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--multiplier", type=int, default=100, help="synthetic districts per fixture district")
+    parser.add_argument("--periods", type=int, default=3, help="monthly periods of history per district")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per scenario")
+    parser.add_argument("--only", help="run only scenarios whose label contains this")
+    parser.add_argument("--city", default="loadtest")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="load an already running API at this base URL instead of starting one")
+    parser.add_argument("--server-log", default=os.devnull, help="where the started API server's output goes")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded city afterwards")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON on stdout")
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="results JSON to compare against")
+    parser.add_argument("--save-baseline", help="write the results as the new baseline and skip the comparison")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25, help="allowed p95/p99 growth, 0.25 = +25%%")
+    parser.add_argument("--throughput-tolerance", type=float, default=0.20, help="allowed rps drop, 0.20 = -20%%")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Query-plan check: seed millions of synthetic rows and assert the hot queries use indexes.
+
+Everything happens in a scratch schema (``plan_check`` by default) of the configured
+database, created from the models inside one transaction that is rolled back at the
+end, so real data is never touched.
+Exits non-zero when any checked query plans a sequential scan over an indicator table.
+
+    uv run python -m benchmarks.query_plans --districts 5000 --rows-per-district 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import Date, Float, Integer, String, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.db import engine
+from src.models import Base, District, DistrictAggregate, IndicatorLatest
+from src.services.pagination import encode_cursor, paginate
+from src.services.registry import INDICATORS
+from src.services.snapshot import city_statement, in_period, latest_period
+
+CITY = "plan_check"
+# Each district's rows are spread over this many monthly periods.
+PERIODS = 24
+_INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan", "Bitmap Index Scan"}
+_LABELS = {"safety_level": ("Low risk", "Moderate", "High risk"), "daypart": ("MORNING", "NOON", "EVENING", "NIGHT")}
+
+
+def _value_sql(column, n_districts: int) -> str:
+    if column.name == "city":
+        return f"'{CITY}'"
+    if column.name == "district_id":
+        return f"(g % {n_districts}) + 1"
+    if isinstance(column.type, Date):
+        return f"(date '2024-01-01' + (g / {n_districts} % {PERIODS}) * interval '1 month')::date"
+    if column.name in _LABELS:
+        labels = _LABELS[column.name]
+        return f"(ARRAY[{', '.join(repr(v) for v in labels)}])[1 + g % {len(labels)}]"
+    if isinstance(column.type, Float):
+        return "random() * 100"
+    if isinstance(column.type, Integer):
+        return "(random() * 1000)::int"
+    if isinstance(column.type, String):
+        return "md5(g::text)"
+    raise TypeError(f"Cannot synthesize {column.table.name}.{column.name}")
+
+
+async def create_city(conn: AsyncConnection) -> None:
+    """What add_city() does after the migrations: register the city and partition every table."""
+    await conn.execute(
+        text("INSERT INTO cities (code, name, geocoder_query, country_code) VALUES (:c, :c, :c, 'pl')"),
+        {"c": CITY},
+    )
+    for table in Base.metadata.sorted_tables:
+        if table.dialect_options["postgresql"]["partition_by"]:
+            await conn.execute(
+                text(f"CREATE TABLE {table.name}__{CITY} PARTITION OF {table.name} FOR VALUES IN ('{CITY}')")
+            )
+
+
+async def seed(conn: AsyncConnection, n_districts: int, rows_per_district: int) -> int:
+    await create_city(conn)
+    await conn.execute(
+        text(
+            "INSERT INTO districts (city, name, code) "
+            "SELECT :city, 'district ' || g, 'd' || g FROM generate_series(1, :n) g"
+        ),
+        {"city": CITY, "n": n_districts},
+    )
+    total = n_districts
+    for indicator in INDICATORS.values():
+        table = indicator.model.__table__
+        columns = [c for c in table.columns if c.name != "id"]
+        names = ", ".join(c.name for c in columns)
+        values = ", ".join(_value_sql(c, n_districts) for c in columns)
+        rows = n_districts * rows_per_district
+        await conn.execute(
+            text(f"INSERT INTO {table.name} ({names}) SELECT {values} FROM generate_series(1, :rows) g"),
+            {"rows": rows},
+        )
+        # The migrations' triggers keep this current; create_all does not install them.
+        await conn.execute(
+            text(
+                "INSERT INTO indicator_latest (city, indicator, district_id, period) "
+                f"SELECT city, '{table.name}', district_id, max(period) FROM {table.name} GROUP BY city, district_id"
+            )
+        )
+        total += rows
+    await conn.execute(text("ANALYZE"))
+    return total
+
+
+def checked_queries(n_districts: int) -> Dict[str, object]:
+    """The statements behind detail, list and ranking endpoints, for one mid-range district."""
+    district_id = n_districts // 2
+    queries: Dict[str, object] = {
+        "detail: snapshot build (all districts)": city_statement(CITY),
+        "detail: one district": city_statement(CITY).where(District.id == district_id),
+        "detail: by code": select(District).where(District.city == CITY, District.code == f"d{district_id}"),
+    }
+    for name, indicator in INDICATORS.items():
+        model = indicator.model
+        base = select(*indicator.columns()).where(model.city == CITY, in_period(model))
+        queries[f"list: {name} page 1"] = paginate(base, model.id, 1, 100, None)
+        queries[f"list: {name} keyset"] = paginate(base, model.id, 1, 100, encode_cursor(10_000))
+        queries[f"list: {name} by district"] = paginate(
+            base.where(model.district_id == district_id), model.id, 1, 100, None
+        )
+        queries[f"history: {name} one year"] = (
+            select(model.period, *indicator.columns())
+            .where(model.city == CITY, model.district_id == district_id)
+            .where(model.period.between(date(2024, 7, 1), date(2025, 6, 1)))
+            .order_by(model.period, model.id)
+        )
+        if indicator.score is not None:
+            # What district_summary evaluates per district: the newest headline score.
+            queries[f"rank: latest {indicator.score}"] = (
+                select(getattr(model, indicator.score))
+                .select_from(District)
+                .join(model, (model.city == District.city) & (model.district_id == District.id))
+                .where(District.city == CITY, District.id == district_id, model.period == latest_period(model))
+                .order_by(model.id.desc())
+                .limit(1)
+            )
+    queries["rank: traffic by daypart"] = (
+        select(func.max(DistrictAggregate.score_0_100))
+        .select_from(District)
+        .join(DistrictAggregate, (DistrictAggregate.city == District.city) & (DistrictAggregate.district_id == District.id))
+        .where(
+            District.city == CITY,
+            District.id == district_id,
+            DistrictAggregate.period == latest_period(DistrictAggregate),
+            DistrictAggregate.daypart == "MORNING",
+        )
+    )
+    queries["period: one month, all districts"] = select(func.avg(DistrictAggregate.score_0_100)).where(
+        DistrictAggregate.city == CITY, DistrictAggregate.period == date(2025, 3, 1)
+    )
+    return queries
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def seq_scans(plan: dict, tables: set[str]) -> List[str]:
+    return [
+        node["Relation Name"]
+        for node in _nodes(plan)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+    ]
+
+
+async def explain(conn: AsyncConnection, stmt) -> Tuple[dict, float]:
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    start = time.perf_counter()
+    raw = (await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"))).scalar_one()
+    elapsed = time.perf_counter() - start
+    document = raw if isinstance(raw, list) else json.loads(raw)
+    return document[0]["Plan"], elapsed
+
+
+async def run(args: argparse.Namespace) -> int:
+    tables = {i.model.__tablename__ for i in INDICATORS.values()} | {District.__tablename__, IndicatorLatest.__tablename__}
+    # Scans show up on the city's partitions.
+    tables |= {f"{t}__{CITY}" for t in tables}
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {args.schema}"))
+        await conn.execute(text(f"SET search_path TO {args.schema}"))
+        try:
+            await conn.run_sync(lambda sync: Base.metadata.create_all(sync))
+            start = time.perf_counter()
+            total = await seed(conn, args.districts, args.rows_per_district)
+            print(f"seeded {total:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+            for label, stmt in checked_queries(args.districts).items():
+                plan, elapsed = await explain(conn, stmt)
+                scans = seq_scans(plan, tables)
+                used = sorted({n["Node Type"] for n in _nodes(plan)} & _INDEX_SCANS)
+                status = "FAIL" if scans else "ok"
+                failures += bool(scans)
+                detail = f"seq scan on {', '.join(sorted(set(scans)))}" if scans else ", ".join(used) or "-"
+                print(f"{status:<5} {label:<48} {elapsed * 1000:9.1f} ms  {detail}")
+        finally:
+            if args.keep:
+                await conn.commit()
+            else:
+                await conn.rollback()
+    await engine.dispose()
+    print(f"\n{failures} failing quer{'y' if failures == 1 else 'ies'}")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--districts", type=int, default=5000)
+    parser.add_argument("--rows-per-district", type=int, default=60)
+    parser.add_argument("--schema", default="plan_check")
+    parser.add_argument("--keep", action="store_true", help="commit the seeded schema instead of rolling back")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Micro-benchmark: rows/sec of the default list path vs FAST_SERIALIZATION, per endpoint.
+
+No database needed: rows are synthesized as ORM instances (default path) and as plain
+mappings (fast path), then pushed through the same serialization steps the API runs.
+
+    uv run python -m benchmarks.serialization --rows 5000 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Date, Float, Integer, String
+
+from src.models import (
+    District,
+    DistrictAggregate,
+    SocialLife,
+    DistrictRhythm,
+    GreenPlaces,
+    DigitalNoise,
+    SocialAvailability,
+    LifeBalance,
+    Safety,
+)
+from src.schemas.district import (
+    DistrictBaseItem,
+    DistrictAggregateRead,
+    SocialLifeRead,
+    DistrictRhythmRead,
+    GreenPlacesRead,
+    DigitalNoiseRead,
+    SocialAvailabilityRead,
+    LifeBalanceRead,
+    SafetyRead,
+)
+from src.services.serialization import list_adapter, render_rows, schema_columns
+
+ENDPOINTS = {
+    "/districts/base": (District, DistrictBaseItem),
+    "/districts/aggregates": (DistrictAggregate, DistrictAggregateRead),
+    "/districts/social_life": (SocialLife, SocialLifeRead),
+    "/districts/district_rhythm": (DistrictRhythm, DistrictRhythmRead),
+    "/districts/green_places": (GreenPlaces, GreenPlacesRead),
+    "/districts/digital_noise": (DigitalNoise, DigitalNoiseRead),
+    "/districts/social_availability": (SocialAvailability, SocialAvailabilityRead),
+    "/districts/life_balance": (LifeBalance, LifeBalanceRead),
+    "/districts/safety": (Safety, SafetyRead),
+}
+
+
+def _value(column, i: int):
+    if column.name == "daypart":
+        return random.choice(["MORNING", "NOON", "EVENING"])
+    if isinstance(column.type, Float):
+        return random.random() * 100
+    if isinstance(column.type, Integer):
+        return i
+    if isinstance(column.type, String):
+        return f"value-{i}"
+    if isinstance(column.type, Date):
+        return date(2024 + i % 3, 1 + i % 12, 1)
+    return i
+
+
+def synth_rows(model, schema, n: int) -> List[Dict]:
+    columns = schema_columns(model, schema)
+    return [{c.name: _value(c, i + 1) for c in columns} for i in range(n)]
+
+
+def default_path(schema) -> Callable[[list], bytes]:
+    """What FastAPI does for `response_model=List[schema]` returning ORM rows, then JSONResponse."""
+    adapter = list_adapter(schema)
+
+    def run(rows: list) -> bytes:
+        validated = adapter.validate_python(rows, from_attributes=True)
+        content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    return run
+
+
+def fast_path(schema) -> Callable[[list], bytes]:
+    def run(rows: list) -> bytes:
+        return render_rows(schema, rows).body
+
+    return run
+
+
+def measure(fn: Callable[[list], bytes], rows: list, repeat: int) -> float:
+    fn(rows)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return len(rows) * repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for path, (model, schema) in ENDPOINTS.items():
+        mappings = synth_rows(model, schema, args.rows)
+        orm_rows = [model(**row) for row in mappings]
+        default_rps = measure(default_path(schema), orm_rows, args.repeat)
+        fast_rps = measure(fast_path(schema), mappings, args.repeat)
+        results[path] = {"default_rows_per_s": round(default_rps), "fast_rows_per_s": round(fast_rps)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'endpoint':34} {'default rows/s':>15} {'fast rows/s':>15} {'speedup':>8}")
+    for path, r in results.items():
+        speedup = r["fast_rows_per_s"] / r["default_rows_per_s"]
+        print(f"{path:34} {r['default_rows_per_s']:>15,} {r['fast_rows_per_s']:>15,} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
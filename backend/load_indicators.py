@@ -0,0 +1,85 @@
+"""load-indicators: bulk, idempotent load of one city's indicators for one reporting period.
+
+    uv run python load_indicators.py fixtures/districts.json
+    uv run python load_indicators.py ../notebooks/out --city warszawa --period 2025-10
+
+SOURCE is fixtures/districts.json (or a file shaped like it) or a directory of the notebooks'
+CSV exports. Districts are upserted on code and only the period's changed rows are written,
+in one transaction; the dataset version is bumped (notifying the API processes) only when
+something changed. The loaded districts' district_summary rows are rebuilt in the same
+transaction; statistics of the written tables are refreshed after the commit.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.config import get_settings
+from src.db import engine
+from src.services.loader import LoadError, analyze, load, month, read_source, refresh_summary
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        period = month(args.period)
+        districts = read_source(args.source)
+        async with engine.begin() as conn:
+            if args.if_empty:
+                present = (
+                    await conn.execute(text("SELECT 1 FROM districts WHERE city = :c LIMIT 1"), {"c": args.city})
+                ).scalar()
+                if present:
+                    print(f"{args.city} already has districts, nothing to do")
+                    return 0
+            stats = await load(conn, args.city, districts, period)
+            if args.refresh_summary:
+                await refresh_summary(conn, args.city)
+        analyze_seconds = None
+        if stats.written:
+            # Outside the load's transaction, so its locks are not held while it runs.
+            started = time.perf_counter()
+            async with engine.begin() as conn:
+                await analyze(conn, args.city, [table for table, changes in stats.tables.items() if changes.written])
+            analyze_seconds = time.perf_counter() - started
+    except LoadError as e:
+        print(f"load-indicators: {e}", file=sys.stderr)
+        return 1
+    finally:
+        await engine.dispose()
+
+    print(f"{'table':<22} {'read':>10} {'inserted':>10} {'updated':>10} {'deleted':>10}")
+    for table, changes in stats.tables.items():
+        print(f"{table:<22} {changes.read:>10,} {changes.inserted:>10,} {changes.updated:>10,} {changes.deleted:>10,}")
+    print(
+        f"{args.city} {period:%Y-%m}: {stats.districts:,} districts ({stats.added:,} new, {stats.renamed:,} renamed), "
+        f"{stats.read:,} rows read, {stats.written:,} written "
+        f"in {stats.seconds:.2f}s ({stats.read / max(stats.seconds, 1e-9):,.0f} rows/s)"
+    )
+    if not stats.set_based:
+        print("note: the role may not set session_replication_role, so rows were checked one by one")
+    if not stats.written:
+        print("no changes; dataset version left as is")
+    if analyze_seconds is not None:
+        print(f"statistics refreshed in {analyze_seconds:.2f}s")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="load-indicators", description=__doc__.splitlines()[0].partition(": ")[2])
+    parser.add_argument("source", type=Path, help="districts JSON file or directory of notebook CSVs")
+    parser.add_argument("--city", default=get_settings().DEFAULT_CITY)
+    parser.add_argument("--period", help="reporting month, YYYY-MM (default: the current month)")
+    parser.add_argument("--if-empty", action="store_true", help="skip the load when the city already has districts")
+    parser.add_argument(
+        "--refresh-summary", action="store_true", help="also rebuild all of the city's district_summary rows, even without changes"
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,110 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional, Pattern, Set, Tuple
+
+from fastapi import FastAPI, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.dependencies.models import Dependant
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 
+from src.config import get_settings
+from src.db import get_read_db, get_session
+from src.middleware import CompressionMiddleware, ConditionalGetMiddleware, MetricsMiddleware
 from src.routes.district import router as districts_router
+from src.schemas.city import CityRead
+from src.services.cities import cities, city_path_param
+from src.services.geocoding import geocoder
+from src.services.notifications import dataset_listener
+from src.services.snapshot import get_snapshot, snapshot_stores
+from src.services.similarity import load_embeddings
+from src.services.spatial import load_locator
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await cities.load()
+    except Exception:
+        # Requests retry the lookup; the API must still come up without the DB.
+        logger.exception("Loading cities failed")
+    codes = cities.codes or [settings.DEFAULT_CITY]
+    await snapshot_stores.start(codes)
+    if settings.DATASET_LISTEN:
+        await dataset_listener.start()
+    await geocoder.start()
+    for code in codes:
+        await asyncio.to_thread(load_locator, code)
+        await asyncio.to_thread(load_embeddings, code)
+    yield
+    await geocoder.stop()
+    await dataset_listener.stop()
+    await snapshot_stores.stop()
+
+
+# Dependencies that open a database session, on the primary or on a replica.
+_DB_DEPENDENCIES = {get_session, get_read_db}
+_snapshot_routes: Optional[List[Tuple[Pattern[str], bool]]] = None
+
+
+def _dependency_calls(dependant: Dependant) -> Set[Callable]:
+    calls = set()
+    for dependency in dependant.dependencies:
+        calls.add(dependency.call)
+        calls |= _dependency_calls(dependency)
+    return calls
+
+
+def _serves_snapshot(path: str) -> bool:
+    """Whether the GET route for ``path`` answers from the in-memory snapshot alone.
+
+    Only those responses are fixed by the snapshot's version. Routes that also read the
+    database may be served by a replica that lags behind it, and export_indicator
+    streams from the database without a dependency at all.
+    """
+    global _snapshot_routes
+    if _snapshot_routes is None:
+        _snapshot_routes = []
+        for route in app.routes:
+            if isinstance(route, APIRoute) and "GET" in route.methods:
+                calls = _dependency_calls(route.dependant)
+                _snapshot_routes.append((route.path_regex, get_snapshot in calls and not calls & _DB_DEPENDENCIES))
+    # The first matching route serves the request, as in the router.
+    for regex, snapshot_only in _snapshot_routes:
+        if regex.match(path):
+            return snapshot_only
+    return False
 
 
-app = FastAPI()
+def _dataset_version(path: str) -> Optional[str]:
+    if not _serves_snapshot(path):
+        return None
+    # /api/districts/... serves the default city, /api/<city>/districts/... any other.
+    segments = path.split("/", 4)
+    if len(segments) > 3 and segments[3] == "districts":
+        return snapshot_stores.version(segments[2])
+    if len(segments) > 2 and segments[2] == "districts":
+        return snapshot_stores.version(settings.DEFAULT_CITY)
+    return None
+
+
+settings = get_settings()
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    ConditionalGetMiddleware,
+    version_getter=_dataset_version,
+    max_age=settings.HTTP_CACHE_MAX_AGE,
+)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,11 +112,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Disposition"],
 )
 
 app.include_router(districts_router, prefix="/api")
+app.include_router(districts_router, prefix="/api/{city}", dependencies=[Depends(city_path_param)])
+
+
+@app.get("/api/cities", response_model=List[CityRead], tags=["cities"])
+async def list_cities() -> List[CityRead]:
+    # New cities arrive through the dataset listener, or the first request naming one.
+    return cities.all()
 
 
 @app.get("/")
 async def read_root():
     return {"Hello": "World"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
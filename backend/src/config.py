@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
 from urllib.parse import quote_plus
 
 from pydantic import AliasChoices, Field, computed_field
@@ -27,14 +28,40 @@ class DatabaseSettings(BaseSettings):
     USER: str = Field(validation_alias="POSTGRES_USER")
     PASSWORD: str = Field(validation_alias="POSTGRES_PASSWORD")
 
-    @computed_field
-    @property
-    def url_async(self) -> str:
+    POOL_SIZE: int = Field(default=5, ge=1, validation_alias="DB_POOL_SIZE")
+    MAX_OVERFLOW: int = Field(default=10, ge=0, validation_alias="DB_MAX_OVERFLOW")
+    POOL_TIMEOUT: float = Field(default=30.0, gt=0, validation_alias="DB_POOL_TIMEOUT")
+    # Prepared statements kept per asyncpg connection; 0 disables them (needed behind pgbouncer).
+    STATEMENT_CACHE_SIZE: int = Field(default=100, ge=0, validation_alias="DB_STATEMENT_CACHE_SIZE")
+
+    # Comma-separated read replicas as host[:port]; same database and credentials as the primary.
+    REPLICA_HOSTS: str = Field(default="", validation_alias="DB_REPLICA_HOSTS")
+    # How long a replica that failed to connect is left out before it is tried again.
+    REPLICA_RETRY_SECONDS: float = Field(default=30.0, gt=0, validation_alias="DB_REPLICA_RETRY_SECONDS")
+    # How long a read waits for a replica connection (connect, or pool checkout and its ping)
+    # before falling back; asyncpg would otherwise wait 60s on a replica that drops packets.
+    REPLICA_CONNECT_TIMEOUT: float = Field(default=2.0, gt=0, validation_alias="DB_REPLICA_CONNECT_TIMEOUT")
+
+    def _url(self, host: str, port: int) -> str:
         return (
             f"postgresql+asyncpg://{quote_plus(self.USER)}:{quote_plus(self.PASSWORD)}"
-            f"@{self.HOST}:{self.PORT}/{self.NAME}"
+            f"@{host}:{port}/{self.NAME}"
         )
 
+    @computed_field
+    @property
+    def url_async(self) -> str:
+        return self._url(self.HOST, self.PORT)
+
+    @computed_field
+    @property
+    def replica_urls(self) -> List[str]:
+        urls = []
+        for entry in filter(None, (e.strip() for e in self.REPLICA_HOSTS.split(","))):
+            host, _, port = entry.partition(":")
+            urls.append(self._url(host, int(port) if port else self.PORT))
+        return urls
+
 
 class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -46,6 +73,41 @@ class AppSettings(BaseSettings):
     DEBUG: bool = Field(default=True, validation_alias=AliasChoices("DEBUG", "APP_DEBUG"))
     DB: DatabaseSettings = DatabaseSettings()
 
+    # City served by the unprefixed /api/districts routes.
+    DEFAULT_CITY: str = "warszawa"
+    # How often (seconds) an unknown city code may reload the cities table; never under 5s.
+    CITY_RELOAD_SECONDS: float = Field(default=30.0, ge=0)
+
+    # How often (seconds) the in-memory district snapshot checks whether the data changed.
+    # Only while no dataset change listener is connected (see DATASET_LISTEN).
+    SNAPSHOT_REFRESH_SECONDS: float = Field(default=30.0, ge=0)
+    # LISTEN on the primary for dataset_version changes, so a load reaches every API process
+    # at once. Turn off where LISTEN is unavailable (pgbouncer in transaction mode).
+    DATASET_LISTEN: bool = True
+
+    GEOCODER_URL: str = "https://nominatim.openstreetmap.org/search"
+    GEOCODER_TIMEOUT: float = 10.0
+    GEOCODER_USER_AGENT: str = "warsaw-districts/1.0 (contact@example.com)"
+    GEOCODE_CACHE_TTL_SECONDS: float = Field(default=7 * 24 * 3600, gt=0)
+    GEOCODE_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+    # Optional SQLite file that keeps resolved addresses across restarts.
+    GEOCODE_CACHE_PATH: Optional[str] = None
+
+    # GeoJSON file or directory of per-district GeoJSON files used by /districts/by_point.
+    # "{city}" in the path is replaced by the city code; a plain path is the default city's.
+    DISTRICT_BOUNDARIES_PATH: Optional[str] = None
+    # district_embeddings.csv exported by notebooks/ml_dl/neighbourhood_similarity.ipynb; "{city}" as above.
+    DISTRICT_EMBEDDINGS_PATH: Optional[str] = None
+
+    # How long a row count (the lists' include_total) is reused before the table is counted again.
+    ROW_COUNT_CACHE_SECONDS: float = Field(default=30.0, gt=0)
+
+    HTTP_CACHE_MAX_AGE: int = Field(default=60, ge=0)
+    COMPRESSION_MIN_SIZE: int = Field(default=1024, ge=0)
+
+    # Serve indicator lists from row mappings encoded by pydantic-core instead of ORM objects + response_model.
+    FAST_SERIALIZATION: bool = False
+
     @computed_field
     @property
     def sqlalchemy_url(self) -> str:
@@ -1,32 +1,55 @@
 from __future__ import annotations
 
-from typing import AsyncIterator
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncpg
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from .config import get_settings
+from .metrics import TimedQueuePool, instrument_engine
 import ssl
 import os
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     __allow_unmapped__ = True
 
 _USE_SSL = os.getenv("DB_SSL", "0").lower() in {"1", "true", "yes"}
-_connect_args = {}
+_connect_args = {"prepared_statement_cache_size": settings.DB.STATEMENT_CACHE_SIZE}
 if _USE_SSL:
     ssl_ctx = ssl.create_default_context()
-    _connect_args = {"ssl": ssl_ctx}
+    _connect_args["ssl"] = ssl_ctx
 
-engine = create_async_engine(
-    settings.DB.url_async,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    connect_args=_connect_args,
-)
+
+def _create_engine(url: str, name: str, connect_timeout: Optional[float] = None) -> AsyncEngine:
+    connect_args = dict(_connect_args)
+    if connect_timeout is not None:
+        connect_args["timeout"] = connect_timeout
+    engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB.POOL_SIZE,
+        max_overflow=settings.DB.MAX_OVERFLOW,
+        pool_timeout=settings.DB.POOL_TIMEOUT,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine, name)
+    return engine
+
+
+engine = _create_engine(settings.DB.url_async, "primary")
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -35,8 +58,142 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+async def connect_primary() -> asyncpg.Connection:
+    """A plain asyncpg connection to the primary, outside the pool, for LISTEN.
+
+    Notifications are not replicated, so listeners always talk to the primary.
+    """
+    url = engine.url
+    return await asyncpg.connect(
+        host=url.host,
+        port=url.port,
+        user=url.username,
+        password=url.password,
+        database=url.database,
+        ssl=_connect_args.get("ssl"),
+    )
+
+
 async def get_session() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
 
 get_db = get_session
+
+
+class ReadRouter:
+    """Spreads read sessions over replicas, least checked-out connections first.
+
+    Ties rotate round-robin. A replica that fails to connect, or does not hand out a
+    connection within ``connect_timeout``, is ejected for ``retry_after`` seconds; with no
+    healthy replica left reads go to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine],
+        retry_after: float,
+        connect_timeout: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._retry_after = retry_after
+        self._connect_timeout = connect_timeout
+        self._down_until: Dict[AsyncEngine, float] = {}
+        self._turn = itertools.count()
+        self._abandoned: Set[asyncio.Task] = set()
+
+    def healthy(self) -> List[AsyncEngine]:
+        now = time.monotonic()
+        return [e for e in self.replicas if self._down_until.get(e, 0.0) <= now]
+
+    def candidates(self) -> List[AsyncEngine]:
+        """Engines to try in order: healthy replicas by load, then the primary."""
+        healthy = self.healthy()
+        if healthy:
+            offset = next(self._turn) % len(healthy)
+            healthy = healthy[offset:] + healthy[:offset]
+            healthy.sort(key=lambda e: e.sync_engine.pool.checkedout())
+        return healthy + [self.primary]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        if engine is self.primary:
+            return
+        if self._down_until.get(engine, 0.0) <= time.monotonic():
+            logger.warning(
+                "Read replica %s:%s is unavailable, ejecting for %.0fs",
+                engine.url.host,
+                engine.url.port,
+                self._retry_after,
+            )
+        self._down_until[engine] = time.monotonic() + self._retry_after
+
+    def __call__(self) -> AsyncSession:
+        """A session on the preferred engine; usable as a sessionmaker for long-lived readers."""
+        return AsyncSession(self.candidates()[0], expire_on_commit=False, autoflush=False)
+
+    async def _connect(self, session: AsyncSession) -> bool:
+        """Takes the session's connection within ``connect_timeout``; closes the session on failure.
+
+        A checkout that overruns is cancelled but not awaited: SQLAlchemy then closes the
+        stuck connection gracefully, which alone can take seconds, so that is left to finish
+        in the background.
+        """
+        checkout = asyncio.ensure_future(session.connection())
+        done, _ = await asyncio.wait((checkout,), timeout=self._connect_timeout)
+        if not done:
+            checkout.cancel()
+            task = asyncio.create_task(self._discard(checkout, session))
+            self._abandoned.add(task)
+            task.add_done_callback(self._abandoned.discard)
+            return False
+        try:
+            checkout.result()
+        except (DBAPIError, OSError):
+            await session.close()
+            return False
+        return True
+
+    @staticmethod
+    async def _discard(checkout: asyncio.Future, session: AsyncSession) -> None:
+        with suppress(Exception, asyncio.CancelledError):
+            await checkout
+        await session.close()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """A session on the first engine that hands out a connection, replicas first.
+
+        The connection is taken up front, so a dead or unresponsive replica is skipped
+        before the caller runs.
+        """
+        for candidate in self.candidates():
+            session = AsyncSession(candidate, expire_on_commit=False, autoflush=False)
+            if candidate is self.primary or await self._connect(session):
+                break
+            self.mark_down(candidate)
+        async with session:
+            try:
+                yield session
+            except DBAPIError as e:
+                if e.connection_invalidated:
+                    self.mark_down(candidate)
+                raise
+
+
+read_router = ReadRouter(
+    engine,
+    [
+        _create_engine(url, f"replica_{i}", settings.DB.REPLICA_CONNECT_TIMEOUT)
+        for i, url in enumerate(settings.DB.replica_urls)
+    ],
+    settings.DB.REPLICA_RETRY_SECONDS,
+    settings.DB.REPLICA_CONNECT_TIMEOUT,
+)
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Session for read-only routes, on a replica when one is reachable."""
+    async with read_router.session() as session:
+        yield session
@@ -1,9 +1,4 @@
 import re
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
-from src.models.district import District
-
 
 
 _PL_MAP = str.maketrans({
@@ -25,33 +20,7 @@ def to_code(text: str) -> str:
     t = re.sub(r"[ \-]+", "", t)
     return t
 
-async def find_district_by_name(db: AsyncSession, name: str) -> Optional[District]:
-    code = to_code(name)
-    stmt_code = select(District).where(func.lower(District.code) == code)
-    row = (await db.execute(stmt_code)).scalars().first()
-    if row:
-        return row
-
-    stmt = select(District).where(func.lower(District.name) == func.lower(name))
-    row = (await db.execute(stmt)).scalars().first()
-    if row:
-        return row
-
-    stmt2 = select(District).where(District.name.ilike(f"{name}%"))
-    row = (await db.execute(stmt2)).scalars().first()
-    if row:
-        return row
-
-    target = normalize_pl(name)
-    all_rows = (await db.execute(select(District))).scalars().all()
-
-    for r in all_rows:
-        norm = normalize_pl(r.name)
-        if norm == target or norm.startswith(target):
-            return r
-
-    for r in all_rows:
-        if to_code(r.name) == code or to_code(r.name).startswith(code):
-            return r
 
-    return None
+def name_key(text: str) -> str:
+    """Separator-insensitive key: 'Praga-Południe', 'praga_poludnie' and 'praga południe' all agree."""
+    return re.sub(r"[^a-z0-9]+", "", normalize_pl(text))
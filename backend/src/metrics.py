@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Latencies here are mostly milliseconds; the tail buckets catch cold snapshot builds.
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database statements executed while serving one request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+QUERY_LATENCY = Histogram(
+    "db_statement_duration_seconds",
+    "Database statement latency by operation and main table.",
+    ["operation", "table"],
+    buckets=_LATENCY_BUCKETS,
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for (or opening) a pooled connection.",
+    ["engine"],
+    buckets=_LATENCY_BUCKETS,
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after the pool timeout.",
+    ["engine"],
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured number of persistent pooled connections.", ["engine"])
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently in use.", ["engine"])
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (negative while the pool fills).", ["engine"]
+)
+GEOCODER_LATENCY = Histogram(
+    "geocoder_request_duration_seconds",
+    "Outbound geocoder request latency.",
+    ["outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+
+class RequestStats:
+    __slots__ = ("queries",)
+
+    def __init__(self) -> None:
+        self.queries = 0
+
+
+# Set by MetricsMiddleware for the duration of a request; engine events count into it.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """The default async pool, timing how long each checkout waits for a connection."""
+
+    # The engine's name in the metrics (primary, replica_0, ...); set by instrument_engine.
+    engine_name = "primary"
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool, which must keep reporting as the same engine.
+        pool = super().recreate()
+        pool.engine_name = self.engine_name
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(self.engine_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.engine_name).observe(time.perf_counter() - start)
+
+
+_STATEMENT_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+\"?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_labels(statement: str) -> tuple[str, str]:
+    """(operation, table) for a SQL string, e.g. ('SELECT', 'safety')."""
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    # Prefer the outermost FROM, so correlated subqueries do not name the statement.
+    matches = list(_STATEMENT_TABLE.finditer(statement))
+    top = [m for m in matches if statement.count("(", 0, m.start()) == statement.count(")", 0, m.start())]
+    match = (top or matches or [None])[0]
+    return operation, match.group(1) if match else "-"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts: List[float] = conn.info.get("query_start") or []
+    if starts:
+        QUERY_LATENCY.labels(*statement_labels(statement)).observe(time.perf_counter() - starts.pop())
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+    pool = sync_engine.pool
+    if isinstance(pool, TimedQueuePool):
+        pool.engine_name = name
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        POOL_SIZE.labels(name).set_function(pool.size)
+        POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+        POOL_OVERFLOW.labels(name).set_function(pool.overflow)
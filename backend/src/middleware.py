@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import zlib
+from typing import Callable, Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics import REQUEST_LATENCY, REQUEST_QUERIES, RequestStats, current_request
+
+# Content types worth compressing; everything else (images, already-compressed data) passes through.
+_COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+
+
+def _matching_etag(if_none_match: str, etag: str) -> Optional[str]:
+    """The tag in If-None-Match that matches ``etag``, or None.
+
+    Weak comparison per RFC 9110, also accepting our content-coding suffixed variants;
+    the matched variant is returned so a 304 names the representation the client holds.
+    """
+    if if_none_match.strip() == "*":
+        return etag
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        tag = candidate.strip().removeprefix("W/").strip('"')
+        if tag == base or tag.startswith(base + "-"):
+            return f'"{tag}"'
+    return None
+
+
+class ConditionalGetMiddleware:
+    """Strong ETags derived from the dataset version, answered with 304 before the app runs.
+
+    ``version_getter`` returns the in-memory dataset version of the data behind a request
+    path, or None when the response is not determined by it (no ETag is sent then), so a
+    revalidation never touches the database.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        version_getter: Callable[[str], Optional[str]],
+        path_prefix: str = "/api/",
+        max_age: int = 60,
+    ) -> None:
+        self.app = app
+        self.version_getter = version_getter
+        self.path_prefix = path_prefix
+        self.cache_control = f"public, max-age={max_age}"
+
+    def _etag(self, scope: Scope, version: str) -> str:
+        key = f"{version}|{scope['path']}|{scope.get('query_string', b'').decode('latin-1')}"
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:24] + '"'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        version = self.version_getter(scope["path"])
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = self._etag(scope, version)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        matched = _matching_etag(if_none_match, etag) if if_none_match else None
+        if matched is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (b"etag", matched.encode()),
+                        (b"cache-control", self.cache_control.encode()),
+                        (b"vary", b"Accept-Encoding"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("etag", etag)
+                headers.setdefault("cache-control", self.cache_control)
+                headers.add_vary_header("Accept-Encoding")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class _Encoder:
+    def __init__(self, coding: str, level: int) -> None:
+        self.coding = coding
+        if coding == "br":
+            self._impl = brotli.Compressor(quality=level)
+        else:
+            self._impl = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.coding == "br":
+            return self._impl.process(data)
+        return self._impl.compress(data)
+
+    def finish(self) -> bytes:
+        return self._impl.finish() if self.coding == "br" else self._impl.flush()
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for compressible bodies above ``minimum_size``; streams stay streamed."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, scope: Scope) -> Optional[str]:
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        offered = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+        if "br" in offered:
+            return "br"
+        if "gzip" in offered:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        coding = self._choose(scope) if scope["type"] == "http" else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                    or not content_type.startswith(_COMPRESSIBLE)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None and encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    passthrough = True
+                    return
+                level = self.brotli_quality if coding == "br" else self.gzip_level
+                encoder = _Encoder(coding, level)
+                headers = MutableHeaders(scope=start)
+                headers["content-encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and etag.endswith('"') and not etag.startswith("W/"):
+                    # A strong ETag must change with the representation's encoding.
+                    headers["etag"] = etag[:-1] + f'-{coding}"'
+                if more_body:
+                    del headers["content-length"]
+                    await send(start)
+                    start = None
+                else:
+                    compressed = encoder.compress(body) + encoder.finish()
+                    headers["content-length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+            chunk = encoder.compress(body)
+            if not more_body:
+                chunk += encoder.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class MetricsMiddleware:
+    """Latency and DB statement count per request, labelled by the matched route template.
+
+    Unmatched paths share one label so scanners cannot blow up metric cardinality.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_request.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(time.perf_counter() - start)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
@@ -1,5 +1,6 @@
 from .base import Base  # noqa: F401
 
+from .city import City  # noqa: F401
 from .district import District  # noqa: F401
 from .district_aggregate import DistrictAggregate  # noqa: F401
 from .safety import Safety  # noqa: F401
@@ -9,4 +10,7 @@ from .district_rhythm import DistrictRhythm  # noqa: F401
 from .green_places import GreenPlaces  # noqa: F401
 from .digital_noise import DigitalNoise  # noqa: F401
 from .life_balance import LifeBalance  # noqa: F401
+from .dataset_version import DatasetVersion  # noqa: F401
+from .indicator_latest import IndicatorLatest  # noqa: F401
+from .district_summary import DistrictSummary  # noqa: F401
 from .enums import Daypart, DistrictType  # noqa: F401
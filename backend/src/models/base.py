@@ -1,3 +1,27 @@
 # Use the single Base defined in src.db so all models share the same metadata
+from sqlalchemy import Column, Date, ForeignKeyConstraint, Index, String, text
+
 from src.db import Base  # noqa: F401
 
+# District and indicator tables are LIST-partitioned by city, one partition per city
+# (created by the add_city() SQL function). The partition key has to be part of every
+# primary key and unique constraint.
+PARTITION_BY_CITY = {"postgresql_partition_by": "LIST (city)"}
+
+
+def city_column() -> Column:
+    return Column("city", String(32), primary_key=True)
+
+
+def district_fk() -> ForeignKeyConstraint:
+    return ForeignKeyConstraint(["city", "district_id"], ["districts.city", "districts.id"], ondelete="CASCADE")
+
+
+def period_column() -> Column:
+    """First day of the reporting month a row describes; defaults to the month it was loaded."""
+    return Column("period", Date, nullable=False, server_default=text("date_trunc('month', now())::date"))
+
+
+def period_index(table: str) -> Index:
+    # Rows are appended period by period, so a BRIN range index stays tiny and prunes well.
+    return Index(f"ix_{table}_period", "period", postgresql_using="brin")
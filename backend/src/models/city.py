@@ -0,0 +1,17 @@
+from sqlalchemy import CheckConstraint, String
+from sqlalchemy.orm import mapped_column
+from .base import Base
+
+
+class City(Base):
+    """A city with its own partition of every district table."""
+
+    __tablename__ = "cities"
+    __table_args__ = (CheckConstraint("code ~ '^[a-z][a-z0-9_]*$'", name="ck_cities_code"),)
+
+    # URL segment and partition suffix, e.g. "warszawa".
+    code = mapped_column(String(32), primary_key=True)
+    name = mapped_column(String(200), nullable=False)
+    # Appended to free-text addresses before geocoding, e.g. "Warszawa, Polska".
+    geocoder_query = mapped_column(String(200), nullable=False)
+    country_code = mapped_column(String(2), nullable=False)
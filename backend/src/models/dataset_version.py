@@ -0,0 +1,16 @@
+from sqlalchemy import ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import BIGINT
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.types import TIMESTAMP
+from .base import Base
+
+
+class DatasetVersion(Base):
+    """Per-city counter bumped by every indicator load; drives ETags and cache refreshes."""
+
+    __tablename__ = "dataset_version"
+
+    id = mapped_column(Integer, primary_key=True)
+    city = mapped_column(String(32), ForeignKey("cities.code"), nullable=False, unique=True)
+    version = mapped_column(BIGINT, nullable=False, default=1)
+    updated_at = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
@@ -1,17 +1,19 @@
-from sqlalchemy import String, Float, JSON, ForeignKey, TIMESTAMP, Integer
+from sqlalchemy import String, Float, JSON, ForeignKey, TIMESTAMP, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, BIGINT, ENUM
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.types import Float
-from .base import Base
+from .base import PARTITION_BY_CITY, Base
 from .enums import DistrictType
 
 
 class District(Base):
     __tablename__ = "districts"
+    __table_args__ = (UniqueConstraint("city", "code", name="districts_city_code_key"), PARTITION_BY_CITY)
 
     id = mapped_column(BIGINT, primary_key=True, autoincrement=True)
+    city = mapped_column(String(32), ForeignKey("cities.code"), primary_key=True)
     name = mapped_column(String(200), nullable=False, index=True)
-    code = mapped_column(String(100), nullable=False, unique=True)
+    code = mapped_column(String(100), nullable=False)
 
     district_type = mapped_column(
         "district_type",
@@ -1,21 +1,24 @@
 from typing import Optional
-from sqlalchemy import Integer, UniqueConstraint, Index, ForeignKey, String
+from sqlalchemy import Integer, UniqueConstraint, Index, String
 from sqlalchemy.dialects.postgresql import JSONB, BIGINT
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.types import TIMESTAMP, Float
-from .base import Base
+from .base import PARTITION_BY_CITY, Base, city_column, district_fk, period_column, period_index
 
 
 class DistrictAggregate(Base):
     __tablename__ = "district_aggregates"
+    __table_args__ = (
+        district_fk(),
+        Index("ix_district_aggregates_district_id_daypart", "district_id", "period", "daypart"),
+        period_index("district_aggregates"),
+        PARTITION_BY_CITY,
+    )
 
     id = mapped_column(BIGINT, primary_key=True, autoincrement=True)
-    district_id = mapped_column(
-        "district_id",
-        BIGINT,
-        ForeignKey("districts.id", ondelete="CASCADE"),
-        nullable=False,
-    )
+    city = city_column()
+    district_id = mapped_column("district_id", BIGINT, nullable=False)
+    period = period_column()
 
     daypart = mapped_column(String(32), nullable=True)
     score_0_100 = mapped_column(Float, nullable=True)
@@ -0,0 +1,41 @@
+from sqlalchemy import Float, String
+from sqlalchemy.dialects.postgresql import BIGINT, ENUM
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.types import TIMESTAMP
+from .base import Base
+from .enums import DistrictType
+
+
+class DistrictSummary(Base):
+    """One row per district with every headline and daypart score; read-only for the API.
+
+    Rebuilt by the refresh_district_summary(city, district_ids) SQL function, which loaders
+    call for the districts they wrote, in the load's transaction.
+    """
+
+    __tablename__ = "district_summary"
+
+    district_id = mapped_column(BIGINT, primary_key=True, autoincrement=False)
+    city = mapped_column(String(32), nullable=False, index=True)
+    name = mapped_column(String(200), nullable=False)
+    code = mapped_column(String(100), nullable=False)
+    district_type = mapped_column(
+        ENUM(DistrictType, name="district_type", create_type=False),
+        nullable=True,
+    )
+
+    normalized_score = mapped_column(Float, nullable=True)
+    rhythm_score = mapped_column(Float, nullable=True)
+    green_life_score = mapped_column(Float, nullable=True)
+    digital_noise_score = mapped_column(Float, nullable=True)
+    social_availability_score = mapped_column(Float, nullable=True)
+    life_balance_score = mapped_column(Float, nullable=True)
+    safety_index = mapped_column(Float, nullable=True)
+    safety_level = mapped_column(String, nullable=True)
+
+    traffic_morning = mapped_column(Float, nullable=True)
+    traffic_noon = mapped_column(Float, nullable=True)
+    traffic_evening = mapped_column(Float, nullable=True)
+    traffic_night = mapped_column(Float, nullable=True)
+
+    refreshed_at = mapped_column(TIMESTAMP(timezone=True), nullable=False)
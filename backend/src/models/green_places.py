@@ -1,13 +1,22 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer
+from sqlalchemy import Column, Float, Index, Integer
+from sqlalchemy.dialects.postgresql import BIGINT
 from sqlalchemy.orm import relationship
 from .district import District
-from .base import Base
+from .base import PARTITION_BY_CITY, Base, city_column, district_fk, period_column, period_index
 
 
 class GreenPlaces(Base):
     __tablename__ = "green_places"
-    id = Column(Integer, primary_key=True, index=True)
-    district_id = Column(Integer, ForeignKey("districts.id", ondelete="CASCADE"), nullable=False)
+    __table_args__ = (
+        district_fk(),
+        Index("ix_green_places_district_id", "district_id", "period", "id"),
+        period_index("green_places"),
+        PARTITION_BY_CITY,
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    city = city_column()
+    district_id = Column(BIGINT, nullable=False)
+    period = period_column()
     green_life_score = Column(Float, nullable=False)
     total_obs = Column(Integer)
     green_obs = Column(Integer)
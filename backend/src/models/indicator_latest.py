@@ -0,0 +1,25 @@
+from sqlalchemy import Date, ForeignKeyConstraint, String
+from sqlalchemy.dialects.postgresql import BIGINT
+from sqlalchemy.orm import mapped_column
+from .base import Base
+
+
+class IndicatorLatest(Base):
+    """Newest reporting period per (city, indicator table, district).
+
+    Kept current by statement-level triggers on every indicator table, so "latest" reads
+    are a primary-key lookup instead of a max(period) scan; bulk loads skip the triggers
+    and move the pointers themselves. Created with fillfactor 50, so those moves are HOT
+    updates.
+    """
+
+    __tablename__ = "indicator_latest"
+    __table_args__ = (
+        ForeignKeyConstraint(["city", "district_id"], ["districts.city", "districts.id"], ondelete="CASCADE"),
+    )
+
+    city = mapped_column(String(32), primary_key=True)
+    # Indicator table name, e.g. "safety" or "district_aggregates".
+    indicator = mapped_column(String(64), primary_key=True)
+    district_id = mapped_column(BIGINT, primary_key=True)
+    period = mapped_column(Date, nullable=False)
@@ -1,13 +1,22 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, Float, Index, Integer, String
+from sqlalchemy.dialects.postgresql import BIGINT
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import PARTITION_BY_CITY, Base, city_column, district_fk, period_column, period_index
 
 
 class Safety(Base):
     __tablename__ = "safety"
+    __table_args__ = (
+        district_fk(),
+        Index("ix_safety_district_id", "district_id", "period", "id"),
+        period_index("safety"),
+        PARTITION_BY_CITY,
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    district_id = Column(Integer, ForeignKey("districts.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    city = city_column()
+    district_id = Column(BIGINT, nullable=False)
+    period = period_column()
     incidents = Column(Integer, nullable=False)
     incident_norm = Column(Float, nullable=False)
     safety_index = Column(Float, nullable=False)
@@ -1,13 +1,23 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer
+from sqlalchemy import Column, Float, Index, Integer
+from sqlalchemy.dialects.postgresql import BIGINT
 from sqlalchemy.orm import relationship
 from .district import District
-from .base import Base
+from .base import PARTITION_BY_CITY, Base, city_column, district_fk, period_column, period_index
 
 
 class SocialLife(Base):
     __tablename__ = "social_life"
-    id = Column(Integer, primary_key=True, index=True)
-    district_id = Column(Integer, ForeignKey("districts.id", ondelete="CASCADE"), nullable=False)
+    # (district_id, period, id): a district's history, and the rows of one period, without a sort.
+    __table_args__ = (
+        district_fk(),
+        Index("ix_social_life_district_id", "district_id", "period", "id"),
+        period_index("social_life"),
+        PARTITION_BY_CITY,
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    city = city_column()
+    district_id = Column(BIGINT, nullable=False)
+    period = period_column()
     normalized_score = Column(Float, nullable=False)
     raw_score = Column(Float)
     rows = Column(Integer)
@@ -1,19 +1,21 @@
 from __future__ import annotations
-import httpx
 import re
+from datetime import date
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query, HTTPException, Path, Body
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Query, HTTPException, Path, Body, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 
-from src.db import get_db
+from src.db import get_read_db, read_router
 from src.models import (
     District,
     DistrictAggregate,
+    DistrictSummary,
     SocialLife,
     DistrictRhythm,
     GreenPlaces,
@@ -22,11 +24,21 @@ from src.models import (
     LifeBalance,
     Safety,
 )
+from src.schemas.city import CityRead
 from src.schemas.district import (
     DistrictBaseItem,
     DistrictRead,
     DistrictDetailRead,
     DistrictListResponse,
+    DistrictColumnarSnapshot,
+    DistrictPointMatch,
+    DistrictSearchHit,
+    DistrictRankItem,
+    DistrictNeighbour,
+    DistrictSimilarRead,
+    DistrictSummaryRead,
+    DistrictHistoryRead,
+    PointsQuery,
     DistrictAggregateRead,
     SocialLifeRead,
     DistrictRhythmRead,
@@ -36,7 +48,30 @@ from src.schemas.district import (
     LifeBalanceRead,
     SafetyRead,
 )
-from src.helpers import find_district_by_name
+from src.services.cities import get_city
+from src.services.export import (
+    MEDIA_TYPES,
+    ColumnarFormat,
+    ExportFormat,
+    stream_district_table,
+    stream_indicator,
+)
+from src.services.geocoding import (
+    AddressNotFoundError,
+    DistrictNotDeterminedError,
+    Geocoder,
+    GeocodingError,
+    get_geocoder,
+)
+from src.services.history import district_history
+from src.services.pagination import decode_cursor, next_cursor, paginate, row_counts, set_next_cursor
+from src.services.ranking import Ranked, ScoreColumn, parse_weights
+from src.services.registry import INDICATORS, IndicatorName
+from src.services.serialization import list_page, render_rows
+from src.services.similarity import Neighbour, SimilarityIndex, similarity_index
+from src.services.summary import summary_rank
+from src.services.spatial import DistrictLocator, get_locator
+from src.services.snapshot import DistrictSnapshot, get_snapshot, in_period
 
 
 router = APIRouter(prefix="/districts", tags=["districts"])
@@ -44,171 +79,477 @@ router = APIRouter(prefix="/districts", tags=["districts"])
 
 @router.get("/base", response_model=List[DistrictBaseItem])
 async def list_districts_base(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=1000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[DistrictBaseItem]:
-    stmt = select(District).order_by(District.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, District, DistrictBaseItem, response, page, size, after, city.code)
 
 
 @router.get("/", response_model=DistrictListResponse)
 async def list_districts(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    include_total: bool = Query(False, description="Also return the (cached, possibly estimated) row count"),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> DistrictListResponse:
-    total = (await db.execute(select(func.count()).select_from(District))).scalar_one()
-    stmt = (
-        select(District)
-        .order_by(District.id.desc())
-        .offset((page - 1) * size)
-        .limit(size)
-    )
+    total = await row_counts.count(db, District, city.code) if include_total else None
+    stmt = paginate(select(District).where(District.city == city.code), District.id, page, size, after)
     rows = (await db.execute(stmt)).scalars().all()
-    return DistrictListResponse(items=rows, total=total, page=page, size=size)
+    return DistrictListResponse(
+        items=rows,
+        total=total,
+        page=page,
+        size=size,
+        next_cursor=next_cursor([r.id for r in rows], size),
+    )
+
+
+_IDS_PATTERN = r"^\d+(,\d+)*$"
+
+
+def _parse_ids(ids: str) -> List[int]:
+    return list(dict.fromkeys(int(i) for i in ids.split(",")))
+
+
+@router.get("/snapshot", response_model=DistrictColumnarSnapshot)
+async def get_city_snapshot(
+    ids: Optional[str] = Query(None, pattern=_IDS_PATTERN, description="Comma-separated district ids; all when omitted"),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> Response:
+    if ids is None:
+        return Response(content=snapshot.columnar_json, media_type="application/json")
+    return JSONResponse(content=jsonable_encoder(snapshot.columnar(_parse_ids(ids))))
 
 
 @router.get("/detailed", response_model=List[DistrictDetailRead])
 async def list_districts_detailed(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=200),
     id: Optional[int] = Query(None, ge=1, description="Filter by district id"),
-    db: AsyncSession = Depends(get_db),
+    ids: Optional[str] = Query(None, pattern=_IDS_PATTERN, description="Comma-separated district ids, e.g. 1,2,3"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
 ) -> List[DistrictDetailRead]:
-    base = (
-        select(District)
-        .options(
-            selectinload(District.social_life),
-            selectinload(District.district_rhythm),
-            selectinload(District.green_places),
-            selectinload(District.digital_noise),
-            selectinload(District.social_availability),
-            selectinload(District.life_balance),
-            selectinload(District.safety),
-            selectinload(District.aggregates),
-        )
-    )
     if id is not None:
-        stmt = base.where(District.id == id).order_by(District.id.desc())
+        detail = snapshot.get(id)
+        return [detail] if detail is not None else []
+    if ids is not None:
+        return snapshot.many(_parse_ids(ids))
+    if after is not None:
+        items = snapshot.page_after(decode_cursor(after), size)
     else:
-        stmt = base.order_by(District.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().unique().all()
-    return rows
+        items = snapshot.page(page, size)
+    set_next_cursor(response, [d.id for d in items], size)
+    return items
 
 
 @router.get("/aggregates", response_model=List[DistrictAggregateRead])
 async def list_district_aggregates(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[DistrictAggregateRead]:
-    stmt = select(DistrictAggregate).order_by(DistrictAggregate.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, DistrictAggregate, DistrictAggregateRead, response, page, size, after, city.code, period)
 
 
 @router.get("/social_life", response_model=List[SocialLifeRead])
 async def list_social_life(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[SocialLifeRead]:
-    stmt = select(SocialLife).order_by(SocialLife.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, SocialLife, SocialLifeRead, response, page, size, after, city.code, period)
 
 
 @router.get("/district_rhythm", response_model=List[DistrictRhythmRead])
 async def list_district_rhythm(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[DistrictRhythmRead]:
-    stmt = select(DistrictRhythm).order_by(DistrictRhythm.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, DistrictRhythm, DistrictRhythmRead, response, page, size, after, city.code, period)
 
 
 @router.get("/green_places", response_model=List[GreenPlacesRead])
 async def list_green_places(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[GreenPlacesRead]:
-    stmt = select(GreenPlaces).order_by(GreenPlaces.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, GreenPlaces, GreenPlacesRead, response, page, size, after, city.code, period)
 
 
 @router.get("/digital_noise", response_model=List[DigitalNoiseRead])
 async def list_digital_noise(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[DigitalNoiseRead]:
-    stmt = select(DigitalNoise).order_by(DigitalNoise.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, DigitalNoise, DigitalNoiseRead, response, page, size, after, city.code, period)
 
 
 @router.get("/social_availability", response_model=List[SocialAvailabilityRead])
 async def list_social_availability(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[SocialAvailabilityRead]:
-    stmt = select(SocialAvailability).order_by(SocialAvailability.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, SocialAvailability, SocialAvailabilityRead, response, page, size, after, city.code, period)
 
 
 @router.get("/life_balance", response_model=List[LifeBalanceRead])
 async def list_life_balance(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[LifeBalanceRead]:
-    stmt = select(LifeBalance).order_by(LifeBalance.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, LifeBalance, LifeBalanceRead, response, page, size, after, city.code, period)
 
 
 @router.get("/safety", response_model=List[SafetyRead])
 async def list_safety(
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(100, ge=1, le=5000),
-    db: AsyncSession = Depends(get_db),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[SafetyRead]:
-    stmt = select(Safety).order_by(Safety.id.desc()).offset((page - 1) * size).limit(size)
-    rows = (await db.execute(stmt)).scalars().all()
-    return rows
+    return await list_page(db, Safety, SafetyRead, response, page, size, after, city.code, period)
+
+
+@router.get("/search", response_model=List[DistrictSearchHit])
+async def search_districts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> List[DistrictSearchHit]:
+    hits = []
+    for match in snapshot.names.search(q, limit):
+        detail = snapshot.details[match.district_id]
+        hits.append(
+            DistrictSearchHit(
+                id=detail.id,
+                name=detail.name,
+                code=detail.code,
+                score=round(match.score, 4),
+                match=match.match,
+            )
+        )
+    return hits
+
+
+def _require_locator(locator: Optional[DistrictLocator] = Depends(get_locator)) -> DistrictLocator:
+    if locator is None:
+        raise HTTPException(status_code=503, detail="District boundaries are not loaded")
+    return locator
+
+
+@router.get("/by_point", response_model=DistrictBaseItem)
+async def get_district_by_point(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    locator: DistrictLocator = Depends(_require_locator),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> DistrictBaseItem:
+    key = locator.locate(lat, lon)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Point is outside every district")
+    detail = snapshot.get_by_key(key)
+    if detail is None:
+        raise HTTPException(status_code=404, detail=f"District '{key}' not found in database")
+    return detail
+
+
+@router.post("/by_point", response_model=List[DistrictPointMatch])
+async def get_districts_by_points(
+    body: PointsQuery,
+    locator: DistrictLocator = Depends(_require_locator),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> List[DistrictPointMatch]:
+    matches = []
+    for point in body.points:
+        key = locator.locate(point.lat, point.lon)
+        detail = snapshot.get_by_key(key) if key is not None else None
+        matches.append(DistrictPointMatch(lat=point.lat, lon=point.lon, district=detail))
+    return matches
+
+
+def _rank_items(ranked: List[Ranked]) -> List[DistrictRankItem]:
+    return [
+        DistrictRankItem(id=r.district_id, name=r.name, value=r.value, rank=r.rank, percentile=r.percentile)
+        for r in ranked
+    ]
+
+
+@router.get("/rank", response_model=List[DistrictRankItem])
+async def rank_districts(
+    indicator: ScoreColumn,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(10, ge=1, le=1000),
+    source: str = Query(
+        "snapshot",
+        pattern="^(snapshot|summary)$",
+        description="snapshot: in-process score matrix; summary: ranked by Postgres over district_summary",
+    ),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[DistrictRankItem]:
+    descending = order == "desc"
+    if source == "summary":
+        return _rank_items(await summary_rank(db, city.code, indicator.value, descending=descending, limit=limit))
+    return _rank_items(snapshot.scores.rank(indicator.value, descending=descending, limit=limit))
+
+
+@router.get("/score", response_model=List[DistrictRankItem])
+async def score_districts(
+    weights: str = Query(
+        ...,
+        description="Comma-separated indicator:weight pairs, e.g. safety_index:2,green_life_score:1,digital_noise_score:-1. "
+        "A negative weight means lower is better.",
+    ),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(10, ge=1, le=1000),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> List[DistrictRankItem]:
+    try:
+        parsed = parse_weights(weights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return _rank_items(snapshot.scores.score(parsed, descending=order == "desc", limit=limit))
+
+
+async def _require_similarity(snapshot: DistrictSnapshot = Depends(get_snapshot)) -> SimilarityIndex:
+    index = await similarity_index(snapshot)
+    if index is None:
+        raise HTTPException(status_code=503, detail="District embeddings are not loaded")
+    return index
+
+
+def _neighbours(neighbours: List[Neighbour]) -> List[DistrictNeighbour]:
+    return [DistrictNeighbour(id=n.district_id, name=n.name, similarity=n.similarity) for n in neighbours]
+
+
+@router.get("/similar", response_model=List[DistrictSimilarRead])
+async def list_similar_districts(
+    ids: str = Query(..., pattern=_IDS_PATTERN, description="Comma-separated district ids, e.g. 1,2,3"),
+    k: int = Query(5, ge=1, le=100),
+    index: SimilarityIndex = Depends(_require_similarity),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+) -> List[DistrictSimilarRead]:
+    results = index.similar_many(_parse_ids(ids), k)
+    return [
+        DistrictSimilarRead(id=district_id, name=snapshot.details[district_id].name, similar=_neighbours(neighbours))
+        for district_id, neighbours in results.items()
+    ]
+
+
+@router.get("/{id}/similar", response_model=List[DistrictNeighbour])
+async def get_similar_districts(
+    _id: int = Path(..., ge=1, alias="id"),
+    k: int = Query(5, ge=1, le=100),
+    index: SimilarityIndex = Depends(_require_similarity),
+) -> List[DistrictNeighbour]:
+    if _id not in index:
+        raise HTTPException(status_code=404, detail="District not found or has no embedding")
+    return _neighbours(index.similar(_id, k))
+
+
+@router.get("/indicators/{name}", response_model=List[Dict[str, Any]])
+async def list_indicator(
+    name: IndicatorName,
+    page: int = Query(1, ge=1),
+    size: int = Query(100, ge=1, le=5000),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor; overrides page"),
+    fields: Optional[str] = Query(
+        None,
+        pattern=r"^\w+(,\w+)*$",
+        description="Comma-separated columns to return, e.g. district_id,life_balance_score; id is always included",
+    ),
+    district_id: Optional[int] = Query(None, ge=1),
+    period: Optional[date] = Query(
+        None, description="Reporting month, e.g. 2025-09-01 (any day selects its month); each district's latest when omitted"
+    ),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    indicator = INDICATORS[name.value]
+    selected = indicator.fields
+    if fields is not None:
+        requested = list(dict.fromkeys(fields.split(",")))
+        unknown = [f for f in requested if f not in indicator.fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields for {name.value}: {', '.join(unknown)}")
+        selected = tuple(["id"] + [f for f in requested if f != "id"])
+
+    stmt = select(*indicator.columns(selected)).where(
+        indicator.model.city == city.code, in_period(indicator.model, period)
+    )
+    if district_id is not None:
+        stmt = stmt.where(indicator.model.district_id == district_id)
+    stmt = paginate(stmt, indicator.model.id, page, size, after)
+    rows = (await db.execute(stmt)).mappings().all()
+    response = render_rows(indicator.projection(selected), rows)
+    set_next_cursor(response, [r["id"] for r in rows], size)
+    return response
+
+
+@router.get(
+    "/export/districts.{fmt}",
+    response_class=StreamingResponse,
+    responses={200: {"content": {MEDIA_TYPES[f]: {} for f in ColumnarFormat}}},
+)
+async def export_districts_columnar(
+    fmt: ColumnarFormat,
+    indicators: Optional[str] = Query(
+        None,
+        pattern=r"^\w+(,\w+)*$",
+        description="Comma-separated indicators to join, e.g. safety,life_balance; all when omitted",
+    ),
+    period: Optional[date] = Query(
+        None,
+        description="Reporting month, e.g. 2025-09-01 (any day selects its month); each indicator's latest when omitted",
+    ),
+    city: CityRead = Depends(get_city),
+) -> StreamingResponse:
+    """One row per district with one period of each indicator, as an Arrow IPC file or Parquet.
+
+    Aggregates are pivoted into per-daypart columns. Streamed batch by batch from a
+    server-side cursor.
+    """
+    names = list(dict.fromkeys(indicators.split(","))) if indicators else list(INDICATORS)
+    unknown = [n for n in names if n not in INDICATORS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown indicators: {', '.join(unknown)}")
+    return StreamingResponse(
+        stream_district_table(
+            read_router,
+            [INDICATORS[n] for n in names],
+            city.code,
+            fmt,
+            period.replace(day=1) if period is not None else None,
+        ),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="districts.{fmt.value}"'},
+    )
+
+
+@router.get(
+    "/export/{name}.{fmt}",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+async def export_indicator(
+    name: IndicatorName,
+    fmt: ExportFormat,
+    district_id: Optional[int] = Query(None, ge=1),
+    city: CityRead = Depends(get_city),
+) -> StreamingResponse:
+    """Whole indicator table as NDJSON or CSV, streamed from a server-side cursor."""
+    indicator = INDICATORS[name.value]
+    return StreamingResponse(
+        stream_indicator(read_router, indicator, fmt, city.code, district_id=district_id),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name.value}.{fmt.value}"'},
+    )
+
+
+@router.get("/{id}/summary", response_model=DistrictSummaryRead)
+async def get_district_summary(
+    _id: int = Path(..., ge=1, alias="id"),
+    city: CityRead = Depends(get_city),
+    db: AsyncSession = Depends(get_read_db),
+) -> DistrictSummaryRead:
+    """Headline scores for one district from district_summary (one primary-key lookup)."""
+    summary = await db.get(DistrictSummary, _id)
+    if summary is None or summary.city != city.code:
+        raise HTTPException(status_code=404, detail="District not found")
+    return summary
+
+
+@router.get("/{id}/history", response_model=DistrictHistoryRead)
+async def get_district_history(
+    indicator: IndicatorName,
+    _id: int = Path(..., ge=1, alias="id"),
+    from_: Optional[date] = Query(
+        None, alias="from", description="First period, inclusive, e.g. 2025-01-01 (any day selects its month)"
+    ),
+    to: Optional[date] = Query(None, description="Last period, inclusive (any day selects its month)"),
+    city: CityRead = Depends(get_city),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+    db: AsyncSession = Depends(get_read_db),
+) -> DistrictHistoryRead:
+    """One district's indicator values per reporting period, as parallel arrays."""
+    if from_ is not None and to is not None and from_.replace(day=1) > to.replace(day=1):
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if snapshot.get(_id) is None:
+        raise HTTPException(status_code=404, detail="District not found")
+    history = await district_history(db, city.code, INDICATORS[indicator.value], _id, from_, to)
+    return DistrictHistoryRead(**history)
 
 
 @router.get("/{id}/detail", response_model=DistrictDetailRead)
 async def get_district_detail_by_id(
-    _id: int = Path(..., ge=1),
-    db: AsyncSession = Depends(get_db),
+    _id: int = Path(..., ge=1, alias="id"),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
 ) -> DistrictDetailRead:
-    stmt = (
-        select(District)
-        .where(District.id == _id)
-        .options(
-            selectinload(District.social_life),
-            selectinload(District.district_rhythm),
-            selectinload(District.green_places),
-            selectinload(District.digital_noise),
-            selectinload(District.social_availability),
-            selectinload(District.life_balance),
-            selectinload(District.safety),
-            selectinload(District.aggregates),
-        )
-    )
-    row = (await db.execute(stmt)).scalars().unique().one_or_none()
-    if row is None:
+    detail = snapshot.get(_id)
+    if detail is None:
         raise HTTPException(status_code=404, detail="District not found")
-    return row
+    return detail
 
 
 @router.post("/by_address", response_model=DistrictBaseItem)
@@ -219,58 +560,21 @@ async def get_district_by_address_post(
         min_length=3,
         description="Street and number, e.g. 'Marszałkowska 140'",
     ),
-    db: AsyncSession = Depends(get_db),
+    city: CityRead = Depends(get_city),
+    snapshot: DistrictSnapshot = Depends(get_snapshot),
+    geocoder: Geocoder = Depends(get_geocoder),
 ) -> DistrictBaseItem:
-    params = {
-        "format": "jsonv2",
-        "addressdetails": 1,
-        "limit": 1,
-        "q": f"{address}, Warszawa, Polska",
-        "countrycodes": "pl",
-    }
-    headers = {"User-Agent": "warsaw-districts/1.0 (contact@example.com)"}
     try:
-        async with httpx.AsyncClient(timeout=10.0, headers=headers) as client:
-            resp = await client.get("https://nominatim.openstreetmap.org/search", params=params)
-            resp.raise_for_status()
-            data = resp.json()
-    except httpx.HTTPError as e:
-        raise HTTPException(status_code=502, detail=f"Geocoding error: {e}") from e
-
-    if not data or "address" not in data[0]:
-        raise HTTPException(status_code=404, detail="Address not found in Warsaw")
-
-    addr = data[0]["address"]
-    district_name = (
-        addr.get("city_district")
-        or addr.get("suburb")
-        or addr.get("borough")
-        or addr.get("quarter")
-        or addr.get("neighbourhood")
-    )
-    if not district_name:
+        district_name = await geocoder.district_name(address, city)
+    except AddressNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Address not found in {city.name}")
+    except DistrictNotDeterminedError:
         raise HTTPException(status_code=404, detail="District could not be determined")
+    except GeocodingError as e:
+        raise HTTPException(status_code=502, detail=f"Geocoding error: {e}") from e
 
-    row = await find_district_by_name(db, district_name)
-    if not row:
-        raise HTTPException(status_code=404, detail=f"District '{district_name}' not found in database")
-
-    stmt = (
-        select(District)
-        .where(District.id == row.id)
-        .options(
-            selectinload(District.social_life),
-            selectinload(District.district_rhythm),
-            selectinload(District.green_places),
-            selectinload(District.digital_noise),
-            selectinload(District.social_availability),
-            selectinload(District.life_balance),
-            selectinload(District.safety),
-            selectinload(District.aggregates),
-        )
-    )
-    detailed = (await db.execute(stmt)).scalars().unique().one_or_none()
+    detailed = snapshot.find_by_name(district_name)
     if detailed is None:
-        raise HTTPException(status_code=404, detail="District not found")
+        raise HTTPException(status_code=404, detail=f"District '{district_name}' not found in database")
 
     return detailed
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CityRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    code: str
+    name: str
+    geocoder_query: str
+    country_code: str
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from datetime import date, datetime
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.models.enums import DistrictType
 
@@ -18,6 +19,7 @@ class DistrictAggregateRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     daypart: Optional[str] = None
     score_0_100: Optional[float] = None
     unique_users: Optional[int] = None
@@ -30,6 +32,7 @@ class SocialLifeRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     normalized_score: float
     raw_score: Optional[float] = None
     rows: Optional[int] = None
@@ -40,6 +43,7 @@ class DistrictRhythmRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     rhythm_score: float
     peak_hour: Optional[int] = None
     activity_amplitude: Optional[float] = None
@@ -51,6 +55,7 @@ class GreenPlacesRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     green_life_score: float
     total_obs: Optional[int] = None
     green_obs: Optional[int] = None
@@ -63,6 +68,7 @@ class DigitalNoiseRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     digital_noise_score: float
     total_obs: Optional[int] = None
     avg_tech_weight: Optional[float] = None
@@ -75,6 +81,7 @@ class SocialAvailabilityRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     social_availability_score: float
     active_hours: Optional[int] = None
 
@@ -84,6 +91,7 @@ class LifeBalanceRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     life_balance_score: float
     presence_ratio: Optional[float] = None
     inverse_noise: Optional[float] = None
@@ -100,6 +108,7 @@ class SafetyRead(BaseModel):
 
     id: int
     district_id: int
+    period: date
     incidents: int
     incident_norm: float
     safety_index: float
@@ -126,11 +135,91 @@ class DistrictDetailRead(DistrictRead):
     aggregates: Optional[List[DistrictAggregateRead]] = None
 
 
+class DistrictSummaryRead(BaseModel):
+    """Row of district_summary: newest headline scores and per-daypart traffic."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    district_id: int
+    name: str
+    code: str
+    district_type: Optional[DistrictType] = None
+    normalized_score: Optional[float] = None
+    rhythm_score: Optional[float] = None
+    green_life_score: Optional[float] = None
+    digital_noise_score: Optional[float] = None
+    social_availability_score: Optional[float] = None
+    life_balance_score: Optional[float] = None
+    safety_index: Optional[float] = None
+    safety_level: Optional[str] = None
+    traffic_morning: Optional[float] = None
+    traffic_noon: Optional[float] = None
+    traffic_evening: Optional[float] = None
+    traffic_night: Optional[float] = None
+    refreshed_at: datetime
+
+
 class DistrictListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     items: List[DistrictRead]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
+    next_cursor: Optional[str] = None
+
+
+
+class PointQuery(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+
+class PointsQuery(BaseModel):
+    points: List[PointQuery] = Field(..., max_length=10000)
+
 
+class DistrictPointMatch(BaseModel):
+    lat: float
+    lon: float
+    district: Optional[DistrictBaseItem] = None
+
+
+class DistrictSearchHit(DistrictBaseItem):
+    code: str
+    score: float
+    match: str
+
+
+class DistrictColumnarSnapshot(BaseModel):
+    """Parallel arrays: ``districts[col][i]`` describes district i; each indicator
+    table carries its own ``district_id`` column."""
+
+    version: str
+    count: int
+    districts: Dict[str, List[Any]]
+    indicators: Dict[str, Dict[str, List[Any]]]
+
+
+class DistrictRankItem(DistrictBaseItem):
+    value: float
+    rank: int
+    percentile: float
+
+
+class DistrictNeighbour(DistrictBaseItem):
+    similarity: float
+
+
+class DistrictSimilarRead(DistrictBaseItem):
+    similar: List[DistrictNeighbour]
+
+
+class DistrictHistoryRead(BaseModel):
+    """One district's indicator rows over time, oldest period first: ``series[field][i]``
+    belongs to ``periods[i]``. Tables with several rows per period repeat the period."""
+
+    district_id: int
+    indicator: str
+    periods: List[date]
+    series: Dict[str, List[Any]]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Path, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import get_settings
+from src.db import AsyncSessionLocal
+from src.models import City
+from src.schemas.city import CityRead
+
+logger = logging.getLogger(__name__)
+
+CITY_CODE_PATTERN = r"^[a-z][a-z0-9_]*$"
+# Unknown codes come straight from request paths, so lookups of them never hit the
+# database more often than this, whatever the configured interval.
+MIN_RELOAD_INTERVAL = 5.0
+
+
+class CityRegistry:
+    """Cities from the cities table, reloaded (at most every ``reload_interval``) on an unknown code."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], reload_interval: float) -> None:
+        self._session_factory = session_factory
+        self._reload_interval = max(reload_interval, MIN_RELOAD_INTERVAL)
+        self._cities: Dict[str, CityRead] = {}
+        self._loaded_at = float("-inf")
+
+    @property
+    def codes(self) -> List[str]:
+        return list(self._cities)
+
+    def all(self) -> List[CityRead]:
+        return list(self._cities.values())
+
+    async def load(self) -> None:
+        self._loaded_at = time.monotonic()
+        async with self._session_factory() as db:
+            rows = (await db.execute(select(City).order_by(City.code))).scalars().all()
+        self._cities = {row.code: CityRead.model_validate(row) for row in rows}
+
+    async def resolve(self, code: str) -> Optional[CityRead]:
+        city = self._cities.get(code)
+        if city is None and time.monotonic() - self._loaded_at >= self._reload_interval:
+            await self.load()
+            city = self._cities.get(code)
+        return city
+
+
+cities = CityRegistry(AsyncSessionLocal, get_settings().CITY_RELOAD_SECONDS)
+
+
+def city_file(template: Optional[str], city: str) -> Optional[str]:
+    """Per-city path from a path setting: "{city}" is substituted; a plain path is the default city's."""
+    if not template:
+        return None
+    if "{city}" in template:
+        return template.replace("{city}", city)
+    return template if city == get_settings().DEFAULT_CITY else None
+
+
+def city_path_param(
+    city: str = Path(..., pattern=CITY_CODE_PATTERN, description="City code, e.g. warszawa"),
+) -> str:
+    """Documents the {city} segment of the city-scoped routes; get_city does the lookup."""
+    return city
+
+
+async def get_city(request: Request) -> CityRead:
+    code = request.path_params.get("city", get_settings().DEFAULT_CITY)
+    city = await cities.resolve(code) if re.match(CITY_CODE_PATTERN, code) else None
+    if city is None:
+        raise HTTPException(status_code=404, detail=f"Unknown city '{code}'")
+    return city
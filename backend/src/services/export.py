@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import enum
+import io
+from datetime import date
+from enum import Enum
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic_core import to_json
+from sqlalchemy import ARRAY, BigInteger, Boolean, Column, Float, Integer, JSON, String, func, select, true, type_coerce
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Date, DateTime
+
+from src.models import District
+from src.models.enums import Daypart
+from src.services.registry import Indicator
+from src.services.snapshot import latest_period
+
+# Rows fetched per server-side cursor round trip and written per response chunk.
+EXPORT_BATCH_SIZE = 2000
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ColumnarFormat(str, Enum):
+    arrow = "arrow"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ColumnarFormat.arrow: "application/vnd.apache.arrow.file",
+    ColumnarFormat.parquet: "application/vnd.apache.parquet",
+}
+
+# Free-text columns that only ever hold a handful of labels.
+_DICTIONARY_COLUMNS = {"safety_level", "daypart"}
+
+
+def _csv_chunk(rows: Sequence[Sequence]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue().encode()
+
+
+def _ndjson_chunk(fields: Sequence[str], rows: Sequence[Sequence]) -> bytes:
+    return b"".join(to_json(dict(zip(fields, row))) + b"\n" for row in rows)
+
+
+async def stream_indicator(
+    session_factory: Callable[[], AsyncSession],
+    indicator: Indicator,
+    fmt: ExportFormat,
+    city: str,
+    district_id: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield one city's rows of an indicator table in id order, one encoded chunk per cursor batch.
+
+    The session is owned by the generator rather than a request dependency, so it lives
+    exactly as long as the stream. Memory stays at one batch: each chunk is only fetched
+    after the previous one was handed to the client, so a slow reader slows the cursor
+    down. A client disconnect cancels the generator, which closes the server-side cursor
+    and rolls the transaction back.
+    """
+    fields = indicator.fields
+    stmt = (
+        select(*indicator.columns())
+        .where(indicator.model.city == city)
+        .order_by(indicator.model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if district_id is not None:
+        stmt = stmt.where(indicator.model.district_id == district_id)
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        try:
+            if fmt is ExportFormat.csv:
+                yield _csv_chunk([fields])
+            async for partition in result.partitions(batch_size):
+                if fmt is ExportFormat.csv:
+                    yield _csv_chunk(partition)
+                else:
+                    yield _ndjson_chunk(fields, partition)
+        finally:
+            await result.close()
+
+
+def arrow_type(column: Column) -> pa.DataType:
+    """Arrow type for a mapped column: keys are int64, labels are dictionary-encoded."""
+    sa_type = column.type
+    if isinstance(sa_type, SAEnum) or column.name in _DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(sa_type, BigInteger) or column.primary_key or column.foreign_keys:
+        return pa.int64()
+    if isinstance(sa_type, Integer):
+        return pa.int32()
+    if isinstance(sa_type, Float):
+        return pa.float64()
+    if isinstance(sa_type, Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if sa_type.timezone else None)
+    if isinstance(sa_type, Date):
+        return pa.date32()
+    if isinstance(sa_type, (String, JSON)):
+        return pa.string()
+    raise TypeError(f"No Arrow mapping for {column.table.name}.{column.name} ({sa_type!r})")
+
+
+class _Labels:
+    """Dictionary-encodes one label column batch by batch against a dictionary that only grows.
+
+    Every batch's dictionary extends the previous one, which the Arrow IPC file format
+    accepts as a delta; independently encoded batches would be rejected as replacements.
+    """
+
+    def __init__(self) -> None:
+        self._codes: Dict[str, int] = {}
+        self._labels: List[str] = []
+
+    def encode(self, values: Sequence) -> pa.DictionaryArray:
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(None)
+                continue
+            label = value.value if isinstance(value, enum.Enum) else value
+            code = self._codes.get(label)
+            if code is None:
+                code = self._codes[label] = len(self._labels)
+                self._labels.append(label)
+            codes.append(code)
+        return pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(self._labels, pa.string()))
+
+
+def _arrow_array(values: Sequence, type_: pa.DataType) -> pa.Array:
+    if pa.types.is_string(type_):
+        values = [v if v is None or isinstance(v, str) else to_json(v).decode() for v in values]
+    return pa.array(values, type_)
+
+
+# Aggregates have a row per daypart; the export gives each daypart its own columns.
+_PIVOTED = "aggregates"
+_PIVOT_FIELDS = ("score_0_100", "unique_users", "presence_count_avg", "green_presence_ratio_avg")
+
+
+def _period_rows(model, period: Optional[date]):
+    """The outer district's rows of ``model`` in ``period``, or in its latest period."""
+    wanted = latest_period(model) if period is None else period
+    return model.city == District.city, model.district_id == District.id, model.period == wanted
+
+
+def _district_columns(
+    indicators: Sequence[Indicator], period: Optional[date] = None
+) -> Tuple[list, List[pa.Field], list]:
+    """Select list, Arrow fields and LATERAL subqueries for one row per district.
+
+    Each indicator adds ``<indicator>__<field>`` columns from its newest row in ``period``,
+    by default the latest period. Aggregates add ``aggregates__period`` and ``aggregates__<daypart>__<field>``
+    per Daypart; rows with any other daypart label are left out.
+    """
+    selected, fields, laterals = [], [], []
+    for column in District.__table__.columns:
+        if column.name != "city":
+            selected.append(column)
+            fields.append(pa.field(column.name, arrow_type(column), nullable=column.nullable))
+    for indicator in indicators:
+        model = indicator.model
+        if indicator.name == _PIVOTED:
+            columns = {"period": func.max(model.period)}
+            for daypart in Daypart:
+                for name in _PIVOT_FIELDS:
+                    values = func.array_agg(aggregate_order_by(model.__table__.c[name], model.id.desc()))
+                    picked = values.filter(func.lower(model.daypart) == daypart.value.lower())
+                    columns[f"{daypart.value.lower()}__{name}"] = type_coerce(picked, ARRAY(model.__table__.c[name].type))[1]
+            lateral = select(*(c.label(name) for name, c in columns.items())).where(*_period_rows(model, period))
+            sources = {name: model.__table__.c[name.rpartition("__")[2]] for name in columns}
+        else:
+            sources = {c.name: c for c in indicator.columns() if c.name != "district_id"}
+            lateral = (
+                select(*sources.values())
+                .where(*_period_rows(model, period))
+                .order_by(model.id.desc())
+                .limit(1)
+            )
+        lateral = lateral.lateral(f"latest_{indicator.name}")
+        laterals.append(lateral)
+        for name, column in sources.items():
+            label = f"{indicator.name}__{name}"
+            selected.append(lateral.c[name].label(label))
+            # Null for districts without rows in the table.
+            fields.append(pa.field(label, arrow_type(column), nullable=True))
+    return selected, fields, laterals
+
+
+async def district_batches(
+    session_factory: Callable[[], AsyncSession],
+    indicators: Sequence[Indicator],
+    city: str,
+    period: Optional[date] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[pa.RecordBatch]:
+    """``city``'s districts, one row each with ``period`` (default: latest) of every indicator, in id order.
+
+    Fetched from a server-side cursor and converted a batch at a time; the session is
+    owned by the generator, as in stream_indicator.
+    """
+    selected, fields, laterals = _district_columns(indicators, period)
+    schema = pa.schema(fields)
+    stmt = select(*selected).select_from(District)
+    for lateral in laterals:
+        stmt = stmt.outerjoin(lateral, true())
+    stmt = stmt.where(District.city == city).order_by(District.id).execution_options(yield_per=batch_size)
+    labels = {f.name: _Labels() for f in fields if pa.types.is_dictionary(f.type)}
+    async with session_factory() as db:
+        result = await db.stream(stmt)
+        try:
+            async for partition in result.partitions(batch_size):
+                columns = zip(*partition)
+                arrays = [
+                    labels[f.name].encode(values) if f.name in labels else _arrow_array(values, f.type)
+                    for values, f in zip(columns, fields)
+                ]
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+        finally:
+            await result.close()
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain()."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._written += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Writers record offsets (IPC footer, Parquet row groups) from the running total.
+        return self._written
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def stream_district_table(
+    session_factory: Callable[[], AsyncSession],
+    indicators: Sequence[Indicator],
+    city: str,
+    fmt: ColumnarFormat,
+    period: Optional[date] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """district_batches encoded as an Arrow IPC file or Parquet, yielded as it is written.
+
+    Memory stays at one batch plus the encoder's state; Parquet gets a row group per batch.
+    """
+    schema = pa.schema(_district_columns(indicators)[1])
+    chunks = _Chunks()
+    sink = pa.PythonFile(chunks, mode="w")
+    if fmt is ColumnarFormat.parquet:
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+    try:
+        async for batch in district_batches(session_factory, indicators, city, period, batch_size):
+            await asyncio.to_thread(writer.write_batch, batch)
+            data = chunks.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield chunks.drain()
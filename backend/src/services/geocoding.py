@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from src.config import get_settings
+from src.helpers import normalize_pl
+from src.metrics import GEOCODER_LATENCY
+from src.schemas.city import CityRead
+
+
+class GeocodingError(Exception):
+    """The upstream geocoder failed or returned garbage."""
+
+
+class AddressNotFoundError(GeocodingError):
+    """The geocoder returned no match for the address."""
+
+
+class DistrictNotDeterminedError(GeocodingError):
+    """The address was found but carries no district-level component."""
+
+
+def extract_district_name(result: dict) -> Optional[str]:
+    addr = result["address"]
+    return (
+        addr.get("city_district")
+        or addr.get("suburb")
+        or addr.get("borough")
+        or addr.get("quarter")
+        or addr.get("neighbourhood")
+    )
+
+
+class _DiskStore:
+    """SQLite backing store for the geocode cache; all calls are blocking and run in worker threads.
+
+    Concurrent cache writes each get a thread of their own, so one lock serializes every use
+    of the shared connection. The connection is opened on first use, so the store can be
+    closed at shutdown and used again after a restart.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                "key TEXT PRIMARY KEY, district TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def load(self, now: float, limit: int) -> list[Tuple[str, str, float]]:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM geocode_cache WHERE expires_at <= ?", (now,))
+            conn.commit()
+            return conn.execute(
+                "SELECT key, district, expires_at FROM geocode_cache ORDER BY expires_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()[::-1]
+
+    def put(self, key: str, district: str, expires_at: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (key, district, expires_at) VALUES (?, ?, ?)",
+                (key, district, expires_at),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class GeocodeCache:
+    """LRU + TTL cache of normalized address -> district name, optionally persisted to SQLite."""
+
+    def __init__(self, max_entries: int, ttl: float, path: Optional[str] = None) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._disk = _DiskStore(path) if path else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self) -> None:
+        if self._disk is None:
+            return
+        rows = await asyncio.to_thread(self._disk.load, time.time(), self._max_entries)
+        for key, district, expires_at in rows:
+            self._entries[key] = (district, expires_at)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        district, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return district
+
+    async def set(self, key: str, district: str) -> None:
+        expires_at = time.time() + self._ttl
+        self._entries[key] = (district, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, key, district, expires_at)
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+class Geocoder:
+    """Resolves a street address in a city to the district name reported by Nominatim.
+
+    One pooled HTTP client is shared for the app lifetime, results are cached on the city
+    and normalized address, and concurrent lookups of the same address share one upstream call.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float,
+        user_agent: str,
+        cache: GeocodeCache,
+    ) -> None:
+        self._url = url
+        self._timeout = timeout
+        self._user_agent = user_agent
+        self.cache = cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                headers={"User-Agent": self._user_agent},
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        await self.cache.load()
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.cache.close()
+
+    async def _fetch(self, address: str, city: CityRead) -> str:
+        if self._client is None:
+            await self.start()
+        params = {
+            "format": "jsonv2",
+            "addressdetails": 1,
+            "limit": 1,
+            "q": f"{address}, {city.geocoder_query}",
+            "countrycodes": city.country_code,
+        }
+        start = time.perf_counter()
+        try:
+            resp = await self._client.get(self._url, params=params)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError) as e:
+            GEOCODER_LATENCY.labels("error").observe(time.perf_counter() - start)
+            raise GeocodingError(str(e)) from e
+        GEOCODER_LATENCY.labels("ok").observe(time.perf_counter() - start)
+
+        if not data or "address" not in data[0]:
+            raise AddressNotFoundError(address)
+        district_name = extract_district_name(data[0])
+        if not district_name:
+            raise DistrictNotDeterminedError(address)
+        return district_name
+
+    async def _resolve_and_cache(self, key: str, address: str, city: CityRead) -> str:
+        district_name = await self._fetch(address, city)
+        await self.cache.set(key, district_name)
+        return district_name
+
+    async def district_name(self, address: str, city: CityRead) -> str:
+        key = f"{city.code}:{normalize_pl(address)}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._resolve_and_cache(key, address, city))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the lookup for everyone else.
+        return await asyncio.shield(future)
+
+
+_settings = get_settings()
+
+geocoder = Geocoder(
+    url=_settings.GEOCODER_URL,
+    timeout=_settings.GEOCODER_TIMEOUT,
+    user_agent=_settings.GEOCODER_USER_AGENT,
+    cache=GeocodeCache(
+        max_entries=_settings.GEOCODE_CACHE_MAX_ENTRIES,
+        ttl=_settings.GEOCODE_CACHE_TTL_SECONDS,
+        path=_settings.GEOCODE_CACHE_PATH,
+    ),
+)
+
+
+def get_geocoder() -> Geocoder:
+    return geocoder
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.registry import Indicator
+
+# Identify the row rather than describe the district at a point in time.
+_KEY_FIELDS = ("id", "district_id", "period")
+
+
+async def district_history(
+    db: AsyncSession,
+    city: str,
+    indicator: Indicator,
+    district_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Periods and per-field value arrays of one district's ``indicator`` rows in [start, end].
+
+    Periods are months: any day of ``start`` or ``end`` selects its month. A range scan of the (district_id, period, id) index within the city's partition.
+    """
+    model = indicator.model
+    fields = [f for f in indicator.fields if f not in _KEY_FIELDS]
+    stmt = select(model.period, *indicator.columns(tuple(fields))).where(
+        model.city == city, model.district_id == district_id
+    )
+    if start is not None:
+        stmt = stmt.where(model.period >= start.replace(day=1))
+    if end is not None:
+        stmt = stmt.where(model.period <= end.replace(day=1))
+    rows = (await db.execute(stmt.order_by(model.period, model.id))).all()
+    columns: List[tuple] = list(zip(*rows)) if rows else [()] * (len(fields) + 1)
+    return {
+        "district_id": district_id,
+        "indicator": indicator.name,
+        "periods": list(columns[0]),
+        "series": {field: list(values) for field, values in zip(fields, columns[1:])},
+    }
@@ -0,0 +1,432 @@
+"""Bulk loading of indicator data for one city and reporting period.
+
+Input is either fixtures/districts.json or a directory of the CSVs the notebooks export.
+Districts are upserted on their code. Incoming indicator rows are COPY'd into a staging
+table and diffed against the period's current rows, so only rows that changed are
+inserted, updated or deleted. All of it happens in the caller's transaction: a load either
+lands completely or not at all, and re-running it writes nothing.
+
+The writes are set-based, and so is everything around them. The city and the district ids
+are checked (and locked against deletion) once, after which per-row triggers (foreign key
+checks, the indicator_latest pointers) are switched off for the load when the role may
+do so; the pointers are then moved by one statement per table. The loaded districts'
+district_summary rows are rebuilt in the same transaction, so readers never see new
+indicator rows next to an old summary. Statistics are not: analyze() is for after the commit.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import re
+import time
+import unicodedata
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, Float, Integer, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.helpers import normalize_pl
+from src.models import (
+    DistrictAggregate,
+    SocialLife,
+    DistrictRhythm,
+    GreenPlaces,
+    DigitalNoise,
+    SocialAvailability,
+    LifeBalance,
+    Safety,
+)
+from src.services.registry import INDICATORS
+
+MODELS = [indicator.model for indicator in INDICATORS.values()]
+
+# Notebook export (file stem, minus the city prefix) -> table, and the renames from its
+# columns to the table's. Columns the table does not have are ignored.
+NOTEBOOK_EXPORTS: Dict[str, type] = {
+    "social_life_scores": SocialLife,
+    "district_rhythm": DistrictRhythm,
+    "green_places": GreenPlaces,
+    "digital_noise": DigitalNoise,
+    "social_availability": SocialAvailability,
+    "life_balance": LifeBalance,
+    "safety_index": Safety,
+    "district_mobility_scores": DistrictAggregate,
+}
+CSV_RENAMES: Dict[type, Dict[str, str]] = {
+    SocialLife: {"social_life_score": "normalized_score", "median_copres_per_cell": "raw_score", "n_active_cells": "rows"},
+    DistrictAggregate: {"time_bucket": "daypart"},
+}
+# Not loadable: generated, or set from the load itself.
+_MANAGED = {"id", "city", "district_id", "period"}
+# Besides district_id, what identifies a row within a district's period.
+ROW_KEYS: Dict[type, Tuple[str, ...]] = {DistrictAggregate: ("daypart",)}
+
+
+class LoadError(ValueError):
+    pass
+
+
+@dataclass
+class DistrictData:
+    """One district's indicator rows, keyed by model; values are raw, as read."""
+
+    code: str
+    name: str
+    rows: Dict[type, List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+@dataclass
+class TableChanges:
+    read: int
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+@dataclass
+class LoadStats:
+    districts: int
+    added: int
+    renamed: int
+    tables: Dict[str, TableChanges]
+    seconds: float
+    district_ids: List[int] = field(default_factory=list)
+    # False when the role may not set session_replication_role, so every row was checked by triggers.
+    set_based: bool = True
+
+    @property
+    def read(self) -> int:
+        return self.districts + sum(t.read for t in self.tables.values())
+
+    @property
+    def written(self) -> int:
+        return self.added + self.renamed + sum(t.written for t in self.tables.values())
+
+
+def district_code(name: str) -> str:
+    """'Praga-Południe' -> 'praga_poludnie', the form fixtures and the API use."""
+    return re.sub(r"[^a-z0-9]+", "_", normalize_pl(unicodedata.normalize("NFC", name))).strip("_")
+
+
+def fixture_rows(fixture: dict) -> Dict[type, List[Dict[str, Any]]]:
+    """The indicator rows of one fixtures/districts.json entry."""
+    rows: Dict[type, List[Dict[str, Any]]] = {}
+    if "social_life" in fixture:
+        social = fixture["social_life"]
+        rows[SocialLife] = [
+            {"normalized_score": social["normalized"], "raw_score": social["score"], "rows": social["rows"]}
+        ]
+    if "district_rhythm" in fixture:
+        rhythm = fixture["district_rhythm"]
+        rows[DistrictRhythm] = [{
+            "rhythm_score": rhythm["normalized"],
+            "peak_hour": rhythm["peak_hour"],
+            "activity_amplitude": rhythm["activity_amplitude"],
+            "avg_activity": rhythm["avg_activity"],
+        }]
+    for key, model in (
+        ("green_places", GreenPlaces),
+        ("digital_noise", DigitalNoise),
+        ("social_availability", SocialAvailability),
+        ("life_balance", LifeBalance),
+        ("safety", Safety),
+    ):
+        if key in fixture:
+            rows[model] = [dict(fixture[key])]
+    if fixture.get("dayparts"):
+        rows[DistrictAggregate] = [dict(part) for part in fixture["dayparts"]]
+    return rows
+
+
+def read_fixtures(path: Path) -> List[DistrictData]:
+    fixtures = json.loads(path.read_text(encoding="utf-8"))
+    return _unique([
+        DistrictData(code=f["code"], name=f["name"], rows=fixture_rows(f))
+        for f in fixtures
+    ])
+
+
+def read_csv_dir(directory: Path) -> List[DistrictData]:
+    """Merge the notebook exports found in ``directory`` by district name."""
+    districts: Dict[str, DistrictData] = {}
+    found = False
+    for path in sorted(directory.iterdir()):
+        model = next(
+            (m for suffix, m in NOTEBOOK_EXPORTS.items() if path.stem == suffix or path.stem.endswith(f"_{suffix}")),
+            None,
+        )
+        if model is None or not path.is_file():
+            continue
+        found = True
+        renames = CSV_RENAMES.get(model, {})
+        with path.open(newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                name = (record.get("district") or "").strip()
+                if not name:
+                    raise LoadError(f"{path.name}: row without a district name")
+                code = record.get("code") or district_code(name)
+                row = {renames.get(k, k): v for k, v in record.items()}
+                district = districts.setdefault(code, DistrictData(code=code, name=name))
+                district.rows.setdefault(model, []).append(row)
+    if not found:
+        raise LoadError(f"No notebook exports in {directory}; expected e.g. warsaw_{next(iter(NOTEBOOK_EXPORTS))}.csv")
+    return list(districts.values())
+
+
+def read_source(path: Path) -> List[DistrictData]:
+    if path.is_dir():
+        return read_csv_dir(path)
+    if path.suffix == ".json":
+        return read_fixtures(path)
+    raise LoadError(f"{path}: expected a districts JSON file or a directory of notebook CSVs")
+
+
+def _unique(districts: List[DistrictData]) -> List[DistrictData]:
+    seen = set()
+    for district in districts:
+        if district.code in seen:
+            raise LoadError(f"District code '{district.code}' appears more than once")
+        seen.add(district.code)
+    return districts
+
+
+def _converter(column) -> Callable[[Any], Any]:
+    """Raw JSON/CSV value -> what COPY expects for ``column``; blanks become NULL."""
+    if column.name == "daypart":
+        convert = lambda v: str(v).upper()
+    elif isinstance(column.type, Integer):
+        # Notebook exports write counts as floats ("12.0").
+        convert = lambda v: v if type(v) is int else int(round(float(v)))
+    elif isinstance(column.type, Float):
+        convert = float
+    elif isinstance(column.type, Date):
+        convert = lambda v: v if isinstance(v, date) else date.fromisoformat(v)
+    else:
+        convert = str
+    return lambda v: None if v is None or v == "" else convert(v)
+
+
+def copy_columns(model: type) -> List[str]:
+    return ["city", "district_id", "period"] + [c.name for c in model.__table__.columns if c.name not in _MANAGED]
+
+
+def records(
+    model: type, districts: List[DistrictData], ids: Dict[str, int], city: str, period: date
+) -> List[tuple]:
+    """The districts' ``model`` rows as COPY records in ``copy_columns(model)`` order."""
+    converters = [(c.name, _converter(c)) for c in model.__table__.columns if c.name not in _MANAGED]
+    return [
+        (city, ids[d.code], period, *[convert(row.get(name)) for name, convert in converters])
+        for d in districts
+        for row in d.rows.get(model, ())
+    ]
+
+
+async def _upsert_districts(conn: AsyncConnection, city: str, districts: List[DistrictData]) -> Tuple[Dict[str, int], int, int]:
+    """Insert new codes and rename changed ones; returns code -> id and the added/renamed counts."""
+    incoming = "unnest(CAST(:codes AS text[]), CAST(:names AS text[])) AS u(code, name)"
+    params = {"city": city, "codes": [d.code for d in districts], "names": [d.name for d in districts]}
+    # Not ON CONFLICT: loads of a city are serialized (see load), and the anti-join is
+    # much cheaper than a speculative insert per row.
+    added = await conn.execute(
+        text(
+            f"INSERT INTO districts (city, code, name) SELECT CAST(:city AS text), u.code, u.name FROM {incoming} "
+            "WHERE NOT EXISTS (SELECT 1 FROM districts d WHERE d.city = CAST(:city AS text) AND d.code = u.code)"
+        ),
+        params,
+    )
+    renamed = await conn.execute(
+        text(f"UPDATE districts d SET name = u.name FROM {incoming} WHERE d.city = :city AND d.code = u.code AND d.name <> u.name"),
+        params,
+    )
+    # Held until commit: with foreign key triggers off, this is what keeps the rows written
+    # below from being orphaned by a concurrent delete.
+    ids = await conn.execute(
+        text("SELECT code, id FROM districts WHERE city = :city AND code = ANY(:codes) FOR KEY SHARE"),
+        {"city": city, "codes": params["codes"]},
+    )
+    return dict(ids.tuples().all()), added.rowcount, renamed.rowcount
+
+
+async def _apply(conn: AsyncConnection, model: type, batch: List[tuple], city: str, period: date) -> TableChanges:
+    """Stage ``batch`` and write only its differences from ``model``'s rows for the same districts and period.
+
+    Districts absent from the batch keep their rows.
+    """
+    table = model.__tablename__
+    columns = copy_columns(model)
+    keys = ROW_KEYS.get(model, ())
+    values = [c for c in columns if c not in _MANAGED and c not in keys]
+    match = "t.district_id = i.district_id" + "".join(f" AND t.{k} IS NOT DISTINCT FROM i.{k}" for k in keys)
+    scope = "t.city = :city AND t.period = :period"
+    params = {"city": city, "period": period}
+    changes = TableChanges(read=len(batch))
+
+    await conn.execute(
+        text(f"CREATE TEMP TABLE _incoming ON COMMIT DROP AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA")
+    )
+    driver = (await conn.get_raw_connection()).driver_connection
+    await driver.copy_records_to_table("_incoming", records=batch, columns=columns)
+    duplicate = (
+        await conn.execute(
+            text(
+                f"SELECT district_id{''.join(', ' + k for k in keys)} FROM _incoming "
+                f"GROUP BY district_id{''.join(', ' + k for k in keys)} HAVING count(*) > 1 LIMIT 1"
+            )
+        )
+    ).first()
+    if duplicate is not None:
+        raise LoadError(f"{table}: more than one row for {dict(duplicate._mapping)}")
+
+    changes.deleted = (
+        await conn.execute(
+            text(
+                f"DELETE FROM {table} t WHERE {scope} "
+                "AND t.district_id IN (SELECT district_id FROM _incoming) "
+                f"AND NOT EXISTS (SELECT 1 FROM _incoming i WHERE {match})"
+            ),
+            params,
+        )
+    ).rowcount
+    changes.updated = (
+        await conn.execute(
+            text(
+                f"UPDATE {table} t SET {', '.join(f'{c} = i.{c}' for c in values)} FROM _incoming i "
+                f"WHERE {scope} AND {match} "
+                f"AND ROW({', '.join('t.' + c for c in values)}) IS DISTINCT FROM ROW({', '.join('i.' + c for c in values)})"
+            ),
+            params,
+        )
+    ).rowcount
+    changes.inserted = (
+        await conn.execute(
+            text(
+                f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join('i.' + c for c in columns)} FROM _incoming i "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {scope} AND {match})"
+            ),
+            params,
+        )
+    ).rowcount
+    if changes.written:
+        # Every staged district now has rows in the period, and inserts can only move a
+        # pointer forward: the indicator_latest_insert trigger's rule, set-based. A plain
+        # insert rather than ON CONFLICT, which is several times slower per row; loads of
+        # a city do not run concurrently (see load).
+        pointers = {**params, "table": table}
+        latest = "l.city = :city AND l.indicator = :table AND l.district_id = i.district_id"
+        await conn.execute(
+            text(
+                "UPDATE indicator_latest l SET period = :period "
+                f"FROM (SELECT DISTINCT district_id FROM _incoming) i WHERE {latest} AND l.period < :period"
+            ),
+            pointers,
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO indicator_latest (city, indicator, district_id, period) "
+                "SELECT DISTINCT :city, :table, i.district_id, CAST(:period AS date) FROM _incoming i "
+                f"WHERE NOT EXISTS (SELECT 1 FROM indicator_latest l WHERE {latest})"
+            ),
+            pointers,
+        )
+    await conn.execute(text("DROP TABLE _incoming"))
+    return changes
+
+
+@asynccontextmanager
+async def _bulk_writes(conn: AsyncConnection) -> AsyncIterator[bool]:
+    """Session settings for the load's writes; yields whether per-row triggers could be skipped.
+
+    Per-row triggers, foreign key checks included, are off when the role may set
+    session_replication_role (a superuser, or from Postgres 15 a grant of SET on it);
+    otherwise they stay on and the load is merely slower. Nested loops are off because the
+    diff statements are all bulk joins: a city partition whose statistics say it is empty,
+    e.g. one holding only dead rows of a rolled-back load, would otherwise be scanned once
+    per staged row.
+    """
+    await conn.execute(text("SET LOCAL enable_nestloop = off"))
+    try:
+        async with conn.begin_nested():
+            await conn.execute(text("SET LOCAL session_replication_role = replica"))
+        set_based = True
+    except DBAPIError:
+        set_based = False
+    yield set_based
+    # On an error the rollback resets both.
+    if set_based:
+        await conn.execute(text("SET LOCAL session_replication_role = origin"))
+    await conn.execute(text("SET LOCAL enable_nestloop = DEFAULT"))
+
+
+async def load(conn: AsyncConnection, city: str, districts: List[DistrictData], period: date) -> LoadStats:
+    """Upsert ``districts`` into ``city`` and bring their ``period`` rows in line with the source."""
+    start = time.perf_counter()
+    if not (await conn.execute(text("SELECT 1 FROM cities WHERE code = :c FOR KEY SHARE"), {"c": city})).scalar():
+        raise LoadError(f"Unknown city '{city}'; register it first with SELECT add_city(...)")
+    # Two loads of a city would both see a row as missing and insert it twice.
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"load-indicators:{city}"})
+
+    tables: Dict[str, TableChanges] = {}
+    async with _bulk_writes(conn) as set_based:
+        ids, added, renamed = await _upsert_districts(conn, city, districts)
+        for model in MODELS:
+            if not any(model in d.rows for d in districts):
+                # Not in this source (e.g. a partial set of exports): leave the table alone.
+                continue
+            batch = records(model, districts, ids, city, period)
+            tables[model.__tablename__] = await _apply(conn, model, batch, city, period)
+
+    stats = LoadStats(
+        districts=len(ids),
+        added=added,
+        renamed=renamed,
+        tables=tables,
+        seconds=0.0,
+        district_ids=list(ids.values()),
+        set_based=set_based,
+    )
+    if stats.written:
+        await refresh_summary(conn, city, stats.district_ids)
+        # Notifies the API processes once the load commits (see notify_dataset_version).
+        await conn.execute(
+            text("UPDATE dataset_version SET version = version + 1, updated_at = now() WHERE city = :c"), {"c": city}
+        )
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+async def analyze(conn: AsyncConnection, city: str, tables: List[str]) -> None:
+    """Update planner statistics of ``city``'s partitions of ``tables``, e.g. after a load wrote to them."""
+    for table in tables:
+        await conn.execute(text(f"ANALYZE {table}__{city}"))
+
+
+async def refresh_summary(conn: AsyncConnection, city: str, district_ids: Optional[List[int]] = None) -> None:
+    """Rebuild ``city``'s district_summary rows for ``district_ids``, or all of them.
+
+    Computed from what ``conn`` sees, so a load's own uncommitted rows included.
+    """
+    await conn.execute(
+        text("SELECT refresh_district_summary(:city, CAST(:ids AS bigint[]))"), {"city": city, "ids": district_ids}
+    )
+
+
+def month(value: Optional[str]) -> date:
+    """``YYYY-MM`` (or a full date) as the first day of that month; the current month by default."""
+    if not value:
+        today = date.today()
+        return date(today.year, today.month, 1)
+    try:
+        parsed = date.fromisoformat(value if value.count("-") == 2 else f"{value}-01")
+    except ValueError:
+        raise LoadError(f"Invalid period '{value}', expected YYYY-MM")
+    return parsed.replace(day=1)
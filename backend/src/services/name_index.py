@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.helpers import name_key, normalize_pl
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    district_id: int
+    score: float
+    match: str  # "exact" | "prefix" | "fuzzy"
+
+
+def _aliases(name: str, code: str) -> Set[str]:
+    """Keys a district answers to: its name, its code, and every word of the name."""
+    keys = {name_key(name), name_key(code)}
+    for word in normalize_pl(name).replace("_", " ").split():
+        keys.add(name_key(word))
+    keys.discard("")
+    return keys
+
+
+# Queries shorter than this would fuzzy-match everything; prefix matching covers them.
+_FUZZY_MIN_LENGTH = 3
+# Queries up to this long allow one edit, longer ones one per four characters.
+_SINGLE_EDIT_MAX_LENGTH = 7
+
+
+def _max_distance(key: str) -> int:
+    return max(1, len(key) // 4)
+
+
+def _bigrams(key: str) -> Set[str]:
+    """Distinct bigrams of ``key`` with a start marker; one edit removes at most three of them."""
+    padded = "^" + key
+    return {padded[i:i + 2] for i in range(len(key))}
+
+
+def _one_edit(key: str, alphabet: Iterable[str]) -> Set[str]:
+    """``key`` and every string one deletion, insertion, substitution or transposition away."""
+    splits = [(key[:i], key[i:]) for i in range(len(key) + 1)]
+    variants = {key}
+    variants.update(a + b[1:] for a, b in splits if b)
+    variants.update(a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1)
+    for ch in alphabet:
+        variants.update(a + ch + b[1:] for a, b in splits if b)
+        variants.update(a + ch + b for a, b in splits)
+    return variants
+
+
+def _bounded_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, cut off above ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        # Every district reachable below this node, so a prefix lookup never walks the subtree.
+        self.ids: Set[int] = set()
+
+
+class DistrictNameIndex:
+    """In-memory lookup of districts by name, code, folded name and prefix.
+
+    Keys are ``name_key()`` values, so 'Praga-Południe', 'praga poludnie' and
+    'praga_poludnie' all resolve to the same district.
+    """
+
+    def __init__(self, districts: Iterable[Tuple[int, str, str]]) -> None:
+        districts = list(districts)
+        self._exact: Dict[str, int] = {}
+        self._full_keys: Dict[int, str] = {}
+        self._aliases: Dict[str, Set[int]] = {}
+        # Candidate filters for fuzzy search: single-edit queries look up their variants in
+        # the aliases and in their prefixes; longer ones need enough bigrams in common.
+        self._alias_prefixes: Dict[str, Set[str]] = {}
+        self._bigram_aliases: Dict[str, Set[str]] = {}
+        self._alphabet: Set[str] = set()
+        self._root = _TrieNode()
+        for district_id, name, code in districts:
+            full = name_key(name)
+            self._full_keys[district_id] = full
+            # Names win over codes and earlier rows win over later ones, like the old SQL cascade.
+            self._exact.setdefault(full, district_id)
+        for district_id, name, code in districts:
+            self._exact.setdefault(name_key(code), district_id)
+            for alias in _aliases(name, code):
+                self._aliases.setdefault(alias, set()).add(district_id)
+                self._insert(alias, district_id)
+        for alias in self._aliases:
+            self._alphabet.update(alias)
+            for length in range(_FUZZY_MIN_LENGTH, min(len(alias) - 1, _SINGLE_EDIT_MAX_LENGTH) + 1):
+                self._alias_prefixes.setdefault(alias[:length], set()).add(alias)
+            for gram in _bigrams(alias):
+                self._bigram_aliases.setdefault(gram, set()).add(alias)
+
+    def _insert(self, key: str, district_id: int) -> None:
+        node = self._root
+        node.ids.add(district_id)
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.ids.add(district_id)
+
+    def _prefixed(self, key: str) -> Set[int]:
+        node = self._root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.ids
+
+    def _fuzzy_candidates(self, key: str, limit_distance: int) -> Iterable[str]:
+        """Aliases that may be within ``limit_distance`` of ``key``, or of its first ``len(key)`` characters.
+
+        A superset: the caller still computes the distances, but only for these.
+        """
+        if limit_distance == 1:
+            candidates: Set[str] = set()
+            for variant in _one_edit(key, self._alphabet):
+                if variant in self._aliases:
+                    candidates.add(variant)
+                candidates |= self._alias_prefixes.get(variant, set())
+            return candidates
+        grams = _bigrams(key)
+        # An alias, or a prefix of it, within limit_distance edits still has these in common.
+        needed = len(grams) - 3 * limit_distance
+        if needed <= 0:
+            return self._aliases
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for alias in self._bigram_aliases.get(gram, ()):
+                shared[alias] = shared.get(alias, 0) + 1
+        return [alias for alias, count in shared.items() if count >= needed]
+
+    def exact(self, key: str) -> Optional[int]:
+        return self._exact.get(key)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Best single district for a free-form name (e.g. a geocoder's city_district)."""
+        key = name_key(name)
+        if not key:
+            return None
+        district_id = self._exact.get(key)
+        if district_id is not None:
+            return district_id
+        candidates = self._prefixed(key)
+        if not candidates:
+            return None
+        # Prefer the district whose full name is closest in length to the query.
+        return min(candidates, key=lambda i: (len(self._full_keys[i]), i))
+
+    def search(self, query: str, limit: int = 10) -> List[NameMatch]:
+        """Autocomplete: exact, then prefix, then typo-tolerant matches, best first."""
+        key = name_key(query)
+        if not key:
+            return []
+        best: Dict[int, NameMatch] = {}
+
+        def offer(match: NameMatch) -> None:
+            current = best.get(match.district_id)
+            if current is None or match.score > current.score:
+                best[match.district_id] = match
+
+        for district_id in self._aliases.get(key, ()):
+            offer(NameMatch(district_id, 1.0, "exact"))
+        for district_id in self._prefixed(key):
+            full = self._full_keys[district_id]
+            offer(NameMatch(district_id, 0.5 + 0.4 * len(key) / max(len(full), len(key)), "prefix"))
+
+        if len(key) >= _FUZZY_MIN_LENGTH:
+            limit_distance = _max_distance(key)
+            for alias in self._fuzzy_candidates(key, limit_distance):
+                # Also compare against the alias prefix, so a typo mid-word still matches while typing.
+                distance = min(
+                    _bounded_distance(key, alias, limit_distance),
+                    _bounded_distance(key, alias[: len(key)], limit_distance),
+                )
+                if distance > limit_distance:
+                    continue
+                score = 0.5 * (1 - distance / (limit_distance + 1))
+                for district_id in self._aliases[alias]:
+                    offer(NameMatch(district_id, score, "fuzzy"))
+
+        ranked = sorted(best.values(), key=lambda m: (-m.score, self._full_keys[m.district_id], m.district_id))
+        return ranked[:limit]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Set
+
+import asyncpg
+
+from src.db import connect_primary
+from src.services.cities import CityRegistry, cities
+from src.services.pagination import RowCountCache, row_counts
+from src.services.snapshot import SnapshotStores, snapshot_stores
+
+logger = logging.getLogger(__name__)
+
+# Raised by the dataset_version_notify trigger with the city code as payload.
+CHANNEL = "dataset_version"
+
+
+class DatasetListener:
+    """LISTENs for dataset_version changes and refreshes this process's in-memory state.
+
+    One dedicated connection per process. Each notification rebuilds that city's snapshot
+    and drops cached row counts; an unknown city reloads the city list. After a
+    (re)connect everything is re-checked, since notifications sent while disconnected are
+    lost. While connected, snapshot polling is paused; if the connection drops, polling
+    resumes until it is back. An idle connection is probed every ``probe_interval``.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[asyncpg.Connection]],
+        stores: SnapshotStores,
+        registry: CityRegistry,
+        counts: RowCountCache,
+        retry_after: float = 5.0,
+        probe_interval: float = 30.0,
+    ) -> None:
+        self._connect = connect
+        self._stores = stores
+        self._registry = registry
+        self._counts = counts
+        self._retry_after = retry_after
+        self._probe_interval = probe_interval
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def _notified(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        task = asyncio.get_running_loop().create_task(self._apply(payload or None))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _apply(self, city: Optional[str]) -> None:
+        try:
+            if city is not None and city not in self._registry.codes:
+                await self._registry.load()
+            self._counts.invalidate()
+            await self._stores.refresh(city)
+        except Exception:
+            logger.exception("Refreshing after a dataset change for %s failed", city or "all cities")
+
+    async def _listen(self) -> None:
+        connection = await self._connect()
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(CHANNEL, self._notified)
+            self._stores.listening = True
+            logger.info("Listening for dataset changes on %s", CHANNEL)
+            await self._apply(None)
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), self._probe_interval)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(connection.execute("SELECT 1"), self._probe_interval)
+        finally:
+            self._stores.listening = False
+            if not connection.is_closed():
+                await connection.close(timeout=5)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+                logger.warning("Dataset change listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Dataset change listener unavailable (%s), retrying in %.0fs", e, self._retry_after)
+            await asyncio.sleep(self._retry_after)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._pending):
+            task.cancel()
+
+
+dataset_listener = DatasetListener(connect_primary, snapshot_stores, cities, row_counts)
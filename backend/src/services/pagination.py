@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Tables estimated above this many rows are not counted exactly.
+_EXACT_COUNT_LIMIT = 100_000
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(stmt: Select, id_column, page: int, size: int, after: Optional[str]) -> Select:
+    """Order by id DESC and cut one page: keyset when a cursor is given, OFFSET otherwise."""
+    stmt = stmt.order_by(id_column.desc()).limit(size)
+    if after is not None:
+        return stmt.where(id_column < decode_cursor(after))
+    return stmt.offset((page - 1) * size)
+
+
+def next_cursor(ids: Sequence[int], size: int) -> Optional[str]:
+    """Cursor for the page after ``ids``, or None when this was the last page."""
+    if len(ids) < size or not ids:
+        return None
+    return encode_cursor(ids[-1])
+
+
+def set_next_cursor(response: Response, ids: Sequence[int], size: int) -> Optional[str]:
+    cursor = next_cursor(ids, size)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
+
+
+class RowCountCache:
+    """Per-city table row counts, reused for a short TTL and estimated from pg_class for big tables.
+
+    Each city has its own partition (``<table>__<city>``), whose reltuples is the estimate.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._counts: Dict[Tuple[str, str], Tuple[int, float]] = {}
+
+    def invalidate(self) -> None:
+        self._counts.clear()
+
+    async def count(self, db: AsyncSession, model, city: str) -> int:
+        key = (model.__tablename__, city)
+        cached = self._counts.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        estimate = (
+            await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": f"{model.__tablename__}__{city}"},
+            )
+        ).scalar()
+        if estimate is not None and estimate > _EXACT_COUNT_LIMIT:
+            total = int(estimate)
+        else:
+            stmt = select(func.count()).select_from(model).where(model.city == city)
+            total = (await db.execute(stmt)).scalar_one()
+
+        self._counts[key] = (total, time.monotonic() + self._ttl)
+        return total
+
+
+row_counts = RowCountCache(get_settings().ROW_COUNT_CACHE_SECONDS)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+import warnings
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from src.models.enums import Daypart
+from src.schemas.district import DistrictDetailRead
+from src.services.registry import SCORES
+
+# City traffic scores per daypart, taken from district_aggregates.score_0_100.
+DAYPART_COLUMNS = {f"traffic_{d.value.lower()}": d.value for d in Daypart}
+
+COLUMNS: Tuple[str, ...] = tuple(SCORES) + tuple(DAYPART_COLUMNS)
+
+ScoreColumn = Enum("ScoreColumn", {c: c for c in COLUMNS}, type=str)
+
+
+@dataclass(frozen=True)
+class Ranked:
+    district_id: int
+    name: str
+    value: float
+    rank: int
+    percentile: float
+
+
+class ScoreMatrix:
+    """District x indicator matrix of headline scores; NaN where a district lacks a value.
+
+    Built once per snapshot, so ranking and weighted scoring are a single vectorized pass.
+    """
+
+    def __init__(self, details: Sequence[DistrictDetailRead]) -> None:
+        self.ids = np.array([d.id for d in details], dtype=np.int64)
+        self.names = [d.name for d in details]
+        self.columns = COLUMNS
+        self._index = {c: i for i, c in enumerate(COLUMNS)}
+        self.values = np.full((len(details), len(COLUMNS)), np.nan, dtype=np.float64)
+        for row, detail in enumerate(details):
+            for column, indicator in SCORES.items():
+                rows = getattr(detail, indicator.name) or ()
+                if rows:
+                    # Several rows per district: the newest one wins.
+                    latest = max(rows, key=lambda r: r.id)
+                    self.values[row, self._index[column]] = getattr(latest, column)
+            for agg in sorted(detail.aggregates or (), key=lambda r: r.id):
+                column = f"traffic_{agg.daypart.lower()}" if agg.daypart else None
+                if column in self._index and agg.score_0_100 is not None:
+                    self.values[row, self._index[column]] = agg.score_0_100
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self._index[name]]
+
+    def _ranked(self, values: np.ndarray, descending: bool, limit: int) -> List[Ranked]:
+        valid = ~np.isnan(values)
+        ids, names_idx, vals = self.ids[valid], np.flatnonzero(valid), values[valid]
+        n = len(vals)
+        if n == 0:
+            return []
+        keyed = -vals if descending else vals
+        order = np.lexsort((ids, keyed))
+        sorted_keys = keyed[order]
+        # Competition ranking ("1224"): a tie takes the position of its first member.
+        first = np.searchsorted(sorted_keys, sorted_keys, side="left")
+        ranks = first + 1
+        # Percentile rank over all districts with a value: share strictly worse plus half the ties.
+        asc = np.sort(vals)
+        below = np.searchsorted(asc, vals[order], side="left")
+        equal = np.searchsorted(asc, vals[order], side="right") - below
+        worse = below if descending else n - below - equal
+        percentiles = (worse + 0.5 * equal) / n * 100
+        top = order[:limit]
+        return [
+            Ranked(
+                district_id=int(ids[i]),
+                name=self.names[names_idx[i]],
+                value=float(vals[i]),
+                rank=int(ranks[pos]),
+                percentile=round(float(percentiles[pos]), 2),
+            )
+            for pos, i in enumerate(top)
+        ]
+
+    def rank(self, column: str, descending: bool = True, limit: int = 10) -> List[Ranked]:
+        return self._ranked(self.column(column), descending, limit)
+
+    def composite(self, weights: Mapping[str, float]) -> np.ndarray:
+        """Weighted 0-100 score per district.
+
+        Each column is min-max scaled to 0-1; a negative weight means lower is better.
+        Missing values drop out and the remaining weights are renormalized per district.
+        """
+        cols = [self._index[c] for c in weights]
+        w = np.array(list(weights.values()), dtype=np.float64)
+        x = self.values[:, cols]
+        with warnings.catch_warnings():
+            # A column with no values at all just contributes nothing.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            lo, hi = np.nanmin(x, axis=0), np.nanmax(x, axis=0)
+        span = np.where(hi > lo, hi - lo, 1.0)
+        scaled = (x - lo) / span
+        scaled = np.where(w < 0, 1.0 - scaled, scaled)
+        present = ~np.isnan(scaled)
+        aw = np.abs(w)
+        total = (present * aw).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = np.where(present, scaled * aw, 0.0).sum(axis=1) / total * 100
+        return np.where(total > 0, score, np.nan)
+
+    def score(self, weights: Mapping[str, float], descending: bool = True, limit: int = 10) -> List[Ranked]:
+        return self._ranked(self.composite(weights), descending, limit)
+
+
+def parse_weights(raw: str) -> Dict[str, float]:
+    """'safety_index:2,digital_noise_score:-1' -> {'safety_index': 2.0, 'digital_noise_score': -1.0}.
+
+    A bare column name gets weight 1. Raises ValueError on unknown columns or bad numbers,
+    including nan and inf, which would turn every composite into nan.
+    """
+    weights: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        name, _, value = part.partition(":")
+        name = name.strip()
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown indicator '{name}'")
+        weight = float(value) if value else 1.0
+        if not math.isfinite(weight):
+            raise ValueError(f"Weight for '{name}' must be a finite number")
+        weights[name] = weight
+    if not weights or not any(weights.values()):
+        raise ValueError("At least one non-zero weight is required")
+    return weights
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from src.models import (
+    DistrictAggregate,
+    SocialLife,
+    DistrictRhythm,
+    GreenPlaces,
+    DigitalNoise,
+    SocialAvailability,
+    LifeBalance,
+    Safety,
+)
+from src.schemas.district import (
+    DistrictAggregateRead,
+    SocialLifeRead,
+    DistrictRhythmRead,
+    GreenPlacesRead,
+    DigitalNoiseRead,
+    SocialAvailabilityRead,
+    LifeBalanceRead,
+    SafetyRead,
+)
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """An indicator table: its name (URL segment and DistrictDetailRead field), model and read schema.
+
+    ``score`` names the headline 0-100 column used for ranking, if the table has one.
+    """
+
+    name: str
+    model: type
+    schema: Type[BaseModel]
+    score: Optional[str] = None
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(self.schema.model_fields)
+
+    def columns(self, fields: Optional[Tuple[str, ...]] = None) -> list:
+        table = self.model.__table__
+        return [table.c[name] for name in (fields or self.fields)]
+
+    def projection(self, fields: Tuple[str, ...]) -> Type[BaseModel]:
+        return _projection(self.schema, fields)
+
+
+@lru_cache(maxsize=256)
+def _projection(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Schema restricted to ``fields``, keeping each field's type and default."""
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(f"{schema.__name__}Projection", **definitions)
+
+
+# In DistrictDetailRead order.
+INDICATORS: Dict[str, Indicator] = {
+    indicator.name: indicator
+    for indicator in (
+        Indicator("social_life", SocialLife, SocialLifeRead, score="normalized_score"),
+        Indicator("district_rhythm", DistrictRhythm, DistrictRhythmRead, score="rhythm_score"),
+        Indicator("green_places", GreenPlaces, GreenPlacesRead, score="green_life_score"),
+        Indicator("digital_noise", DigitalNoise, DigitalNoiseRead, score="digital_noise_score"),
+        Indicator("social_availability", SocialAvailability, SocialAvailabilityRead, score="social_availability_score"),
+        Indicator("life_balance", LifeBalance, LifeBalanceRead, score="life_balance_score"),
+        Indicator("safety", Safety, SafetyRead, score="safety_index"),
+        Indicator("aggregates", DistrictAggregate, DistrictAggregateRead),
+    )
+}
+
+IndicatorName = Enum("IndicatorName", {name: name for name in INDICATORS}, type=str)
+
+# Headline score column -> indicator, for ranking and composite scoring.
+SCORES: Dict[str, Indicator] = {i.score: i for i in INDICATORS.values() if i.score is not None}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import date
+from functools import lru_cache
+from typing import List, Optional, Type, Union
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.services.pagination import paginate, set_next_cursor
+from src.services.snapshot import in_period
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> list:
+    """Table columns backing ``schema``'s fields, in field order."""
+    return [model.__table__.c[name] for name in schema.model_fields]
+
+
+def render_rows(schema: Type[BaseModel], rows) -> Response:
+    """Validate plain row mappings once and encode them straight to JSON bytes in pydantic-core."""
+    adapter = list_adapter(schema)
+    return Response(content=adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
+
+
+async def list_page(
+    db: AsyncSession,
+    model,
+    schema: Type[BaseModel],
+    response: Response,
+    page: int,
+    size: int,
+    after: Optional[str],
+    city: str,
+    period: Optional[date] = None,
+) -> Union[list, Response]:
+    """One page of ``city``'s ``model`` rows, newest first.
+
+    Indicator tables keep every reporting period; their rows are those of ``period``, by
+    default each district's latest.
+
+    With FAST_SERIALIZATION the rows are fetched as mappings of just the schema's columns
+    and encoded here, skipping ORM instances and FastAPI's response_model round trip.
+    """
+    where = [model.city == city]
+    if "period" in model.__table__.c:
+        where.append(in_period(model, period))
+    if not get_settings().FAST_SERIALIZATION:
+        stmt = paginate(select(model).where(*where), model.id, page, size, after)
+        rows = (await db.execute(stmt)).scalars().all()
+        set_next_cursor(response, [r.id for r in rows], size)
+        return rows
+
+    stmt = select(*schema_columns(model, schema)).where(*where)
+    stmt = paginate(stmt, model.id, page, size, after)
+    rows = (await db.execute(stmt)).mappings().all()
+    fast = render_rows(schema, rows)
+    set_next_cursor(fast, [r["id"] for r in rows], size)
+    return fast
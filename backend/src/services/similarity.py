@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import get_settings
+from src.helpers import name_key
+from src.services.cities import city_file
+from src.services.snapshot import DistrictSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Neighbour:
+    district_id: int
+    name: str
+    similarity: float
+
+
+class DistrictEmbeddings:
+    """Unit-normalized district embeddings keyed by ``name_key`` of the district token.
+
+    Loaded from the ``district_embeddings.csv`` exported by the neighbourhood_similarity
+    notebook (``district_tok, emb_0 .. emb_N, district``).
+    """
+
+    def __init__(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.keys = list(keys)
+        self.vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "DistrictEmbeddings":
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            emb_columns = sorted(
+                (c for c in reader.fieldnames or () if c.startswith("emb_")),
+                key=lambda c: int(c.removeprefix("emb_")),
+            )
+            keys, rows = [], []
+            for row in reader:
+                keys.append(name_key(row.get("district_tok") or row["district"]))
+                rows.append([float(row[c]) for c in emb_columns])
+        return cls(keys, np.asarray(rows, dtype=np.float64))
+
+
+class SimilarityIndex:
+    """Top-k cosine neighbours for one snapshot version.
+
+    Only the snapshot's districts' unit vectors are kept: a lookup is one matrix-vector
+    product over the city and a partial sort, so memory stays linear in the district count.
+    """
+
+    def __init__(self, embeddings: DistrictEmbeddings, snapshot: DistrictSnapshot) -> None:
+        self.version = snapshot.version
+        ids, names, rows = [], [], []
+        seen = set()
+        for row, key in enumerate(embeddings.keys):
+            detail = snapshot.get_by_key(key)
+            if detail is not None and detail.id not in seen:
+                seen.add(detail.id)
+                ids.append(detail.id)
+                names.append(detail.name)
+                rows.append(row)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = names
+        self._row = {district_id: i for i, district_id in enumerate(ids)}
+        self.unit = embeddings.vectors[rows]
+
+    def __contains__(self, district_id: int) -> bool:
+        return district_id in self._row
+
+    def _top(self, i: int, similarity: np.ndarray, k: int) -> List[Neighbour]:
+        """The ``k`` most similar districts to row ``i`` by descending similarity, ties by position."""
+        similarity[i] = -np.inf
+        k = min(k, len(similarity) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.lexsort((top, -similarity[top]))]
+        return [Neighbour(int(self.ids[j]), self.names[j], round(float(similarity[j]), 4)) for j in top]
+
+    def similar(self, district_id: int, k: int) -> List[Neighbour]:
+        i = self._row[district_id]
+        return self._top(i, self.unit @ self.unit[i], k)
+
+    def similar_many(self, district_ids: Sequence[int], k: int) -> Dict[int, List[Neighbour]]:
+        wanted = [d for d in district_ids if d in self._row]
+        if not wanted:
+            return {}
+        rows = [self._row[d] for d in wanted]
+        # One product for the whole batch: len(wanted) x districts.
+        similarity = self.unit[rows] @ self.unit.T
+        return {d: self._top(i, similarity[n], k) for n, (d, i) in enumerate(zip(wanted, rows))}
+
+
+# Per city code; None in _embeddings records a city without (loadable) embeddings.
+_embeddings: Dict[str, Optional[DistrictEmbeddings]] = {}
+_indexes: Dict[str, SimilarityIndex] = {}
+
+
+def load_embeddings(city: str) -> Optional[DistrictEmbeddings]:
+    _embeddings[city] = None
+    _indexes.pop(city, None)
+    path = city_file(get_settings().DISTRICT_EMBEDDINGS_PATH, city)
+    if not path:
+        return None
+    try:
+        embeddings = DistrictEmbeddings.from_csv(path)
+    except (OSError, ValueError, KeyError):
+        logger.exception("Could not load district embeddings from %s", path)
+        return None
+    _embeddings[city] = embeddings
+    logger.info("Loaded %d district embeddings for %s from %s", len(embeddings), city, path)
+    return embeddings
+
+
+async def similarity_index(snapshot: DistrictSnapshot) -> Optional[SimilarityIndex]:
+    """The index for ``snapshot``'s city, rebuilt only when the data version changes."""
+    if snapshot.city not in _embeddings:
+        await asyncio.to_thread(load_embeddings, snapshot.city)
+    embeddings = _embeddings[snapshot.city]
+    if embeddings is None:
+        return None
+    index = _indexes.get(snapshot.city)
+    if index is None or index.version != snapshot.version:
+        index = _indexes[snapshot.city] = SimilarityIndex(embeddings, snapshot)
+    return index
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import json
+import time
+from datetime import date
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import get_settings
+from src.db import AsyncSessionLocal
+from src.models import DatasetVersion, District, IndicatorLatest
+from src.schemas.city import CityRead
+from src.schemas.district import DistrictDetailRead
+from src.services.cities import get_city
+from src.services.name_index import DistrictNameIndex
+from src.services.ranking import ScoreMatrix
+from src.services.registry import INDICATORS
+
+logger = logging.getLogger(__name__)
+
+_DISTRICT_COLUMNS = ("id", "name", "code", "district_type")
+
+
+def latest_period(model):
+    """Correlated subquery: the outer district's newest period of ``model``, from indicator_latest."""
+    return (
+        select(IndicatorLatest.period)
+        .where(
+            IndicatorLatest.city == District.city,
+            IndicatorLatest.indicator == model.__tablename__,
+            IndicatorLatest.district_id == District.id,
+        )
+        # Also correlates from inside the indicator subquery, two levels down.
+        .correlate_except(IndicatorLatest)
+        .scalar_subquery()
+    )
+
+
+def in_period(model, period: Optional[date] = None):
+    """Filter for ``model`` rows in ``period``'s month, or in their district's latest period."""
+    if period is not None:
+        return model.period == period.replace(day=1)
+    latest = (
+        select(IndicatorLatest.period)
+        .where(
+            IndicatorLatest.city == model.city,
+            IndicatorLatest.indicator == model.__tablename__,
+            IndicatorLatest.district_id == model.district_id,
+        )
+        .correlate(model)
+        .scalar_subquery()
+    )
+    return model.period == latest
+
+
+def _indicator_rows(model):
+    """Correlated subquery: the outer district's rows of ``model`` for its latest period, as one JSON array."""
+    row = func.json_build_object(
+        *chain.from_iterable(
+            (literal_column(f"'{c.name}'"), c) for c in model.__table__.columns if c.name != "city"
+        )
+    )
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(row, model.id)), literal_column("'[]'::json"), type_=JSON))
+        .where(model.city == District.city, model.district_id == District.id, model.period == latest_period(model))
+        .scalar_subquery()
+    )
+
+
+def city_statement(city: str):
+    """Every district of ``city`` with all indicators in a single round trip, newest id first."""
+    return (
+        select(
+            District.id,
+            District.name,
+            District.code,
+            District.district_type,
+            *(_indicator_rows(indicator.model).label(name) for name, indicator in INDICATORS.items()),
+        )
+        .where(District.city == city)
+        .order_by(District.id.desc())
+    )
+
+
+async def fetch_data_version(db: AsyncSession, city: str) -> str:
+    """Cheap fingerprint of one city's district data, in one round trip.
+
+    Combines the city's dataset_version counter bumped by loaders with its indicator_latest
+    pointers, which move whenever a new period lands, even from a write that forgot the
+    counter. Neither grows with the indicator history, unlike the tables themselves.
+    """
+    columns = [
+        select(func.coalesce(func.max(DatasetVersion.version), 0))
+        .where(DatasetVersion.city == city)
+        .scalar_subquery(),
+        select(func.count()).select_from(IndicatorLatest).where(IndicatorLatest.city == city).scalar_subquery(),
+        select(func.max(IndicatorLatest.period)).where(IndicatorLatest.city == city).scalar_subquery(),
+    ]
+    row = (await db.execute(select(*columns))).one()
+    return hashlib.sha1(":".join(str(v) for v in row).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class DistrictSnapshot:
+    """Immutable view of every district of one city with all of its indicators."""
+
+    city: str
+    version: str
+    built_at: float
+    details: Dict[int, DistrictDetailRead] = field(default_factory=dict)
+    # District ids ordered like the list endpoints (id DESC).
+    ordered_ids: List[int] = field(default_factory=list)
+    names: DistrictNameIndex = field(default_factory=lambda: DistrictNameIndex(()))
+
+    def get(self, district_id: int) -> Optional[DistrictDetailRead]:
+        return self.details.get(district_id)
+
+    def get_by_key(self, key: str) -> Optional[DistrictDetailRead]:
+        district_id = self.names.exact(key)
+        return self.details.get(district_id) if district_id is not None else None
+
+    def find_by_name(self, name: str) -> Optional[DistrictDetailRead]:
+        district_id = self.names.resolve(name)
+        return self.details.get(district_id) if district_id is not None else None
+
+    def many(self, ids: Iterable[int]) -> List[DistrictDetailRead]:
+        """Districts for ``ids`` in request order; unknown ids are skipped."""
+        return [self.details[i] for i in ids if i in self.details]
+
+    def columnar(self, ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """Column-oriented payload: parallel arrays per district field and per indicator field."""
+        items = self.many(ids) if ids is not None else [self.details[i] for i in self.ordered_ids]
+        districts = {column: [] for column in _DISTRICT_COLUMNS}
+        indicators: Dict[str, Dict[str, List[Any]]] = {}
+        for name, indicator in INDICATORS.items():
+            indicators[name] = {column: [] for column in indicator.fields}
+        for item in items:
+            for column in _DISTRICT_COLUMNS:
+                districts[column].append(getattr(item, column))
+            for name, columns in indicators.items():
+                for row in getattr(item, name) or ():
+                    for column, values in columns.items():
+                        values.append(getattr(row, column))
+        return {"version": self.version, "count": len(items), "districts": districts, "indicators": indicators}
+
+    @cached_property
+    def scores(self) -> ScoreMatrix:
+        return ScoreMatrix([self.details[i] for i in self.ordered_ids])
+
+    @cached_property
+    def columnar_json(self) -> bytes:
+        """The whole-city columnar payload, encoded once per snapshot."""
+        return json.dumps(
+            self.columnar(), separators=(",", ":"), ensure_ascii=False, default=date.isoformat
+        ).encode()
+
+    def page(self, page: int, size: int) -> List[DistrictDetailRead]:
+        start = (page - 1) * size
+        return [self.details[i] for i in self.ordered_ids[start:start + size]]
+
+    def page_after(self, last_id: int, size: int) -> List[DistrictDetailRead]:
+        """Keyset page: the next ``size`` districts with id < last_id."""
+        # ordered_ids is descending; bisect over the negated keys.
+        start = bisect.bisect_right(self.ordered_ids, -last_id, key=lambda i: -i)
+        return [self.details[i] for i in self.ordered_ids[start:start + size]]
+
+
+class SnapshotStore:
+    """Holds one city's current DistrictSnapshot and rebuilds it when the data version changes.
+
+    Readers always get a complete snapshot; a rebuild swaps the reference atomically.
+    Polling is skipped while ``push_active()`` says change notifications are arriving.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        refresh_interval: float,
+        city: str,
+        push_active: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self._session_factory = session_factory
+        self._refresh_interval = refresh_interval
+        self._push_active = push_active
+        self.city = city
+        self._snapshot: Optional[DistrictSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> Optional[DistrictSnapshot]:
+        return self._snapshot
+
+    async def build(self, db: AsyncSession) -> DistrictSnapshot:
+        version = await fetch_data_version(db, self.city)
+        rows = (await db.execute(city_statement(self.city))).mappings().all()
+        details = {row["id"]: DistrictDetailRead.model_validate(dict(row)) for row in rows}
+        return DistrictSnapshot(
+            city=self.city,
+            version=version,
+            built_at=time.time(),
+            details=details,
+            ordered_ids=[row["id"] for row in rows],
+            # Ascending id so ties resolve to the oldest row, as the SQL lookup did.
+            names=DistrictNameIndex(sorted((row["id"], row["name"], row["code"]) for row in rows)),
+        )
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Rebuild the snapshot if the data version changed. Returns True when a new snapshot was installed."""
+        async with self._lock:
+            async with self._session_factory() as db:
+                if not force and self._snapshot is not None:
+                    if await fetch_data_version(db, self.city) == self._snapshot.version:
+                        return False
+                snapshot = await self.build(db)
+            self._snapshot = snapshot
+        logger.info(
+            "District snapshot %s for %s built with %d districts", snapshot.version, self.city, len(snapshot.details)
+        )
+        return True
+
+    async def current(self) -> DistrictSnapshot:
+        if self._snapshot is None:
+            await self.refresh()
+        return self._snapshot
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            if self._push_active():
+                continue
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("District snapshot refresh for %s failed", self.city)
+
+    async def start(self) -> None:
+        try:
+            await self.refresh(force=True)
+        except Exception:
+            # The first request will retry; the API must still come up without the DB.
+            logger.exception("Initial district snapshot build for %s failed", self.city)
+        if self._refresh_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class SnapshotStores:
+    """One SnapshotStore per city.
+
+    Cities known at startup are built eagerly; a city added later gets its store, and its
+    refresh loop, on the first request for it. While ``listening`` (set by the
+    DatasetListener) changes are pushed through refresh() and the stores stop polling.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], refresh_interval: float) -> None:
+        self._session_factory = session_factory
+        self._refresh_interval = refresh_interval
+        self._stores: Dict[str, SnapshotStore] = {}
+        self._started = False
+        self.listening = False
+
+    def version(self, city: str) -> Optional[str]:
+        store = self._stores.get(city)
+        snapshot = store.snapshot if store is not None else None
+        return snapshot.version if snapshot is not None else None
+
+    async def get(self, city: str) -> SnapshotStore:
+        store = self._stores.get(city)
+        if store is None:
+            store = self._stores[city] = SnapshotStore(
+                self._session_factory, self._refresh_interval, city, push_active=lambda: self.listening
+            )
+            if self._started:
+                await store.start()
+        return store
+
+    async def refresh(self, city: Optional[str] = None) -> None:
+        """Rebuild ``city``'s snapshot, or every built one, if its data version moved."""
+        if city is None:
+            stores = list(self._stores.values())
+        else:
+            # A city nobody has asked for yet is built fresh on its first request.
+            stores = [self._stores[city]] if city in self._stores else []
+        await asyncio.gather(*(store.refresh() for store in stores if store.snapshot is not None))
+
+    async def start(self, cities: Iterable[str]) -> None:
+        self._started = True
+        await asyncio.gather(*(store.start() for store in [await self.get(city) for city in cities]))
+
+    async def stop(self) -> None:
+        self._started = False
+        await asyncio.gather(*(store.stop() for store in self._stores.values()))
+
+
+snapshot_stores = SnapshotStores(AsyncSessionLocal, get_settings().SNAPSHOT_REFRESH_SECONDS)
+
+
+async def get_snapshot(city: CityRead = Depends(get_city)) -> DistrictSnapshot:
+    store = await snapshot_stores.get(city.code)
+    return await store.current()
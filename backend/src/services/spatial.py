@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Depends
+
+from src.config import get_settings
+from src.helpers import name_key
+from src.schemas.city import CityRead
+from src.services.cities import city_file, get_city
+
+logger = logging.getLogger(__name__)
+
+# A ring is a closed sequence of (lon, lat) vertices, as in GeoJSON.
+Ring = List[Tuple[float, float]]
+BBox = Tuple[float, float, float, float]
+
+
+def _ring_contains(ring: Ring, lon: float, lat: float) -> bool:
+    """Even-odd ray casting test."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+@dataclass(frozen=True)
+class _Polygon:
+    key: str
+    bbox: BBox
+    exterior: Ring
+    holes: Tuple[Ring, ...]
+
+    def contains(self, lon: float, lat: float) -> bool:
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+            return False
+        if not _ring_contains(self.exterior, lon, lat):
+            return False
+        return not any(_ring_contains(hole, lon, lat) for hole in self.holes)
+
+
+def _bbox(ring: Ring) -> BBox:
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _polygons_from_geometry(key: str, geometry: dict) -> Iterable[_Polygon]:
+    kind = geometry.get("type")
+    if kind == "Polygon":
+        parts = [geometry["coordinates"]]
+    elif kind == "MultiPolygon":
+        parts = geometry["coordinates"]
+    elif kind == "GeometryCollection":
+        for sub in geometry.get("geometries", []):
+            yield from _polygons_from_geometry(key, sub)
+        return
+    else:
+        return
+    for rings in parts:
+        if not rings:
+            continue
+        exterior = [(float(x), float(y)) for x, y, *_ in rings[0]]
+        holes = tuple([(float(x), float(y)) for x, y, *_ in hole] for hole in rings[1:])
+        yield _Polygon(key=key, bbox=_bbox(exterior), exterior=exterior, holes=holes)
+
+
+class DistrictLocator:
+    """Point-in-polygon lookup over district boundaries backed by a uniform grid.
+
+    Each grid cell lists the polygons whose bounding box overlaps it, so a lookup
+    tests only a handful of candidates instead of every boundary.
+    """
+
+    def __init__(self, polygons: Sequence[_Polygon], grid_size: int = 64) -> None:
+        self._polygons = list(polygons)
+        self._grid_size = grid_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        if not self._polygons:
+            self._bounds: BBox = (0.0, 0.0, 0.0, 0.0)
+            return
+
+        self._bounds = (
+            min(p.bbox[0] for p in self._polygons),
+            min(p.bbox[1] for p in self._polygons),
+            max(p.bbox[2] for p in self._polygons),
+            max(p.bbox[3] for p in self._polygons),
+        )
+        min_lon, min_lat, max_lon, max_lat = self._bounds
+        self._cell_w = (max_lon - min_lon) / grid_size or 1.0
+        self._cell_h = (max_lat - min_lat) / grid_size or 1.0
+        for idx, poly in enumerate(self._polygons):
+            x0, y0 = self._cell_of(poly.bbox[0], poly.bbox[1])
+            x1, y1 = self._cell_of(poly.bbox[2], poly.bbox[3])
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self._cells.setdefault((cx, cy), []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._polygons)
+
+    @property
+    def keys(self) -> List[str]:
+        return sorted({p.key for p in self._polygons})
+
+    def _cell_of(self, lon: float, lat: float) -> Tuple[int, int]:
+        min_lon, min_lat, _, _ = self._bounds
+        cx = min(int((lon - min_lon) / self._cell_w), self._grid_size - 1)
+        cy = min(int((lat - min_lat) / self._cell_h), self._grid_size - 1)
+        return cx, cy
+
+    def locate(self, lat: float, lon: float) -> Optional[str]:
+        """Return the district key whose boundary contains the point, or None."""
+        if not self._polygons or math.isnan(lat) or math.isnan(lon):
+            return None
+        min_lon, min_lat, max_lon, max_lat = self._bounds
+        if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+            return None
+        for idx in self._cells.get(self._cell_of(lon, lat), ()):
+            poly = self._polygons[idx]
+            if poly.contains(lon, lat):
+                return poly.key
+        return None
+
+    @classmethod
+    def from_features(cls, features: Iterable[Tuple[str, dict]]) -> "DistrictLocator":
+        polygons: List[_Polygon] = []
+        for name, geometry in features:
+            polygons.extend(_polygons_from_geometry(name_key(name), geometry))
+        return cls(polygons)
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> "DistrictLocator":
+        """Load boundaries from a GeoJSON file or a directory of per-district GeoJSON files.
+
+        A directory follows the layout used by the divide_district notebook
+        (``dzielnice/<district>.geojson``); the file stem names the district. In a single
+        FeatureCollection, each feature is named by its ``district`` or ``name`` property.
+        """
+        path = Path(path)
+        features: List[Tuple[str, dict]] = []
+        if path.is_dir():
+            for file in sorted(path.glob("*.geojson")):
+                doc = json.loads(file.read_text(encoding="utf-8"))
+                features.extend((file.stem, geom) for _, geom in _iter_geometries(doc))
+        else:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+            for props, geom in _iter_geometries(doc):
+                name = props.get("district") or props.get("name")
+                if name:
+                    features.append((name, geom))
+        return cls.from_features(features)
+
+
+def _iter_geometries(doc: dict) -> Iterable[Tuple[dict, dict]]:
+    kind = doc.get("type")
+    if kind == "FeatureCollection":
+        for feature in doc.get("features", []):
+            if feature.get("geometry"):
+                yield feature.get("properties") or {}, feature["geometry"]
+    elif kind == "Feature":
+        if doc.get("geometry"):
+            yield doc.get("properties") or {}, doc["geometry"]
+    elif kind:
+        yield {}, doc
+
+
+# City code -> locator; None records a city without (loadable) boundaries.
+_locators: Dict[str, Optional[DistrictLocator]] = {}
+
+
+def load_locator(city: str) -> Optional[DistrictLocator]:
+    _locators[city] = None
+    path = city_file(get_settings().DISTRICT_BOUNDARIES_PATH, city)
+    if not path:
+        return None
+    try:
+        locator = DistrictLocator.from_path(path)
+    except (OSError, ValueError):
+        logger.exception("Could not load district boundaries from %s", path)
+        return None
+    _locators[city] = locator
+    logger.info("Loaded %d district polygons for %s from %s", len(locator), city, path)
+    return locator
+
+
+async def get_locator(city: CityRead = Depends(get_city)) -> Optional[DistrictLocator]:
+    if city.code not in _locators:
+        await asyncio.to_thread(load_locator, city.code)
+    return _locators[city.code]
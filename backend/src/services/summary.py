@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import DistrictSummary
+from src.services.ranking import Ranked
+
+
+async def summary_rank(
+    db: AsyncSession, city: str, column: str, descending: bool = True, limit: int = 10
+) -> List[Ranked]:
+    """``ScoreMatrix.rank`` computed by Postgres over one city's rows of the district_summary table.
+
+    Same semantics: competition ranks, ties broken by id, and the percentile is the share
+    of districts strictly worse plus half the ties.
+    """
+    value = getattr(DistrictSummary, column)
+    best_first = value.desc() if descending else value.asc()
+    worst_first = value.asc() if descending else value.desc()
+    n = func.count().over()
+    ranked = (
+        select(
+            DistrictSummary.district_id,
+            DistrictSummary.name,
+            value.label("value"),
+            func.rank().over(order_by=best_first).label("rank"),
+            (
+                ((func.rank().over(order_by=worst_first) - 1) + func.cume_dist().over(order_by=worst_first) * n)
+                / (2 * n)
+                * 100
+            ).label("percentile"),
+        )
+        .where(DistrictSummary.city == city, value.is_not(None))
+        .subquery()
+    )
+    stmt = select(ranked).order_by(ranked.c.rank, ranked.c.district_id).limit(limit)
+    rows = (await db.execute(stmt)).all()
+    return [
+        Ranked(
+            district_id=row.district_id,
+            name=row.name,
+            value=row.value,
+            rank=row.rank,
+            percentile=round(float(row.percentile), 2),
+        )
+        for row in rows
+    ]
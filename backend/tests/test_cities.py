@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from typing import List
+
+from src.services.cities import MIN_RELOAD_INTERVAL, CityRegistry
+
+WARSZAWA = SimpleNamespace(code="warszawa", name="Warszawa", geocoder_query="Warszawa, Polska", country_code="pl")
+
+
+class _Result:
+    def __init__(self, rows: List[SimpleNamespace]) -> None:
+        self._rows = rows
+
+    def scalars(self) -> "_Result":
+        return self
+
+    def all(self) -> List[SimpleNamespace]:
+        return self._rows
+
+
+class _Sessions:
+    """Stands in for a sessionmaker; counts the cities table reads."""
+
+    def __init__(self) -> None:
+        self.rows = [WARSZAWA]
+        self.loads = 0
+
+    def __call__(self) -> "_Sessions":
+        return self
+
+    async def __aenter__(self) -> "_Sessions":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+    async def execute(self, statement) -> _Result:
+        self.loads += 1
+        return _Result(list(self.rows))
+
+
+class CityRegistryTest(unittest.IsolatedAsyncioTestCase):
+    async def test_unknown_codes_reload_at_most_once_per_interval(self) -> None:
+        sessions = _Sessions()
+        # A snapshot refresh interval of 0 must not turn every unknown code into a query.
+        registry = CityRegistry(sessions, reload_interval=0)
+        await registry.load()
+
+        for _ in range(50):
+            self.assertIsNone(await registry.resolve("atlantis"))
+        self.assertEqual(sessions.loads, 1)
+
+        self.assertEqual((await registry.resolve("warszawa")).name, "Warszawa")
+
+    async def test_unknown_code_reloads_after_the_interval(self) -> None:
+        sessions = _Sessions()
+        registry = CityRegistry(sessions, reload_interval=0)
+        await registry.load()
+        sessions.rows.append(SimpleNamespace(code="krakow", name="Kraków", geocoder_query="Kraków, Polska", country_code="pl"))
+
+        registry._loaded_at -= MIN_RELOAD_INTERVAL
+        self.assertEqual((await registry.resolve("krakow")).name, "Kraków")
+        self.assertEqual(sessions.loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Dataset-versioned ETags: revalidations are answered without a database session.
+
+    cd backend
+    python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+import main
+from src.db import get_read_db, get_session
+from src.schemas.city import CityRead
+from src.schemas.district import DistrictDetailRead, SafetyRead
+from src.services.cities import get_city
+from src.services.name_index import DistrictNameIndex
+from src.services.snapshot import DistrictSnapshot, snapshot_stores
+
+CITY = CityRead(code="warszawa", name="Warszawa", geocoder_query="Warszawa, Polska", country_code="pl")
+
+
+def _no_database():
+    raise AssertionError("the request opened a database session")
+
+
+def _snapshot(version: str, districts: int = 40) -> DistrictSnapshot:
+    details = {
+        i: DistrictDetailRead(
+            id=i,
+            name=f"District {i}",
+            code=f"district_{i}",
+            safety=[
+                SafetyRead(
+                    id=i,
+                    district_id=i,
+                    period=date(2025, 9, 1),
+                    incidents=i,
+                    incident_norm=i / districts,
+                    safety_index=100 - i,
+                    safety_level="Moderate",
+                )
+            ],
+        )
+        for i in range(1, districts + 1)
+    }
+    ids = sorted(details, reverse=True)
+    return DistrictSnapshot(
+        city=CITY.code,
+        version=version,
+        built_at=time.time(),
+        details=details,
+        ordered_ids=ids,
+        names=DistrictNameIndex((i, d.name, d.code) for i, d in sorted(details.items())),
+    )
+
+
+class ConditionalGetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        store = asyncio.run(snapshot_stores.get(CITY.code))
+        self.addCleanup(setattr, store, "_snapshot", store.snapshot)
+        store._snapshot = _snapshot("v1")
+        self.store = store
+
+        main.app.dependency_overrides[get_city] = lambda: CITY
+        main.app.dependency_overrides[get_read_db] = _no_database
+        main.app.dependency_overrides[get_session] = _no_database
+        self.addCleanup(main.app.dependency_overrides.clear)
+        # Without a context manager the lifespan (cities, snapshot build, listener) does not run.
+        self.client = TestClient(main.app)
+
+    def test_revalidation_is_answered_without_the_database(self) -> None:
+        first = self.client.get("/api/districts/7/detail")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+
+        revalidated = self.client.get("/api/districts/7/detail", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["etag"], etag)
+        self.assertEqual(revalidated.content, b"")
+
+        # City-scoped routes revalidate the same way.
+        etag = self.client.get("/api/warszawa/districts/snapshot").headers["etag"]
+        revalidated = self.client.get("/api/warszawa/districts/snapshot", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_new_version_changes_the_etag(self) -> None:
+        etag = self.client.get("/api/districts/7/detail").headers["etag"]
+        self.store._snapshot = _snapshot("v2")
+        response = self.client.get("/api/districts/7/detail", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_304_names_the_compressed_variant(self) -> None:
+        for coding in ("br", "gzip"):
+            headers = {"Accept-Encoding": coding}
+            first = self.client.get("/api/districts/snapshot", headers=headers)
+            self.assertEqual(first.headers["content-encoding"], coding)
+            etag = first.headers["etag"]
+            self.assertTrue(etag.endswith(f'-{coding}"'), etag)
+
+            revalidated = self.client.get("/api/districts/snapshot", headers={**headers, "If-None-Match": etag})
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated.headers["etag"], etag)
+
+    def test_database_routes_get_no_etag(self) -> None:
+        # Replicas serving these may lag behind the snapshot, so its version says nothing about them.
+        for path in (
+            "/api/districts/",
+            "/api/districts/base",
+            "/api/districts/safety",
+            "/api/districts/indicators/safety",
+            "/api/districts/export/safety.csv",
+            "/api/districts/export/districts.parquet",
+            "/api/districts/7/summary",
+            "/api/districts/7/history",
+            "/api/warszawa/districts/7/history",
+        ):
+            self.assertIsNone(main._dataset_version(path), path)
+        for path in (
+            "/api/districts/snapshot",
+            "/api/districts/detailed",
+            "/api/districts/search",
+            "/api/districts/score",
+            "/api/districts/7/detail",
+            "/api/warszawa/districts/7/detail",
+        ):
+            self.assertEqual(main._dataset_version(path), "v1", path)
+
+
+if __name__ == "__main__":
+    unittest.main()
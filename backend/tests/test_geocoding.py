@@ -0,0 +1,162 @@
+"""Geocoder and geocode cache against a local stub of Nominatim's /search.
+
+    cd backend
+    python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.schemas.city import CityRead
+from src.services.geocoding import (
+    AddressNotFoundError,
+    DistrictNotDeterminedError,
+    GeocodeCache,
+    Geocoder,
+    GeocodingError,
+)
+
+CITY = CityRead(code="warszawa", name="Warszawa", geocoder_query="Warszawa, Polska", country_code="pl")
+
+
+class StubGeocoder(ThreadingHTTPServer):
+    """Answers /search from ``answers`` (address -> JSON results, or an int status) and counts requests."""
+
+    daemon_threads = True
+
+    def __init__(self, answers: Dict[str, object], delay: float = 0.0) -> None:
+        self.answers = answers
+        self.delay = delay
+        self.queries: List[str] = []
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/search"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        address = query.rsplit(", ", 2)[0]
+        self.server.queries.append(address)
+        time.sleep(self.server.delay)
+        answer = self.server.answers.get(address, [])
+        if isinstance(answer, int):
+            self.send_response(answer)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(answer).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def _district(name: str) -> list:
+    return [{"address": {"city_district": name}}]
+
+
+class GeocoderTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.stub = StubGeocoder(
+            {
+                "Marszałkowska 1": _district("Śródmieście"),
+                "Puławska 100": [{"address": {"suburb": "Mokotów"}}],
+                "Nowhere 1": [],
+                "Field 1": [{"address": {"road": "Field"}}],
+                "Broken 1": 500,
+            }
+        )
+        threading.Thread(target=self.stub.serve_forever, daemon=True).start()
+        self.addCleanup(self.stub.server_close)
+        self.addCleanup(self.stub.shutdown)
+
+    def geocoder(self, path: Optional[str] = None) -> Geocoder:
+        return Geocoder(self.stub.url, timeout=5.0, user_agent="tests", cache=GeocodeCache(100, 3600.0, path))
+
+    async def test_resolves_and_caches_normalized_address(self) -> None:
+        geocoder = self.geocoder()
+        await geocoder.start()
+        self.addAsyncCleanup(geocoder.stop)
+
+        self.assertEqual(await geocoder.district_name("Marszałkowska 1", CITY), "Śródmieście")
+        self.assertEqual(await geocoder.district_name("  marszałkowska   1 ", CITY), "Śródmieście")
+        self.assertEqual(await geocoder.district_name("Puławska 100", CITY), "Mokotów")
+        self.assertEqual(self.stub.queries, ["Marszałkowska 1", "Puławska 100"])
+
+    async def test_concurrent_lookups_share_one_request(self) -> None:
+        self.stub.delay = 0.2
+        geocoder = self.geocoder()
+        await geocoder.start()
+        self.addAsyncCleanup(geocoder.stop)
+
+        names = await asyncio.gather(*(geocoder.district_name("Marszałkowska 1", CITY) for _ in range(10)))
+        self.assertEqual(set(names), {"Śródmieście"})
+        self.assertEqual(len(self.stub.queries), 1)
+
+    async def test_errors(self) -> None:
+        geocoder = self.geocoder()
+        await geocoder.start()
+        self.addAsyncCleanup(geocoder.stop)
+
+        with self.assertRaises(AddressNotFoundError):
+            await geocoder.district_name("Nowhere 1", CITY)
+        with self.assertRaises(DistrictNotDeterminedError):
+            await geocoder.district_name("Field 1", CITY)
+        with self.assertRaises(GeocodingError):
+            await geocoder.district_name("Broken 1", CITY)
+        # Failures are not cached.
+        with self.assertRaises(AddressNotFoundError):
+            await geocoder.district_name("Nowhere 1", CITY)
+        self.assertEqual(self.stub.queries.count("Nowhere 1"), 2)
+
+    async def test_disk_cache_survives_restart(self) -> None:
+        path = str(Path(tempfile.mkdtemp()) / "geocode.db")
+        geocoder = self.geocoder(path)
+        await geocoder.start()
+        await geocoder.district_name("Marszałkowska 1", CITY)
+        await geocoder.stop()
+
+        # Same instance after stop(): the store reopens and takes writes again.
+        await geocoder.start()
+        await geocoder.district_name("Puławska 100", CITY)
+        await geocoder.stop()
+
+        restarted = self.geocoder(path)
+        await restarted.start()
+        self.addAsyncCleanup(restarted.stop)
+        self.assertEqual(len(restarted.cache), 2)
+        self.assertEqual(await restarted.district_name("Puławska 100", CITY), "Mokotów")
+        self.assertEqual(self.stub.queries, ["Marszałkowska 1", "Puławska 100"])
+
+    async def test_concurrent_disk_writes(self) -> None:
+        path = str(Path(tempfile.mkdtemp()) / "geocode.db")
+        cache = GeocodeCache(1000, 3600.0, path)
+        await cache.load()
+        await asyncio.gather(*(cache.set(f"warszawa:street {i}", f"district {i % 7}") for i in range(200)))
+        cache.close()
+
+        reloaded = GeocodeCache(1000, 3600.0, path)
+        await reloaded.load()
+        self.addCleanup(reloaded.close)
+        self.assertEqual(len(reloaded), 200)
+        self.assertEqual(reloaded.get("warszawa:street 9"), "district 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Indicator lists serve one reporting period: each district's latest, or the one asked for;
+history ranges select whole months.
+
+Needs a reachable, migrated database (POSTGRES_*). Everything is loaded into a throwaway
+city inside one transaction that is rolled back.
+
+    cd backend
+    python -m unittest tests.test_indicator_periods
+"""
+from __future__ import annotations
+
+import json
+import socket
+import unittest
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db import _create_engine
+from src.models import Safety
+from src.routes.district import list_indicator
+from src.schemas.city import CityRead
+from src.schemas.district import SafetyRead
+from src.services.history import district_history
+from src.services.loader import load, read_source
+from src.services.registry import INDICATORS, IndicatorName
+from src.services.serialization import list_page
+
+settings = get_settings()
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "districts.json"
+CITY = CityRead(code="periodtest", name="Period Test", geocoder_query="Period Test", country_code="pl")
+AUGUST, SEPTEMBER = date(2025, 8, 1), date(2025, 9, 1)
+
+
+def _database_reachable() -> bool:
+    try:
+        socket.create_connection((settings.DB.HOST, settings.DB.PORT), timeout=1).close()
+    except OSError:
+        return False
+    return True
+
+
+@unittest.skipUnless(_database_reachable(), "database is not reachable")
+class IndicatorPeriodsTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.engine = _create_engine(settings.DB.url_async, "test_periods")
+        self.addAsyncCleanup(self.engine.dispose)
+        self.conn = await self.engine.connect()
+        self.addAsyncCleanup(self.conn.close)
+        transaction = await self.conn.begin()
+        self.addAsyncCleanup(transaction.rollback)
+
+        await self.conn.execute(
+            text("SELECT add_city(:code, :name, :query, :country)"),
+            {"code": CITY.code, "name": CITY.name, "query": CITY.geocoder_query, "country": CITY.country_code},
+        )
+        self.districts = read_source(FIXTURES)
+        self.district_id = (await load(self.conn, CITY.code, self.districts, AUGUST)).district_ids[0]
+        for district in self.districts:
+            for row in district.rows.get(Safety, ()):
+                row["safety_index"] = 1.0
+        await load(self.conn, CITY.code, self.districts, SEPTEMBER)
+        self.db = AsyncSession(bind=self.conn)
+
+    async def list_safety(self, period=None) -> list:
+        return await list_page(self.db, Safety, SafetyRead, Response(), 1, 1000, None, CITY.code, period)
+
+    async def test_lists_serve_each_districts_latest_period(self) -> None:
+        rows = await self.list_safety()
+        self.assertEqual(len(rows), len(self.districts))
+        self.assertEqual(Counter(r.district_id for r in rows).most_common(1)[0][1], 1)
+        self.assertEqual({r.period for r in rows}, {SEPTEMBER})
+
+    async def test_lists_serve_an_older_period_on_request(self) -> None:
+        rows = await self.list_safety(date(2025, 8, 15))
+        self.assertEqual(len(rows), len(self.districts))
+        self.assertEqual({r.period for r in rows}, {AUGUST})
+        self.assertNotIn(1.0, {r.safety_index for r in rows})
+
+    async def test_generic_indicator_serves_the_latest_period(self) -> None:
+        response = await list_indicator(
+            IndicatorName("safety"), page=1, size=1000, after=None, fields="district_id,period",
+            district_id=None, period=None, city=CITY, db=self.db,
+        )
+        rows = json.loads(response.body)
+        self.assertEqual(len(rows), len(self.districts))
+        self.assertEqual(len({r["district_id"] for r in rows}), len(rows))
+        self.assertEqual({r["period"] for r in rows}, {SEPTEMBER.isoformat()})
+
+    async def test_history_bounds_select_their_month(self) -> None:
+        async def periods(start=None, end=None) -> list:
+            history = await district_history(self.db, CITY.code, INDICATORS["safety"], self.district_id, start, end)
+            return history["periods"]
+
+        self.assertEqual(await periods(), [AUGUST, SEPTEMBER])
+        self.assertEqual(await periods(start=date(2025, 9, 15)), [SEPTEMBER])
+        self.assertEqual(await periods(end=date(2025, 8, 20)), [AUGUST])
+        self.assertEqual(await periods(date(2025, 8, 31), date(2025, 9, 1)), [AUGUST, SEPTEMBER])
+
+
+if __name__ == "__main__":
+    unittest.main()
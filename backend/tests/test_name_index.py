@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import unittest
+
+from src.services.name_index import DistrictNameIndex
+
+DISTRICTS = [
+    (1, "Praga-Południe", "praga_poludnie"),
+    (2, "Praga-Północ", "praga_polnoc"),
+    (3, "Mokotów", "mokotow"),
+    (4, "Śródmieście", "srodmiescie"),
+    (5, "Wola", "wola"),
+    (6, "Wilanów", "wilanow"),
+    (7, "Włochy", "wlochy"),
+    (8, "Białołęka", "bialoleka"),
+]
+
+
+class DistrictNameIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = DistrictNameIndex(DISTRICTS)
+
+    def ids(self, query: str) -> list:
+        return [m.district_id for m in self.index.search(query)]
+
+    def test_exact_matches_rank_first(self) -> None:
+        matches = self.index.search("Wola")
+        self.assertEqual((matches[0].district_id, matches[0].match, matches[0].score), (5, "exact", 1.0))
+
+    def test_words_and_codes_are_exact_matches(self) -> None:
+        self.assertEqual(self.index.search("Północ")[0].district_id, 2)
+        self.assertEqual(self.index.search("praga_poludnie")[0].district_id, 1)
+
+    def test_prefix_matches(self) -> None:
+        matches = self.index.search("pra")
+        self.assertEqual(sorted(m.district_id for m in matches), [1, 2])
+        self.assertEqual({m.match for m in matches}, {"prefix"})
+        # A one-letter typo away from "wol(a)", which ranks below the prefix match.
+        self.assertEqual(self.ids("wil"), [6, 5])
+
+    def test_typos_match(self) -> None:
+        # A substitution, a transposition and a missing letter.
+        self.assertEqual(self.ids("mokotuw")[0], 3)
+        self.assertEqual(self.ids("mokotwo")[0], 3)
+        self.assertEqual(self.ids("bialolka")[0], 8)
+        # Two edits in a long query.
+        self.assertEqual(self.ids("srodmiesice")[0], 4)
+        self.assertEqual(self.index.search("mokotuw")[0].match, "fuzzy")
+
+    def test_typos_while_typing_match_the_prefix(self) -> None:
+        self.assertEqual(self.ids("mkoo"), [3])
+
+    def test_unrelated_queries_match_nothing(self) -> None:
+        self.assertEqual(self.ids("xyzzy"), [])
+        self.assertEqual(self.ids(""), [])
+
+    def test_diacritics_and_separators_fold(self) -> None:
+        for query in ("Śródmieście", "srodmiescie", "ŚRÓDMIEŚCIE", "  sródmieście "):
+            self.assertEqual(self.index.search(query)[0].district_id, 4, query)
+        self.assertEqual(self.index.exact("pragapoludnie"), 1)
+        self.assertEqual(self.index.resolve("Praga Południe"), 1)
+        self.assertEqual(self.index.resolve("praga-polnoc"), 2)
+
+    def test_resolve_prefers_the_shortest_name(self) -> None:
+        self.assertEqual(self.index.resolve("Wilanów"), 6)
+        self.assertEqual(self.index.resolve("wło"), 7)
+        self.assertIsNone(self.index.resolve("Ursynów"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import math
+import socket
+import unittest
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.db import _create_engine
+from src.models import DistrictSummary
+from src.services.ranking import COLUMNS, ScoreMatrix, parse_weights
+from src.services.summary import summary_rank
+
+NAN = math.nan
+IDS = [4, 2, 8, 6, 1, 3]
+# Ties at 70, a district without a safety value, and one without a digital noise value.
+SCORES = {
+    "safety_index": [70.0, 90.0, 70.0, 40.0, NAN, 70.0],
+    "digital_noise_score": [10.0, 30.0, 20.0, NAN, NAN, 10.0],
+}
+
+
+def _matrix(scores: Dict[str, List[float]]) -> ScoreMatrix:
+    matrix = ScoreMatrix([])
+    matrix.ids = np.array(IDS, dtype=np.int64)
+    matrix.names = [f"District {i}" for i in IDS]
+    matrix.values = np.full((len(IDS), len(COLUMNS)), np.nan)
+    for column, values in scores.items():
+        matrix.values[:, COLUMNS.index(column)] = values
+    return matrix
+
+
+def _database_reachable() -> bool:
+    settings = get_settings()
+    try:
+        socket.create_connection((settings.DB.HOST, settings.DB.PORT), timeout=1).close()
+    except OSError:
+        return False
+    return True
+
+
+class ParseWeightsTest(unittest.TestCase):
+    def test_parses_weights(self) -> None:
+        self.assertEqual(
+            parse_weights("safety_index:2, green_life_score,digital_noise_score:-1"),
+            {"safety_index": 2.0, "green_life_score": 1.0, "digital_noise_score": -1.0},
+        )
+
+    def test_rejects_bad_weights(self) -> None:
+        for raw in (
+            "safety_index:nan",
+            "safety_index:inf",
+            "safety_index:-Infinity",
+            "safety_index:1,green_life_score:NaN",
+            "safety_index:abc",
+            "unknown:1",
+            "safety_index:0",
+            "",
+        ):
+            with self.subTest(raw=raw), self.assertRaises(ValueError):
+                parse_weights(raw)
+
+
+class ScoreMatrixTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.matrix = _matrix(SCORES)
+
+    def ranking(self, ranked) -> list:
+        return [(r.district_id, r.value, r.rank, r.percentile) for r in ranked]
+
+    def test_rank_descending(self) -> None:
+        # Competition ranks ("1224"), ties by id; percentile: strictly worse plus half the ties, of 5.
+        self.assertEqual(
+            self.ranking(self.matrix.rank("safety_index", limit=10)),
+            [(2, 90.0, 1, 90.0), (3, 70.0, 2, 50.0), (4, 70.0, 2, 50.0), (8, 70.0, 2, 50.0), (6, 40.0, 5, 10.0)],
+        )
+
+    def test_rank_ascending(self) -> None:
+        self.assertEqual(
+            self.ranking(self.matrix.rank("safety_index", descending=False, limit=10)),
+            [(6, 40.0, 1, 90.0), (3, 70.0, 2, 50.0), (4, 70.0, 2, 50.0), (8, 70.0, 2, 50.0), (2, 90.0, 5, 10.0)],
+        )
+
+    def test_rank_limit_and_empty_column(self) -> None:
+        self.assertEqual([r.district_id for r in self.matrix.rank("safety_index", limit=2)], [2, 3])
+        self.assertEqual(self.matrix.rank("rhythm_score"), [])
+
+    def test_composite(self) -> None:
+        # Min-max scaled: safety (40..90) at weight 2, digital noise (10..30) inverted at weight 1;
+        # a missing value drops out and the remaining weights are renormalized.
+        composite = self.matrix.composite({"safety_index": 2.0, "digital_noise_score": -1.0})
+        expected = [(2 * 0.6 + 1) / 3, 2 / 3, (2 * 0.6 + 0.5) / 3, 0.0, NAN, (2 * 0.6 + 1) / 3]
+        np.testing.assert_allclose(composite, np.array(expected) * 100)
+
+    def test_composite_ignores_weight_scale(self) -> None:
+        np.testing.assert_allclose(
+            self.matrix.composite({"safety_index": 2.0, "digital_noise_score": -1.0}),
+            self.matrix.composite({"safety_index": 10.0, "digital_noise_score": -5.0}),
+        )
+
+    def test_score(self) -> None:
+        ranked = self.matrix.score({"safety_index": 2.0, "digital_noise_score": -1.0}, limit=10)
+        self.assertEqual([(r.district_id, r.rank) for r in ranked], [(3, 1), (4, 1), (2, 3), (8, 4), (6, 5)])
+        self.assertEqual([r.percentile for r in ranked], [80.0, 80.0, 50.0, 30.0, 10.0])
+
+
+@unittest.skipUnless(_database_reachable(), "database is not reachable")
+class SummaryRankTest(unittest.IsolatedAsyncioTestCase):
+    """summary_rank over district_summary rows agrees with ScoreMatrix.rank over the same values."""
+
+    CITY = "ranktest"
+
+    async def asyncSetUp(self) -> None:
+        engine = _create_engine(get_settings().DB.url_async, "test_ranking")
+        self.addAsyncCleanup(engine.dispose)
+        conn = await engine.connect()
+        self.addAsyncCleanup(conn.close)
+        transaction = await conn.begin()
+        self.addAsyncCleanup(transaction.rollback)
+        # Ids well clear of real districts; the insert is rolled back anyway.
+        self.offset = 10**12
+        await conn.execute(
+            insert(DistrictSummary),
+            [
+                {
+                    "district_id": self.offset + district_id,
+                    "city": self.CITY,
+                    "name": f"District {district_id}",
+                    "code": f"district_{district_id}",
+                    "refreshed_at": datetime.now(timezone.utc),
+                    **{column: None if math.isnan(values[row]) else values[row] for column, values in SCORES.items()},
+                }
+                for row, district_id in enumerate(IDS)
+            ],
+        )
+        self.db = AsyncSession(bind=conn)
+        self.matrix = _matrix(SCORES)
+
+    async def test_matches_score_matrix(self) -> None:
+        for column in SCORES:
+            for descending in (True, False):
+                with self.subTest(column=column, descending=descending):
+                    expected = self.matrix.rank(column, descending, limit=10)
+                    ranked = await summary_rank(self.db, self.CITY, column, descending, limit=10)
+                    self.assertEqual(
+                        [(r.district_id - self.offset, r.value, r.rank, r.percentile) for r in ranked],
+                        [(r.district_id, r.value, r.rank, r.percentile) for r in expected],
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Read replica routing: ejection and fallback to the primary.
+
+Needs a reachable primary (POSTGRES_*). The replica under test is the first of
+DB_REPLICA_HOSTS, or the primary itself when none is configured; it is reached through
+a local TCP proxy that the tests cut off or refuse to simulate a failed replica.
+With two local instances, e.g. a streaming replica on 5433:
+
+    cd backend
+    DB_REPLICA_HOSTS=127.0.0.1:5433 python -m unittest tests.test_read_router
+"""
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+import unittest
+from typing import Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from src.config import get_settings
+from src.db import ReadRouter, _create_engine
+
+settings = get_settings()
+TIMEOUT = 0.5
+
+
+def _primary_reachable() -> bool:
+    try:
+        socket.create_connection((settings.DB.HOST, settings.DB.PORT), timeout=1).close()
+    except OSError:
+        return False
+    return True
+
+
+class ReplicaProxy:
+    """Forwards a local port to the replica; ``blackhole()`` stops forwarding without closing anything."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.target = (host, port)
+        self.blackholed = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    def blackhole(self) -> None:
+        self.blackholed = True
+
+    async def close(self) -> None:
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        upstream_reader, upstream_writer = await asyncio.open_connection(*self.target)
+        self._writers |= {writer, upstream_writer}
+        await asyncio.gather(
+            self._pipe(reader, upstream_writer), self._pipe(upstream_reader, writer), return_exceptions=True
+        )
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while data := await reader.read(65536):
+            if not self.blackholed:
+                writer.write(data)
+                await writer.drain()
+        writer.close()
+
+
+@unittest.skipUnless(_primary_reachable(), "primary database is not reachable")
+class ReadRouterTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        replica_url = make_url((settings.DB.replica_urls or [settings.DB.url_async])[0])
+        self.proxy = ReplicaProxy(replica_url.host, replica_url.port or 5432)
+        port = await self.proxy.start()
+        self.addAsyncCleanup(self.proxy.close)
+
+        self.primary = _create_engine(settings.DB.url_async, "test_primary")
+        self.replica = _create_engine(
+            replica_url.set(host="127.0.0.1", port=port).render_as_string(hide_password=False),
+            "test_replica",
+            TIMEOUT,
+        )
+        self.addAsyncCleanup(self.primary.dispose)
+        self.addAsyncCleanup(self.replica.dispose, close=False)
+        self.router = ReadRouter(self.primary, [self.replica], retry_after=1.0, connect_timeout=TIMEOUT)
+
+    async def read(self) -> object:
+        """Runs a query through the router and returns the engine that served it."""
+        async with self.router.session() as session:
+            self.assertEqual((await session.execute(text("SELECT 1"))).scalar(), 1)
+            return session.bind
+
+    async def timed_read(self):
+        started = time.monotonic()
+        served_by = await self.read()
+        return served_by, time.monotonic() - started
+
+    async def test_reads_go_to_the_replica(self) -> None:
+        self.assertIs(await self.read(), self.replica)
+        self.assertEqual(self.router.healthy(), [self.replica])
+
+    async def test_unresponsive_replica_is_ejected(self) -> None:
+        # A pooled connection whose ping hangs, then fresh connects that never complete.
+        self.assertIs(await self.read(), self.replica)
+        self.proxy.blackhole()
+
+        served_by, elapsed = await self.timed_read()
+        self.assertIs(served_by, self.primary)
+        self.assertLess(elapsed, TIMEOUT + 1.0)
+        self.assertEqual(self.router.healthy(), [])
+
+        # While ejected, reads skip the replica without waiting on it.
+        served_by, elapsed = await self.timed_read()
+        self.assertIs(served_by, self.primary)
+        self.assertLess(elapsed, TIMEOUT)
+
+    async def test_refused_replica_is_ejected(self) -> None:
+        await self.proxy.close()
+        served_by, elapsed = await self.timed_read()
+        self.assertIs(served_by, self.primary)
+        self.assertLess(elapsed, TIMEOUT + 1.0)
+        self.assertEqual(self.router.healthy(), [])
+
+    async def test_replica_is_retried_after_ejection(self) -> None:
+        self.router.mark_down(self.replica)
+        self.assertIs(await self.read(), self.primary)
+        await asyncio.sleep(1.1)
+        self.assertIs(await self.read(), self.replica)
+
+
+if __name__ == "__main__":
+    unittest.main()
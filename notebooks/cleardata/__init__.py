@@ -0,0 +1 @@
+"""The cleaning stages of the notebooks in this directory as importable modules."""
@@ -0,0 +1,329 @@
+"""Streaming extract: Warsaw rows of the user_locations logs, joined with cells and cos.
+
+What extract_data.ipynb does, for any number of (daily) log files and in bounded memory:
+
+- each input file is read in chunks by a worker of a process pool
+- rows whose cell_rk is not a Warsaw cell are dropped first
+- cell and cos attributes (and, given a cell -> district map, the district) are joined by
+  looking up row positions in arrays built once per worker, not with DataFrame.merge
+- each worker appends its chunks to its own Parquet staging file; the parent appends the
+  staged files, in input order, to the output CSV or cleardata.store directory
+- inputs already extracted into the output are skipped, so new daily files can be
+  added to the same output run after run; a file whose extract was interrupted is
+  rolled back out of the output and extracted again
+
+Memory is one chunk per worker plus the lookup tables, whatever the input size.
+
+    cd notebooks
+    python -m cleardata.extract data/user_locations_*.gz --out data/hackplay_warszawa_full.csv
+    python -m cleardata.extract data/user_locations_*.gz --store data/logs \\
+        --cell-districts data/warszawa_cell_districts.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+LOG_COLUMNS = ["start_dttm", "cell_rk", "cos_rk", "user_id"]
+LOG_DTYPES = {"cell_rk": "int64", "cos_rk": "int64", "user_id": "string"}
+CELL_COLUMNS = ["lac", "cid", "technology", "frequency", "cell_lon", "cell_lat"]
+COS_COLUMNS = ["cos_nm", "cos_family_nm"]
+# extract_data.ipynb's column order.
+OUTPUT_COLUMNS = [
+    "start_dttm", "user_id",
+    "cell_rk", "lac", "cid", "technology", "frequency", "cell_lon", "cell_lat",
+    "cos_rk", "cos_nm", "cos_family_nm",
+]
+CHUNK_ROWS = 500_000
+# Keys are looked up in a dense array when it stays this small, else through a hash index.
+DENSE_KEYS = 1 << 24
+MANIFEST_SUFFIX = ".extracted"
+
+
+class KeyLookup:
+    """Row positions of keys in a lookup table; -1 where a key is absent."""
+
+    def __init__(self, keys: pd.Series) -> None:
+        self.index = pd.Index(keys)
+        if not self.index.is_unique:
+            raise ValueError(f"{keys.name} is not unique in the lookup table")
+        self.dense: Optional[np.ndarray] = None
+        if self.index.dtype.kind in "iu" and len(self.index) and self.index.min() >= 0 and self.index.max() < DENSE_KEYS:
+            self.dense = np.full(self.index.max() + 1, -1, dtype=np.int32)
+            self.dense[self.index.to_numpy()] = np.arange(len(self.index), dtype=np.int32)
+
+    def positions(self, keys: np.ndarray) -> np.ndarray:
+        if self.dense is None or keys.dtype.kind not in "iu":
+            return self.index.get_indexer(keys)
+        inside = (keys >= 0) & (keys < len(self.dense))
+        positions = np.full(len(keys), -1, dtype=np.int32)
+        positions[inside] = self.dense[keys[inside]]
+        return positions
+
+
+class Table:
+    """A lookup table as a key index and one array per attribute column."""
+
+    def __init__(self, frame: pd.DataFrame, key: str, columns: Sequence[str]) -> None:
+        self.keys = KeyLookup(frame[key])
+        # Nullable dtypes, so absent keys come back as missing without changing a column's type.
+        self.columns = {name: frame[name].convert_dtypes().array for name in columns if name in frame}
+
+    def join(self, keys: np.ndarray) -> Dict[str, pd.api.extensions.ExtensionArray]:
+        positions = self.keys.positions(keys)
+        return {name: values.take(positions, allow_fill=True) for name, values in self.columns.items()}
+
+
+class Join:
+    """Filter a log chunk to Warsaw cells and attach cell, cos and district attributes."""
+
+    def __init__(
+        self,
+        warsaw_cells: pd.Series,
+        cells: pd.DataFrame,
+        cos: pd.DataFrame,
+        cell_districts: Optional[pd.DataFrame] = None,
+        time_format: Optional[str] = None,
+    ) -> None:
+        self.warsaw = KeyLookup(pd.Series(warsaw_cells.unique(), name="cell_rk"))
+        self.cells = Table(cells[cells["cell_rk"].isin(warsaw_cells)], "cell_rk", CELL_COLUMNS)
+        self.cos = Table(cos, "cos_rk", COS_COLUMNS)
+        self.districts = Table(cell_districts, "cell_rk", ["district"]) if cell_districts is not None else None
+        self.time_format = time_format
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = chunk[self.warsaw.positions(chunk["cell_rk"].to_numpy()) >= 0]
+        cell_rk = chunk["cell_rk"].to_numpy()
+        columns = {
+            "start_dttm": pd.to_datetime(chunk["start_dttm"], errors="coerce", format=self.time_format).to_numpy(),
+            "user_id": chunk["user_id"].array,
+            "cell_rk": cell_rk,
+            **self.cells.join(cell_rk),
+            "cos_rk": chunk["cos_rk"].to_numpy(),
+            **self.cos.join(chunk["cos_rk"].to_numpy()),
+        }
+        ordered = {name: columns[name] for name in OUTPUT_COLUMNS if name in columns}
+        if self.districts is not None:
+            ordered.update(self.districts.join(cell_rk))
+        return pd.DataFrame(ordered)
+
+
+@dataclass
+class Extracted:
+    source: Path
+    staged: Path
+    read: int
+    written: int
+    seconds: float
+
+
+_join: Optional[Join] = None
+
+
+def _init_worker(join: Join) -> None:
+    global _join
+    _join = join
+
+
+def extract_file(source: Path, staged: Path, chunk_rows: int = CHUNK_ROWS, join: Optional[Join] = None) -> Extracted:
+    """Stream one log file through the join into a Parquet file, a chunk at a time."""
+    join = join or _join
+    started = time.perf_counter()
+    read = written = 0
+    writer: Optional[pq.ParquetWriter] = None
+    try:
+        for chunk in pd.read_csv(source, usecols=LOG_COLUMNS, dtype=LOG_DTYPES, chunksize=chunk_rows):
+            read += len(chunk)
+            rows = join(chunk)
+            if rows.empty:
+                continue
+            table = pa.Table.from_pandas(rows, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(staged, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            written += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return Extracted(source, staged, read, written, time.perf_counter() - started)
+
+
+def staged_batches(staged: Path, batch_rows: int = CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    if not staged.exists():
+        return
+    yield from pq.ParquetFile(staged).iter_batches(batch_size=batch_rows)
+
+
+class CsvOutput:
+    """Appends to one CSV, writing the header only into an empty file.
+
+    Written with pyarrow's CSV writer (several times faster than DataFrame.to_csv);
+    whole-second timestamps are formatted as to_csv would.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.manifest = path.with_name(path.name + MANIFEST_SUFFIX)
+
+    def mark(self) -> int:
+        """The CSV's size, to truncate back to."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def truncate(self, mark: int) -> None:
+        if self.path.exists():
+            os.truncate(self.path, mark)
+
+    def append(self, batch: pa.RecordBatch) -> None:
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        if not new:
+            with self.path.open(encoding="utf-8", newline="") as f:
+                header = next(csv.reader(f))
+            if header != batch.schema.names:
+                raise ValueError(f"{self.path} has columns {header}, the extract produces {batch.schema.names}")
+        start = batch.column("start_dttm")
+        if pc.all(pc.equal(pc.floor_temporal(start, unit="second"), start)).as_py() is not False:
+            index = batch.schema.get_field_index("start_dttm")
+            seconds = start.cast(pa.timestamp("s", start.type.tz))
+            batch = batch.set_column(index, "start_dttm", pc.strftime(seconds, "%Y-%m-%d %H:%M:%S"))
+        with self.path.open("wb" if new else "ab") as f:
+            pacsv.write_csv(batch, f, pacsv.WriteOptions(include_header=new))
+
+    def close(self) -> None:
+        pass
+
+
+class StoreOutput:
+    """Appends to a cleardata.store directory and compacts its partitions at the end."""
+
+    def __init__(self, root: Path) -> None:
+        from .store import LogStore
+
+        self.store = LogStore(root)
+        self.manifest = self.store.root / ("_files" + MANIFEST_SUFFIX)
+
+    def mark(self) -> int:
+        """The store's next row number, to truncate back to."""
+        return self.store.rows.next
+
+    def truncate(self, mark: int) -> None:
+        self.store.truncate(mark)
+
+    def append(self, batch: pa.RecordBatch) -> None:
+        self.store.append(batch.to_pandas())
+
+    def close(self) -> None:
+        self.store.compact()
+
+
+def _file_key(path: Path) -> str:
+    stat = path.stat()
+    return f"{path.resolve()}\t{stat.st_size}"
+
+
+def _write_replace(path: Path, text: str) -> None:
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def extract(
+    sources: Sequence[Path],
+    output,
+    join: Join,
+    workers: Optional[int] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> List[Extracted]:
+    """Extract ``sources`` into ``output`` (CsvOutput or StoreOutput), skipping files it already has.
+
+    A source is recorded in the output's manifest once all its rows are appended. Before
+    its first row, the output's mark (CSV size or next store row) is saved next to the
+    manifest; if a run is interrupted mid-source, the next one truncates the output back
+    to that mark and extracts the source again, so no row is appended twice.
+    """
+    done = set(output.manifest.read_text(encoding="utf-8").splitlines()) if output.manifest.exists() else set()
+    appending = output.manifest.with_name(output.manifest.name + ".appending")
+    if appending.exists():
+        mark, key = appending.read_text(encoding="utf-8").split("\t", 1)
+        if key not in done:
+            output.truncate(int(mark))
+        appending.unlink()
+    pending = [source for source in sources if _file_key(source) not in done]
+    if not pending:
+        return []
+
+    staging = Path(tempfile.mkdtemp(prefix=".extract-", dir=output.manifest.parent))
+    results: List[Extracted] = []
+    try:
+        staged = [staging / f"{i:05d}.parquet" for i in range(len(pending))]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(join,)) as pool:
+            # map yields in input order, so the output keeps the order of the sources.
+            for result in pool.map(extract_file, pending, staged, [chunk_rows] * len(pending)):
+                key = _file_key(result.source)
+                _write_replace(appending, f"{output.mark()}\t{key}")
+                for batch in staged_batches(result.staged, chunk_rows):
+                    output.append(batch)
+                with output.manifest.open("a", encoding="utf-8") as f:
+                    f.write(key + "\n")
+                appending.unlink()
+                result.staged.unlink(missing_ok=True)
+                pa.default_memory_pool().release_unused()
+                results.append(result)
+        output.close()
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m cleardata.extract", description=__doc__.splitlines()[0])
+    parser.add_argument("sources", type=Path, nargs="+", help="user_locations log files (csv or gz)")
+    destination = parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument("--out", type=Path, help="CSV to append to (hackplay_warszawa_full.csv)")
+    destination.add_argument("--store", type=Path, help="cleardata.store directory to append to")
+    parser.add_argument("--cells", type=Path, default=Path("data/hackplay_cells.gz"))
+    parser.add_argument("--cos", type=Path, default=Path("data/hackplay_cos.gz"))
+    parser.add_argument("--warsaw-cells", type=Path, default=Path("data/warszawa_cell_rks.csv"))
+    parser.add_argument("--cell-districts", type=Path, help="CSV of cell_rk,district (see divide_district.ipynb)")
+    parser.add_argument("--time-format", help="strftime format of start_dttm; inferred per chunk if omitted")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="files processed at once")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    join = Join(
+        pd.read_csv(args.warsaw_cells)["cell_rk"],
+        pd.read_csv(args.cells),
+        pd.read_csv(args.cos),
+        pd.read_csv(args.cell_districts) if args.cell_districts else None,
+        args.time_format,
+    )
+    output = CsvOutput(args.out) if args.out else StoreOutput(args.store)
+    started = time.perf_counter()
+    results = extract(sorted(set(args.sources)), output, join, args.workers, args.chunk_rows)
+    skipped = len(set(args.sources)) - len(results)
+    for result in results:
+        print(f"{result.source}: {result.read:,} rows read, {result.written:,} in Warsaw, {result.seconds:.1f}s")
+    read = sum(result.read for result in results)
+    written = sum(result.written for result in results)
+    print(
+        f"{len(results)} files ({skipped} already extracted), {read:,} rows read, {written:,} written "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Partitioned Parquet store for the cleaned telecom logs.
+
+The rows of hackplay_warszawa_full.csv / hackplay_warszawa_with_districts.csv as a
+hive-partitioned Parquet dataset, one directory per day and district:
+
+    <root>/date=2025-09-01/district=Mokot%C3%B3w/part-<token>-0.parquet
+    <root>/_users.parquet
+    <root>/_rows
+
+start_dttm is a native timestamp; technology, cos_nm and cos_family_nm are
+dictionary-encoded (categoricals in pandas), as is district on read; user_id is an int32
+code into _users.parquet, which keeps the original ids. Rows without a timestamp or a
+district go to the __HIVE_DEFAULT_PARTITION__ directories and read back as missing.
+
+Readers name the columns and the districts / time range they need: pyarrow only opens
+the matching partition directories and, since files are sorted by start_dttm, skips
+row groups outside the range. Every row also carries its position in the appended
+input (``row``, counted on in _rows), and reads return rows in that order, so the
+float sums of anything computed from them match the CSV's to the last bit.
+
+    cd notebooks
+    python -m cleardata.store data/hackplay_warszawa_with_districts.csv data/logs
+
+The store assumes one writer at a time.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# hackplay_warszawa_full.csv's columns; district and the date come from the partition path.
+SCHEMA = pa.schema(
+    [
+        ("start_dttm", pa.timestamp("us")),
+        ("user_id", pa.int32()),
+        ("cell_rk", pa.int64()),
+        ("lac", pa.float64()),
+        ("cid", pa.float64()),
+        ("technology", _CATEGORY),
+        ("frequency", pa.float64()),
+        ("cell_lon", pa.float64()),
+        ("cell_lat", pa.float64()),
+        ("cos_rk", pa.int64()),
+        ("cos_nm", _CATEGORY),
+        ("cos_family_nm", _CATEGORY),
+        # Position in the appended input; not a CSV column.
+        ("row", pa.int64()),
+    ]
+)
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.date32()), ("district", pa.string())]), flavor="hive")
+COLUMNS = [name for name in SCHEMA.names if name != "row"] + ["district"]
+
+USERS_FILE = "_users.parquet"
+ROWS_FILE = "_rows"
+ROW_GROUP_ROWS = 128 * 1024
+# A year of days times the districts, with room to spare.
+MAX_PARTITIONS = 20_000
+IMPORT_CHUNK_ROWS = 1_000_000
+
+Day = Union[str, date, datetime, pd.Timestamp]
+
+
+class UserCodes:
+    """The user_id dictionary: original ids in code order, codes assigned on first sight."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        ids = pq.read_table(path).column("user_id").to_pandas() if path.exists() else []
+        self.ids = pd.Index(ids, dtype="string")
+        self._saved = len(self.ids)
+
+    def encode(self, ids: pd.Series) -> np.ndarray:
+        """int32 codes, -1 for a missing id."""
+        ids = ids.astype("string")
+        codes = self.ids.get_indexer(ids)
+        unseen = (codes == -1) & ids.notna().to_numpy()
+        if unseen.any():
+            new = pd.Index(ids[unseen].unique(), dtype="string")
+            self.ids = self.ids.append(new)
+            codes[unseen] = len(self.ids) - len(new) + new.get_indexer(ids[unseen])
+        return codes.astype(np.int32)
+
+    def decode(self, codes: pd.Series) -> pd.Series:
+        known = codes.notna()
+        out = pd.Series(pd.NA, index=codes.index, dtype="string")
+        out[known] = self.ids.take(codes[known].to_numpy(dtype=np.int64))
+        return out
+
+    def save(self) -> None:
+        if len(self.ids) == self._saved:
+            return
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        pq.write_table(pa.table({"user_id": pa.array(self.ids, pa.string())}), temporary)
+        os.replace(temporary, self.path)
+        self._saved = len(self.ids)
+
+
+class RowCounter:
+    """The next ``row`` number; reserved (and saved) before the rows using it are written."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.next = int(path.read_text()) if path.exists() else 0
+
+    def reserve(self, count: int) -> int:
+        """Saves the counter past ``count`` rows and returns the first of them."""
+        first = self.next
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(str(first + count))
+        os.replace(temporary, self.path)
+        self.next = first + count
+        return first
+
+
+class LogStore:
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.users = UserCodes(self.root / USERS_FILE)
+        self.rows = RowCounter(self.root / ROWS_FILE)
+
+    def _encode(self, frame: pd.DataFrame, first_row: int) -> pa.Table:
+        start = pd.to_datetime(frame["start_dttm"], errors="coerce")
+        columns = {}
+        for field in SCHEMA:
+            if field.name == "row":
+                columns[field.name] = pa.array(np.arange(first_row, first_row + len(frame)), field.type)
+            elif field.name not in frame:
+                columns[field.name] = pa.nulls(len(frame), field.type)
+            elif field.name == "start_dttm":
+                columns[field.name] = pa.array(start, field.type, from_pandas=True)
+            elif field.name == "user_id":
+                codes = self.users.encode(frame["user_id"])
+                columns[field.name] = pa.array(codes, field.type, mask=codes < 0)
+            elif field.type == _CATEGORY:
+                columns[field.name] = pa.array(frame[field.name].astype("string"), pa.string()).dictionary_encode()
+            else:
+                columns[field.name] = pa.array(frame[field.name], field.type, from_pandas=True)
+        columns["date"] = pc.cast(columns["start_dttm"], pa.date32())
+        district = frame["district"] if "district" in frame else pd.Series(pd.NA, index=frame.index)
+        columns["district"] = pa.array(district.astype("string"), pa.string())
+        return pa.table(columns).sort_by("start_dttm")
+
+    def append(self, frame: pd.DataFrame) -> int:
+        """Add log rows (CSV column names; start_dttm as text or timestamps); returns rows written."""
+        # Row numbers and codes first: a later append never reuses a row number, and data
+        # never refers to a user the dictionary does not have.
+        table = self._encode(frame, self.rows.reserve(len(frame)))
+        self.users.save()
+        ds.write_dataset(
+            table,
+            self.root,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_partitions=MAX_PARTITIONS,
+            max_rows_per_group=ROW_GROUP_ROWS,
+            min_rows_per_group=min(ROW_GROUP_ROWS, len(table)) or None,
+        )
+        return len(table)
+
+    def compact(self) -> int:
+        """Rewrite every partition holding several files as one file sorted by start_dttm.
+
+        Appends add a file per partition they touch; after many small appends reads spend
+        their time opening files. Works one partition at a time. Returns partitions rewritten.
+        Not crash-safe: if interrupted between writing the new file and deleting the old
+        ones, that partition holds its rows twice.
+        """
+        rewritten = 0
+        for directory in sorted({path.parent for path in self.root.glob("date=*/district=*/*.parquet")}):
+            files = sorted(directory.glob("*.parquet"))
+            if len(files) < 2:
+                continue
+            table = ds.dataset(files, format="parquet", schema=SCHEMA).to_table().sort_by("start_dttm")
+            target = directory / f"part-{uuid.uuid4().hex}-0.parquet"
+            temporary = target.with_name("." + target.name)
+            pq.write_table(table, temporary, row_group_size=ROW_GROUP_ROWS)
+            os.replace(temporary, target)
+            for path in files:
+                path.unlink()
+            rewritten += 1
+        return rewritten
+
+    def truncate(self, rows: int) -> int:
+        """Drop every row numbered ``rows`` or above, i.e. appended after the counter stood there.
+
+        Rolls back interrupted appends: their files hold only such rows, and a file left
+        unreadable by a write cut short is one of them. Returns files removed or rewritten.
+        """
+        changed = 0
+        for path in sorted(self.root.glob("date=*/district=*/*.parquet")):
+            try:
+                file = pq.ParquetFile(path)
+            except (pa.ArrowInvalid, OSError):
+                path.unlink()
+                changed += 1
+                continue
+            if "row" not in file.schema_arrow.names:
+                continue
+            numbers = file.read(columns=["row"]).column("row")
+            keep = pc.less(numbers, rows)
+            if pc.all(keep).as_py() is not False:
+                continue
+            if pc.any(keep).as_py():
+                table = file.read().filter(keep)
+                temporary = path.with_name("." + path.name)
+                pq.write_table(table, temporary, row_group_size=ROW_GROUP_ROWS)
+                os.replace(temporary, path)
+            else:
+                path.unlink()
+            changed += 1
+        return changed
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format="parquet", schema=_DATASET_SCHEMA, partitioning=PARTITIONING)
+
+    def read(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        districts: Optional[Iterable[str]] = None,
+        start: Optional[Day] = None,
+        end: Optional[Day] = None,
+        decode_users: bool = False,
+    ) -> pd.DataFrame:
+        """Rows in [start, end) for ``districts`` (default: everything), only ``columns``.
+
+        user_id comes back as its int code (nullable Int32) unless ``decode_users``. Rows
+        are in the order they were appended.
+        """
+        columns = list(columns or COLUMNS)
+        table = self.dataset().to_table(columns=columns + ["row"], filter=where(districts, start, end))
+        table = table.sort_by("row").drop_columns(["row"])
+        # Frees each Arrow column once converted, instead of holding both copies.
+        frame = table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get, split_blocks=True, self_destruct=True)
+        del table
+        pa.default_memory_pool().release_unused()
+        if "district" in frame:
+            frame["district"] = frame["district"].astype("category")
+        if decode_users and "user_id" in frame:
+            frame["user_id"] = self.users.decode(frame["user_id"])
+        return frame
+
+    def partitions(self) -> pd.DataFrame:
+        """One row per (date, district) directory: files, rows and bytes on disk."""
+        rows: List[dict] = []
+        for fragment in self.dataset().get_fragments():
+            keys = ds.get_partition_keys(fragment.partition_expression)
+            metadata = fragment.metadata
+            rows.append(
+                {
+                    "date": keys.get("date"),
+                    "district": keys.get("district"),
+                    "files": 1,
+                    "rows": metadata.num_rows,
+                    "bytes": os.path.getsize(fragment.path),
+                }
+            )
+        if not rows:
+            return pd.DataFrame(columns=["date", "district", "files", "rows", "bytes"])
+        return pd.DataFrame(rows).groupby(["date", "district"], dropna=False, as_index=False).sum()
+
+
+_DATASET_SCHEMA = pa.schema(list(SCHEMA) + list(PARTITIONING.schema))
+
+
+def where(districts: Optional[Iterable[str]] = None, start: Optional[Day] = None, end: Optional[Day] = None):
+    """The dataset filter for a district set and a half-open [start, end) time range.
+
+    The date and district terms prune partition directories; the start_dttm terms
+    select rows, skipping row groups whose min/max fall outside.
+    """
+    expression = None
+
+    def add(term):
+        nonlocal expression
+        expression = term if expression is None else expression & term
+
+    if districts is not None:
+        add(ds.field("district").isin(list(districts)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        add(ds.field("date") >= start.date())
+        add(ds.field("start_dttm") >= start.to_pydatetime())
+    if end is not None:
+        end = pd.Timestamp(end)
+        add(ds.field("date") <= (end - pd.Timedelta(1, "us")).date())
+        add(ds.field("start_dttm") < end.to_pydatetime())
+    return expression
+
+
+def import_csv(csv: Union[str, Path], store: LogStore, chunk_rows: int = IMPORT_CHUNK_ROWS) -> int:
+    """Stream a logs CSV into the store chunk by chunk; returns rows written."""
+    written = 0
+    for chunk in pd.read_csv(csv, chunksize=chunk_rows, dtype={"user_id": "string"}):
+        written += store.append(chunk)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m cleardata.store", description="import a logs CSV into a Parquet store")
+    parser.add_argument("csv", type=Path, help="hackplay_warszawa_full.csv or hackplay_warszawa_with_districts.csv")
+    parser.add_argument("root", type=Path, help="store directory (created, or appended to)")
+    parser.add_argument("--chunk-rows", type=int, default=IMPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = LogStore(args.root)
+    rows = import_csv(args.csv, store, args.chunk_rows)
+    compacted = store.compact()
+    partitions = store.partitions()
+    print(
+        f"{rows:,} rows in {time.perf_counter() - started:.1f}s; {len(partitions):,} partitions "
+        f"({compacted:,} compacted), {len(store.users.ids):,} users, "
+        f"{partitions['bytes'].sum() / 2**20:,.1f} MiB (CSV {args.csv.stat().st_size / 2**20:,.1f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
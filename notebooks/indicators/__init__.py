@@ -0,0 +1,8 @@
+"""The district indicators of the notebooks in this directory, computed in one pass over the logs.
+
+    cd notebooks
+    python -m indicators data/hackplay_warszawa_with_districts.csv --out out --fetch-green-areas
+"""
+from .engine import OUTPUT_FILES, IndicatorEngine, fetch_green_areas, read_logs, write
+
+__all__ = ["OUTPUT_FILES", "IndicatorEngine", "fetch_green_areas", "read_logs", "write"]
@@ -0,0 +1,55 @@
+"""python -m indicators LOGS --out DIR: write every indicator CSV from one read of the logs.
+
+The output directory can be loaded with backend/load_indicators.py.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from .engine import OUTPUT_FILES, IndicatorEngine, fetch_green_areas, read_logs, write
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m indicators", description=__doc__.splitlines()[0].partition(": ")[2])
+    parser.add_argument("logs", type=Path, help="hackplay_warszawa_with_districts.csv or a cleardata.store directory")
+    parser.add_argument("--out", type=Path, required=True, help="directory for the indicator CSVs")
+    green = parser.add_mutually_exclusive_group()
+    green.add_argument("--green-areas", type=Path, help="OSM green-area features (any file geopandas reads)")
+    green.add_argument("--fetch-green-areas", action="store_true", help="download green areas with osmnx")
+    parser.add_argument("--incidents", type=Path, help="CSV of district,incidents for the safety index")
+    store = parser.add_argument_group("store filters", "only with a cleardata.store directory")
+    store.add_argument("--district", dest="districts", action="append", help="repeatable; default all")
+    store.add_argument("--start", help="first timestamp, e.g. 2025-09-01")
+    store.add_argument("--end", help="end timestamp (exclusive)")
+    args = parser.parse_args()
+    where = {key: getattr(args, key) for key in ("districts", "start", "end") if getattr(args, key)}
+
+    green_areas = None
+    if args.green_areas:
+        import geopandas as gpd
+
+        green_areas = gpd.read_file(args.green_areas)
+    elif args.fetch_green_areas:
+        green_areas = fetch_green_areas()
+    incidents = pd.read_csv(args.incidents) if args.incidents else None
+
+    started = time.perf_counter()
+    try:
+        logs = read_logs(args.logs, green=green_areas is not None, **where)
+    except ValueError as e:
+        parser.error(str(e))
+    engine = IndicatorEngine(logs, green_areas, incidents)
+    del logs
+    results = engine.run()
+    write(results, args.out)
+    print(f"{len(engine.district):,} log rows, {len(engine.districts)} districts, {time.perf_counter() - started:.1f}s")
+    for name in results:
+        print(f"  {args.out / OUTPUT_FILES[name]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""Benchmark: the notebooks one by one vs the single-pass engine, on synthetic logs.
+
+Writes a synthetic hackplay_warszawa_with_districts.csv (same columns, Warsaw-shaped
+values, a sprinkling of missing and unparseable fields) and a handful of green areas,
+then runs each approach in its own process and reports wall time and peak RSS. The
+notebook side is their code transcribed cell by cell, each re-reading the CSV as the
+notebooks do; the engine runs once on the CSV and once on a cleardata.store import of
+it. Finally every output file of the runs is compared byte for byte; any difference
+exits with status 1.
+
+    cd notebooks
+    python -m indicators.benchmark --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import filecmp
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cleardata.store import LogStore, import_csv
+
+from .engine import OUTPUT_FILES, IndicatorEngine, read_logs, write
+
+DISTRICTS = [
+    "Bemowo", "Białołęka", "Bielany", "Mokotów", "Ochota", "Praga-Południe",
+    "Praga-Północ", "Rembertów", "Śródmieście", "Targówek", "Ursus", "Ursynów",
+    "Wawer", "Wesoła", "Wilanów", "Włochy", "Wola", "Żoliborz",
+]
+TECHNOLOGIES = ["2G", "3G", "4G", "5G", "NB-IoT"]
+LON, LAT = (20.85, 21.27), (52.10, 52.37)
+
+
+def synthetic_logs(path: Path, rows: int, cells: int = 4000, users: int = 150_000, days: int = 14, seed: int = 7) -> None:
+    rng = np.random.default_rng(seed)
+    cell_district = rng.integers(0, len(DISTRICTS), cells)
+    cell_lon = rng.uniform(*LON, cells).round(6)
+    cell_lat = rng.uniform(*LAT, cells).round(6)
+    cell_tech = rng.choice(len(TECHNOLOGIES), cells, p=[0.05, 0.1, 0.6, 0.24, 0.01])
+
+    # Busy cells and busy users, more traffic by day than at night.
+    cell = np.minimum(rng.zipf(1.3, rows) - 1, cells - 1)
+    cell = (cell * 7919) % cells
+    user = np.minimum(rng.zipf(1.2, rows) - 1, users - 1)
+    hour_weight = np.array([1, 1, 1, 1, 2, 4, 7, 9, 9, 8, 8, 8, 9, 9, 8, 8, 9, 10, 10, 9, 7, 5, 3, 2], dtype=float)
+    hour = rng.choice(24, rows, p=hour_weight / hour_weight.sum())
+    seconds = rng.integers(0, days, rows) * 86400 + hour * 3600 + rng.integers(0, 3600, rows)
+    start = pd.Timestamp("2025-09-01") + pd.to_timedelta(seconds, unit="s")
+
+    logs = pd.DataFrame(
+        {
+            "start_dttm": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "user_id": user + 10_000_000,
+            "cell_rk": cell + 500_000,
+            "lac": cell // 40 + 1000,
+            "cid": cell * 13 % 65536,
+            "technology": np.array(TECHNOLOGIES, dtype=object)[cell_tech[cell]],
+            "frequency": np.array([800, 1800, 2100, 2600, 3500])[cell_tech[cell]],
+            "cell_lon": cell_lon[cell],
+            "cell_lat": cell_lat[cell],
+            "cos_rk": user % 97,
+            "cos_nm": "segment_" + pd.Series(user % 97).astype(str),
+            "cos_family_nm": "family_" + pd.Series(user % 7).astype(str),
+            "district": np.array(DISTRICTS, dtype=object)[cell_district[cell]],
+        }
+    )
+    logs = logs.astype({"start_dttm": object, "user_id": "Int64", "district": object, "technology": object})
+    logs.loc[rng.random(rows) < 0.002, "start_dttm"] = "n/a"
+    logs.loc[rng.random(rows) < 0.002, "start_dttm"] = None
+    logs.loc[rng.random(rows) < 0.003, "user_id"] = pd.NA
+    logs.loc[rng.random(rows) < 0.003, "district"] = None
+    logs.loc[rng.random(rows) < 0.01, "technology"] = None
+    logs.to_csv(path, index=False)
+
+
+def synthetic_green_areas():
+    """Rectangles over parts of the city (some overlapping, one multi-part) plus a non-area feature."""
+    import geopandas as gpd
+    from shapely.geometry import LineString, MultiPolygon, box
+
+    def area(x, y, w, h):
+        x0, y0 = LON[0] + x * (LON[1] - LON[0]), LAT[0] + y * (LAT[1] - LAT[0])
+        return box(x0, y0, x0 + w * (LON[1] - LON[0]), y0 + h * (LAT[1] - LAT[0]))
+
+    geometries = [
+        area(0.10, 0.10, 0.15, 0.10),
+        area(0.20, 0.15, 0.10, 0.20),
+        area(0.55, 0.60, 0.20, 0.15),
+        MultiPolygon([area(0.70, 0.10, 0.05, 0.05), area(0.80, 0.20, 0.08, 0.06)]),
+        area(0.40, 0.40, 0.03, 0.03),
+        LineString([(LON[0], LAT[0]), (LON[1], LAT[1])]),
+    ]
+    return gpd.GeoDataFrame({"name": [f"green {i}" for i in range(len(geometries))]}, geometry=geometries, crs="EPSG:4326")
+
+
+# --- the notebooks, transcribed ----------------------------------------------------------
+
+
+def notebook_city_traffic(csv: Path, out: Path) -> None:
+    df = pd.read_csv(csv)
+    df["start_dttm"] = pd.to_datetime(df["start_dttm"], errors="coerce")
+    tmp = df.dropna(subset=["start_dttm"]).copy()
+    hours = tmp["start_dttm"].dt.hour
+
+    def time_bucket(h: int) -> str:
+        if 5 <= h < 11:
+            return "morning"
+        if 11 <= h < 17:
+            return "noon"
+        if 17 <= h < 23:
+            return "evening"
+        return "night"
+
+    tmp["time_bucket"] = hours.map(time_bucket)
+    tmp = tmp[tmp["time_bucket"].isin(["morning", "noon", "evening"])]
+    agg = (
+        tmp.groupby(["district", "time_bucket"], as_index=False)["user_id"]
+           .nunique()
+           .rename(columns={"user_id": "unique_users"})
+    )
+
+    def scale_0_100(x: pd.Series) -> pd.Series:
+        x_min, x_max = x.min(), x.max()
+        if x_max == x_min:
+            return pd.Series(100.0, index=x.index)
+        return (x - x_min) / (x_max - x_min) * 100.0
+
+    agg["score_0_100"] = (
+        agg.groupby("time_bucket")["unique_users"]
+           .transform(scale_0_100)
+           .round(1)
+    )
+    result = agg.sort_values(["time_bucket", "score_0_100"], ascending=[True, False]).reset_index(drop=True)
+    result.to_csv(out / "warsaw_district_mobility_scores.csv", index=False)
+
+
+def notebook_district_rhythm(csv: Path, out: Path) -> None:
+    df = pd.read_csv(csv)
+    df["start_dttm"] = pd.to_datetime(df["start_dttm"], errors="coerce")
+    df = df.dropna(subset=["start_dttm"])
+    df["hour"] = df["start_dttm"].dt.hour
+    hourly = (
+        df.groupby(["district", "hour"], as_index=False)["user_id"]
+          .nunique()
+          .rename(columns={"user_id": "unique_users"})
+    )
+    hourly["activity_norm"] = (
+        hourly.groupby("district")["unique_users"]
+        .transform(lambda x: (x - x.min()) / (x.max() - x.min() + 1e-9) * 100)
+    )
+    rhythm = (
+        hourly.groupby("district")
+        .agg(
+            peak_hour=("activity_norm", lambda x: x.idxmax() % 24),
+            activity_amplitude=("activity_norm", lambda x: x.max() - x.min()),
+            avg_activity=("activity_norm", "mean"),
+        )
+        .reset_index()
+    )
+    rhythm["rhythm_score"] = (
+        0.5 * rhythm["activity_amplitude"] + 0.5 * rhythm["avg_activity"]
+    ).round(1)
+    rhythm = rhythm.sort_values("rhythm_score", ascending=False)
+    rhythm.to_csv(out / "warsaw_district_rhythm.csv", index=False)
+
+
+def notebook_social_availability(csv: Path, out: Path) -> None:
+    df = pd.read_csv(csv)
+    df["start_dttm"] = pd.to_datetime(df["start_dttm"], errors="coerce")
+    df["hour"] = df["start_dttm"].dt.hour
+    hourly = (
+        df.groupby(["district", "hour"], as_index=False)["user_id"]
+          .nunique()
+          .rename(columns={"user_id": "unique_users"})
+    )
+    hourly["norm_activity"] = (
+        hourly.groupby("district")["unique_users"]
+              .transform(lambda x: x / x.max() if x.max() > 0 else 0)
+    )
+    threshold = 0.3
+    active_hours = (
+        hourly.groupby("district")["norm_activity"]
+              .apply(lambda x: (x > threshold).sum())
+              .reset_index(name="active_hours")
+    )
+    vals = active_hours["active_hours"]
+    active_hours["social_availability_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+    active_hours = active_hours.sort_values("social_availability_score", ascending=False)
+    active_hours.to_csv(out / "warsaw_social_availability.csv", index=False)
+
+
+def notebook_digital_noise(csv: Path, out: Path) -> None:
+    df = pd.read_csv(csv)
+    tech_weight = {"5G": 1.3, "4G": 1.0, "3G": 0.6, "2G": 0.3}
+    df["tech_weight"] = df["technology"].map(tech_weight).fillna(1.0)
+    agg = (
+        df.groupby("district", as_index=False)
+          .agg(
+              total_obs=("user_id", "count"),
+              unique_users=("user_id", "nunique"),
+              avg_tech_weight=("tech_weight", "mean"),
+          )
+    )
+    agg["noise_index_raw"] = (agg["total_obs"] / agg["unique_users"]) * agg["avg_tech_weight"]
+    vals = agg["noise_index_raw"]
+    agg["digital_noise_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+    agg = agg.sort_values("digital_noise_score", ascending=False).reset_index(drop=True)
+    agg.to_csv(out / "warsaw_digital_noise.csv", index=False)
+
+
+def notebook_green_places(csv: Path, out: Path, green) -> None:
+    import geopandas as gpd
+
+    df = pd.read_csv(csv)
+    gdf = gpd.GeoDataFrame(
+        df,
+        geometry=gpd.points_from_xy(df["cell_lon"], df["cell_lat"]),
+        crs="EPSG:4326",
+    )
+    green = green[green.geometry.type.isin(["Polygon", "MultiPolygon"])].to_crs("EPSG:4326")
+    green = green.explode(index_parts=False, ignore_index=True)
+    green = green.set_geometry(green.geometry.buffer(0))
+    green = green.reset_index(drop=True)
+    green["green_id"] = green.index
+    joined = gpd.sjoin(
+        gdf,
+        green[["green_id", "geometry"]],
+        how="left",
+        predicate="intersects",
+    )
+    joined["is_green"] = joined["green_id"].notna()
+    green_stats = (
+        joined.groupby("district", as_index=False)
+              .agg(
+                  total_obs=("user_id", "count"),
+                  green_obs=("is_green", "sum"),
+                  unique_users=("user_id", "nunique")
+              )
+    )
+    green_stats["green_ratio"] = (green_stats["green_obs"] / green_stats["total_obs"]).fillna(0)
+    green_stats["green_life_score"] = (green_stats["green_ratio"] * 100).round(1)
+    green_stats = green_stats.sort_values("green_life_score", ascending=False).reset_index(drop=True)
+    green_stats.to_csv(out / "warsaw_green_places", index=False)
+
+
+def notebook_life_balance(out: Path) -> None:
+    presence_df = pd.read_csv(out / "warsaw_digital_noise.csv")
+    presence_df["presence_ratio"] = presence_df["unique_users"] / presence_df["total_obs"]
+    presence_df["inverse_noise"] = 100 - presence_df["digital_noise_score"]
+    presence_df["life_balance_raw"] = (
+        0.6 * presence_df["presence_ratio"].rank(pct=True) * 100 + 0.4 * presence_df["inverse_noise"]
+    )
+    vals = presence_df["life_balance_raw"]
+    presence_df["life_balance_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+    presence_df = presence_df.sort_values("life_balance_score", ascending=False).reset_index(drop=True)
+    # The notebook leaves this write commented out; written here to compare it.
+    presence_df.to_csv(out / "warsaw_life_balance.csv", index=False)
+
+
+def notebook_social_life(csv: Path, out: Path) -> None:
+    df = pd.read_csv(csv)
+    slot = "15min"
+    min_slots_per_district = 50
+    lower_q, upper_q = 0.05, 0.95
+    df["start_dttm"] = pd.to_datetime(df["start_dttm"], errors="coerce")
+    tmp = df.dropna(subset=["start_dttm"]).copy()
+    tmp["time_slot"] = tmp["start_dttm"].dt.floor(slot)
+    g = (
+        tmp.groupby(["district", "cell_rk", "time_slot"], as_index=False)["user_id"]
+           .nunique()
+           .rename(columns={"user_id": "n_users"})
+    )
+    g["co_presence"] = g["n_users"] * (g["n_users"] - 1) / 2
+
+    def winsorize_cell(s: pd.Series, lq=0.01, uq=0.99):
+        lo = s.quantile(lq)
+        hi = s.quantile(uq)
+        return s.clip(lo, hi)
+
+    g["co_presence_w"] = g.groupby(["district", "cell_rk"])["co_presence"].transform(winsorize_cell)
+    cell_medians = (
+        g.groupby(["district", "cell_rk"], as_index=False)["co_presence_w"]
+         .median()
+         .rename(columns={"co_presence_w": "cell_median_copres"})
+    )
+    district_cells = cell_medians.groupby("district")["cell_rk"].nunique().rename("n_active_cells")
+    district_score = (
+        cell_medians.groupby("district", as_index=False)["cell_median_copres"].median()
+                    .rename(columns={"cell_median_copres": "median_copres_per_cell"})
+        .merge(district_cells, on="district", how="left")
+    )
+    district_score["normalized_copres"] = district_score["median_copres_per_cell"] * np.sqrt(district_score["n_active_cells"])
+    slots_per_district = g.groupby("district")["time_slot"].nunique().rename("n_slots")
+    district_score = district_score.merge(slots_per_district, on="district", how="left")
+    district_score = district_score[district_score["n_slots"] >= min_slots_per_district].copy()
+    vals = district_score["normalized_copres"]
+    lo, hi = vals.quantile(lower_q), vals.quantile(upper_q)
+    if hi == lo:
+        district_score["social_life_score"] = 100.0
+    else:
+        district_score["social_life_score"] = ((vals.clip(lo, hi) - lo) / (hi - lo) * 100).round(1)
+    social_life = (
+        district_score[["district", "social_life_score", "median_copres_per_cell", "n_active_cells", "n_slots"]]
+        .sort_values("social_life_score", ascending=False)
+        .reset_index(drop=True)
+    )
+    social_life.to_csv(out / "warsaw_social_life_scores.csv", index=False)
+
+
+def notebook_sociotech(csv: Path, out: Path) -> None:
+    """ml_dl/sociotech_index up to district_indicators.csv (the autoencoder is not an indicator)."""
+    # The notebook looks for warsaw_green_places.csv; green_places writes it without the suffix.
+    OPTIONAL_GREEN = out / "warsaw_green_places"
+
+    df = pd.read_csv(csv, usecols=["start_dttm", "user_id", "technology", "district"], low_memory=False)
+    df["start_dttm"] = pd.to_datetime(df["start_dttm"], errors="coerce")
+    df = df.dropna(subset=["start_dttm", "district", "user_id"]).copy()
+    df["hour"] = df["start_dttm"].dt.hour
+
+    def scale_0_100(s: pd.Series):
+        s = s.astype(float)
+        mn, mx = s.min(), s.max()
+        if pd.isna(mn) or mx == mn:
+            return pd.Series(100.0, index=s.index)
+        return (s - mn) / (mx - mn) * 100
+
+    def time_bucket(h: int) -> str:
+        if 5 <= h < 11:  return "morning"
+        if 11 <= h < 17: return "noon"
+        if 17 <= h < 23: return "evening"
+        return "night"
+
+    df["time_bucket"] = df["hour"].map(time_bucket)
+    traffic = (
+        df[df["time_bucket"].isin(["morning", "noon", "evening"])]
+          .groupby(["district", "time_bucket"])["user_id"].nunique()
+          .reset_index(name="unique_users")
+    )
+    traffic_score = (
+        traffic.groupby("district")["unique_users"].sum()
+               .pipe(scale_0_100)
+               .rename("city_traffic")
+    )
+    df["slot_30"] = df["start_dttm"].dt.floor("30min")
+    dt = df.groupby(["district", "slot_30"])["user_id"].nunique().rename("n").reset_index()
+    dt["copres"] = dt["n"] * (dt["n"] - 1) / 2
+    social_life = (
+        dt.groupby("district")["copres"].median()
+          .pipe(scale_0_100)
+          .rename("social_life")
+    )
+    hourly = df.groupby(["district", "hour"])["user_id"].nunique().unstack(fill_value=0)
+    hourly_norm = hourly.div(hourly.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+    amplitude = (hourly_norm.max(axis=1) - hourly_norm.min(axis=1))
+    avg_act = hourly_norm.mean(axis=1)
+    rhythm_raw = 0.5*amplitude + 0.5*avg_act
+    rhythm = scale_0_100(rhythm_raw).rename("rhythm")
+    active_hours = (hourly_norm > 0.3).sum(axis=1)
+    social_availability = scale_0_100(active_hours).rename("social_availability")
+    tech_w = {"5G": 1.3, "4G": 1.0, "3G": 0.6, "2G": 0.3}
+    df["tech_weight"] = df["technology"].map(tech_w).fillna(1.0)
+    noise_agg = (df.groupby("district")
+                   .agg(total_obs=("user_id", "count"),
+                        unique_users=("user_id", "nunique"),
+                        avg_tech_weight=("tech_weight", "mean")))
+    noise_raw = (noise_agg["total_obs"] / noise_agg["unique_users"].replace(0, np.nan)) * noise_agg["avg_tech_weight"]
+    digital_noise = scale_0_100(noise_raw.fillna(0)).rename("digital_noise")
+    presence_ratio = (noise_agg["unique_users"] / noise_agg["total_obs"].replace(0, np.nan)).fillna(0)
+    presence_rank = (presence_ratio.rank(pct=True)*100)
+    inverse_noise = 100 - digital_noise
+    life_balance = scale_0_100(0.6*presence_rank + 0.4*inverse_noise).rename("life_balance")
+    if OPTIONAL_GREEN.exists():
+        g = pd.read_csv(OPTIONAL_GREEN)
+        green = g.set_index("district")["green_life_score"]
+    else:
+        green = pd.Series(np.nan, index=hourly_norm.index, name="green_life")
+    safety = pd.Series(np.nan, index=hourly_norm.index, name="safety_index")
+    ind = pd.DataFrame(index=hourly_norm.index)
+    ind["city_traffic"] = traffic_score
+    ind["social_life"] = social_life
+    ind["rhythm"] = rhythm
+    ind["green_life"] = green.reindex(ind.index)
+    ind["digital_noise"] = digital_noise
+    ind["life_balance"] = life_balance
+    ind["social_availability"] = social_availability
+    ind["safety_index"] = safety.reindex(ind.index)
+    ind.reset_index(names="district", inplace=True)
+    ind.to_csv(out / "district_indicators.csv", index=False)
+
+
+def run_notebooks(csv: Path, out: Path) -> None:
+    notebook_city_traffic(csv, out)
+    notebook_district_rhythm(csv, out)
+    notebook_social_availability(csv, out)
+    notebook_digital_noise(csv, out)
+    notebook_green_places(csv, out, synthetic_green_areas())
+    notebook_life_balance(out)
+    notebook_social_life(csv, out)
+    notebook_sociotech(csv, out)
+
+
+def run_engine(logs: Path, out: Path) -> None:
+    engine = IndicatorEngine(read_logs(logs), synthetic_green_areas())
+    write(engine.run(), out)
+
+
+# The engine again, reading a cleardata.store import of the same logs.
+APPROACHES = {"notebooks": run_notebooks, "engine": run_engine, "engine-store": run_engine}
+
+
+def peak_rss_mb() -> float:
+    """This process's peak RSS. ru_maxrss would carry over the parent's, which holds the synthetic logs."""
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    kb = next(line.split()[1] for line in status.splitlines() if line.startswith("VmHWM:"))
+    return int(kb) / 1024
+
+
+def measure(approach: str, csv: Path, out: Path) -> dict:
+    """Run one approach in a fresh interpreter so its peak RSS is its own."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "indicators.benchmark", "--run", approach, "--logs", str(csv), "--out", str(out)],
+        check=True, capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--logs", type=Path, help="benchmark on this CSV instead of synthetic logs")
+    parser.add_argument("--run", choices=APPROACHES, help=argparse.SUPPRESS)
+    parser.add_argument("--out", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        args.out.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        APPROACHES[args.run](args.logs, args.out)
+        seconds = time.perf_counter() - started
+        print(json.dumps({"seconds": seconds, "peak_mb": peak_rss_mb()}))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv = args.logs
+        if csv is None:
+            csv = tmp / "hackplay_warszawa_with_districts.csv"
+            synthetic_logs(csv, args.rows)
+        print(f"logs: {csv} ({csv.stat().st_size / 2**20:,.0f} MiB)")
+        store = LogStore(tmp / "store")
+        started = time.perf_counter()
+        import_csv(csv, store)
+        store.compact()
+        stored = store.partitions()["bytes"].sum()
+        print(f"store: {stored / 2**20:,.0f} MiB, imported in {time.perf_counter() - started:.1f}s")
+
+        sources = {"notebooks": csv, "engine": csv, "engine-store": store.root}
+        results = {name: measure(name, sources[name], tmp / name) for name in APPROACHES}
+        print(f"{'approach':<12} {'seconds':>9} {'peak MiB':>9}")
+        for name, result in results.items():
+            print(f"{name:<12} {result['seconds']:>9.2f} {result['peak_mb']:>9.0f}")
+        base = results["notebooks"]
+        for name in ("engine", "engine-store"):
+            fast = results[name]
+            print(f"{name}: {base['seconds'] / fast['seconds']:.1f}x faster, {base['peak_mb'] / fast['peak_mb']:.1f}x less memory")
+
+        mismatched = [
+            f"{file} ({name})" for name in ("engine", "engine-store") for file in OUTPUT_FILES.values()
+            if not filecmp.cmp(tmp / "notebooks" / file, tmp / name / file, shallow=False)
+        ]
+        if mismatched:
+            sys.exit(f"outputs differ: {', '.join(mismatched)}")
+        print(f"all {len(OUTPUT_FILES)} outputs identical")
+
+
+if __name__ == "__main__":
+    main()
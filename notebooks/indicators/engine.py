@@ -0,0 +1,502 @@
+"""Single-pass indicator engine: every log-based indicator from one read of the district logs.
+
+The notebooks in notebooks/indicators (and ml_dl/sociotech_index) each re-read
+hackplay_warszawa_with_districts.csv, re-parse start_dttm and rebuild the same
+(district, hour) unique-user table. Here the logs are read once into compact columns
+(sorted-categorical district, integer-coded users and cells, one parsed timestamp) and
+the shared intermediates are built once:
+
+- distinct (district, hour, user): hourly unique users, and via the hour -> time bucket
+  map the per-bucket unique users of city_traffic and the sociotech features
+- distinct (district, cell, 15-minute slot, user): social_life's co-presence table, and
+  the 30-minute slots of the sociotech features
+- per-row tech weights
+
+Each indicator then applies its notebook's formulas unchanged to those small tables,
+so the outputs match the notebooks row for row.
+"""
+from __future__ import annotations
+
+import io
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+LOG_COLUMNS = ["start_dttm", "user_id", "technology", "district", "cell_rk"]
+# Only needed for green_places.
+CELL_COORDINATES = ["cell_lon", "cell_lat"]
+READ_CHUNK_ROWS = 250_000
+
+TECH_WEIGHT = {"5G": 1.3, "4G": 1.0, "3G": 0.6, "2G": 0.3}
+TIME_BUCKETS = ("morning", "noon", "evening")
+ACTIVE_THRESHOLD = 0.3
+SOCIAL_SLOT = "15min"
+MIN_SLOTS_PER_DISTRICT = 50
+SOCIAL_LOWER_Q, SOCIAL_UPPER_Q = 0.05, 0.95
+GREEN_TAGS = {
+    "leisure": ["park", "garden", "recreation_ground"],
+    "landuse": ["forest", "grass", "meadow"],
+}
+
+# Indicator -> the file its notebook writes (warsaw_green_places has no extension there
+# either); notebooks/ml_dl/sociotech_index writes the features as district_indicators.csv.
+OUTPUT_FILES = {
+    "city_traffic": "warsaw_district_mobility_scores.csv",
+    "district_rhythm": "warsaw_district_rhythm.csv",
+    "social_availability": "warsaw_social_availability.csv",
+    "digital_noise": "warsaw_digital_noise.csv",
+    "green_places": "warsaw_green_places",
+    "social_life": "warsaw_social_life_scores.csv",
+    "life_balance": "warsaw_life_balance.csv",
+    "sociotech": "district_indicators.csv",
+}
+
+
+def time_bucket(h: int) -> str:
+    if 5 <= h < 11:
+        return "morning"
+    if 11 <= h < 17:
+        return "noon"
+    if 17 <= h < 23:
+        return "evening"
+    return "night"
+
+
+_HOUR_BUCKET = np.array([time_bucket(h) for h in range(24)], dtype=object)
+
+
+def scale_0_100(s: pd.Series) -> pd.Series:
+    """Min-max to 0-100; a constant series scores 100 (city_traffic, sociotech_index)."""
+    s = s.astype(float)
+    mn, mx = s.min(), s.max()
+    if pd.isna(mn) or mx == mn:
+        return pd.Series(100.0, index=s.index)
+    return (s - mn) / (mx - mn) * 100
+
+
+def read_logs(path: Union[str, Path], green: bool = True, chunk_rows: int = READ_CHUNK_ROWS, **where) -> pd.DataFrame:
+    """The columns the indicators use, read once, from the logs CSV or a cleardata.store directory.
+
+    A CSV is parsed in chunks: in one go the parser's buffers take several times the frame
+    itself. A store reads just these columns, and ``where`` (districts, start, end; see
+    LogStore.read) narrows it to the matching partitions.
+    """
+    columns = LOG_COLUMNS + (CELL_COORDINATES if green else [])
+    if Path(path).is_dir():
+        from cleardata.store import LogStore
+
+        return LogStore(path).read(columns=columns, **where)
+    if where:
+        raise ValueError("district and time filters need a cleardata.store directory, not a CSV")
+    chunks = pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def prepare_green_areas(features):
+    """green_places' polygon set from raw OSM features: polygons only, exploded, made valid."""
+    green = features[features.geometry.type.isin(["Polygon", "MultiPolygon"])].to_crs("EPSG:4326")
+    green = green.explode(index_parts=False, ignore_index=True)
+    green = green.set_geometry(green.geometry.buffer(0))
+    green = green.reset_index(drop=True)
+    green["green_id"] = green.index
+    return green
+
+
+def fetch_green_areas(place: str = "Warszawa, Polska"):
+    """Parks, gardens, forests and meadows of ``place`` from OpenStreetMap (needs osmnx)."""
+    import osmnx as ox
+
+    return ox.features_from_place(place, tags=GREEN_TAGS)
+
+
+def _names(categories: pd.Index, codes: np.ndarray) -> np.ndarray:
+    return categories.take(codes).to_numpy()
+
+
+def _winsorize(values: np.ndarray, groups: np.ndarray, lq: float, uq: float) -> np.ndarray:
+    """``values`` clipped to their group's lq/uq quantiles, for all groups at once.
+
+    social_life does this with a Python function per (district, cell) group. Series.quantile
+    is np.quantile over a one-row 2-D array; stacking the groups of equal size into one
+    array and making the same call gives the same bounds, bit for bit.
+    """
+    order = np.argsort(groups, kind="stable")
+    sizes = np.bincount(groups)
+    starts = np.cumsum(sizes) - sizes
+    grouped = values[order]
+    lo, hi = np.empty(len(sizes)), np.empty(len(sizes))
+    for size in np.unique(sizes):
+        members = np.flatnonzero(sizes == size)
+        block = grouped[starts[members, None] + np.arange(size)]
+        lo[members], hi[members] = np.quantile(block, [lq, uq], axis=1, method="linear")
+    return np.clip(values, lo[groups], hi[groups])
+
+
+def _read_back(frame: pd.DataFrame) -> pd.DataFrame:
+    """``frame`` as read_csv returns it after to_csv; life_balance starts from the digital_noise file."""
+    return pd.read_csv(io.StringIO(frame.to_csv(index=False)))
+
+
+class IndicatorEngine:
+    """All indicators from one DataFrame of logs (see read_logs).
+
+    ``green_areas`` are raw OSM features (see fetch_green_areas); without them
+    green_places is skipped and the sociotech green_life column is empty, as in the
+    notebook when warsaw_green_places.csv is missing. ``incidents`` (district,
+    incidents) feeds the sociotech safety_index the same way.
+    """
+
+    def __init__(self, logs: pd.DataFrame, green_areas=None, incidents: Optional[pd.DataFrame] = None) -> None:
+        district = logs["district"].astype("category")
+        # Codes in name order, so grouping by code sorts like grouping by name.
+        district = district.cat.set_categories(sorted(district.cat.categories))
+        self.districts = district.cat.categories
+        self.district = district.cat.codes.to_numpy()
+        self.user = pd.factorize(logs["user_id"])[0]
+        self.cell, self.cells = pd.factorize(logs["cell_rk"])
+
+        start = pd.to_datetime(logs["start_dttm"], errors="coerce")
+        self.valid = start.notna().to_numpy()
+        self.hour = start.dt.hour.fillna(-1).to_numpy(dtype=np.int8)
+        self.slot, self.slots = pd.factorize(start.dt.floor(SOCIAL_SLOT))
+
+        weight = logs["technology"].map(TECH_WEIGHT).astype(float).fillna(1.0)
+        self.tech_weight = weight.to_numpy()
+
+        self.point = None
+        if green_areas is not None:
+            # One intersection test per distinct cell position instead of per row.
+            lon, lons = pd.factorize(logs["cell_lon"], use_na_sentinel=False)
+            lat, lats = pd.factorize(logs["cell_lat"], use_na_sentinel=False)
+            self.point, pairs = pd.factorize(lon.astype(np.int64) * len(lats) + lat)
+            self.points = (lons.take(pairs // len(lats)), lats.take(pairs % len(lats)))
+        self.green_areas = green_areas
+        self.incidents = incidents
+
+    # --- shared intermediates ---------------------------------------------------------
+
+    @cached_property
+    def hour_users(self) -> pd.DataFrame:
+        """Distinct (district, hour, user) over parsed rows with a district; user -1 is a missing id."""
+        keep = self.valid & (self.district >= 0)
+        return pd.DataFrame(
+            {"district": self.district[keep], "hour": self.hour[keep], "user": self.user[keep]}
+        ).drop_duplicates(ignore_index=True)
+
+    @cached_property
+    def slot_users(self) -> pd.DataFrame:
+        """Distinct (district, cell, 15-minute slot, user) over parsed rows with a district."""
+        keep = self.valid & (self.district >= 0)
+        return pd.DataFrame(
+            {
+                "district": self.district[keep],
+                "cell": self.cell[keep],
+                "slot": self.slot[keep],
+                "user": self.user[keep],
+            }
+        ).drop_duplicates(ignore_index=True)
+
+    @staticmethod
+    def _unique_users(distinct: pd.DataFrame, keys: list, name: str) -> pd.DataFrame:
+        """Per key group, distinct non-missing users: what groupby(keys)["user_id"].nunique() gives."""
+        counted = distinct.assign(**{name: distinct["user"] >= 0})
+        return counted.groupby(keys, as_index=False, sort=True)[name].sum()
+
+    @cached_property
+    def hourly(self) -> pd.DataFrame:
+        """The notebooks' ``hourly`` table: district, hour, unique_users, in groupby order."""
+        counts = self._unique_users(self.hour_users, ["district", "hour"], "unique_users")
+        return pd.DataFrame(
+            {
+                "district": _names(self.districts, counts["district"].to_numpy()),
+                "hour": counts["hour"].to_numpy(dtype=np.int32),
+                "unique_users": counts["unique_users"].to_numpy(dtype=np.int64),
+            }
+        )
+
+    @cached_property
+    def hourly_known(self) -> pd.DataFrame:
+        """``hourly`` restricted to rows with a user id (hours where every id is missing drop out)."""
+        return self.hourly[self.hourly["unique_users"] > 0]
+
+    def bucket_users(self, known_users_only: bool = False) -> pd.DataFrame:
+        """Per (district, time_bucket), unique users in the morning/noon/evening buckets."""
+        distinct = self.hour_users
+        if known_users_only:
+            distinct = distinct[distinct["user"] >= 0]
+        buckets = distinct.assign(time_bucket=_HOUR_BUCKET[distinct["hour"].to_numpy()])
+        buckets = buckets[buckets["time_bucket"].isin(TIME_BUCKETS)]
+        buckets = buckets.drop(columns="hour").drop_duplicates(ignore_index=True)
+        counts = self._unique_users(buckets, ["district", "time_bucket"], "unique_users")
+        counts["district"] = _names(self.districts, counts["district"].to_numpy())
+        counts["unique_users"] = counts["unique_users"].astype(np.int64)
+        return counts.sort_values(["district", "time_bucket"], ignore_index=True)
+
+    def _district_totals(self, mask: np.ndarray) -> pd.DataFrame:
+        """total_obs, unique_users and avg_tech_weight per district over the ``mask`` rows."""
+        district = self.district[mask]
+        user = self.user[mask]
+        known = user >= 0
+        total = np.bincount(district[known], minlength=len(self.districts))
+        pairs = pd.DataFrame({"district": district[known], "user": user[known]}).drop_duplicates()
+        unique = np.bincount(pairs["district"].to_numpy(), minlength=len(self.districts))
+        # pandas' grouped mean over rows in file order (a store reads them back in it), so
+        # the float sums match the notebooks' bit for bit.
+        weight = pd.Series(self.tech_weight[mask]).groupby(district, sort=True).mean()
+        present = weight.index.to_numpy()
+        return pd.DataFrame(
+            {
+                "district": _names(self.districts, present),
+                "total_obs": total[present].astype(np.int64),
+                "unique_users": unique[present].astype(np.int64),
+                "avg_tech_weight": weight.to_numpy(),
+            }
+        )
+
+    # --- indicators ---------------------------------------------------------------------
+
+    def city_traffic(self) -> pd.DataFrame:
+        agg = self.bucket_users()
+        agg["score_0_100"] = (
+            agg.groupby("time_bucket")["unique_users"]
+               .transform(scale_0_100)
+               .round(1)
+        )
+        return agg.sort_values(["time_bucket", "score_0_100"], ascending=[True, False]).reset_index(drop=True)
+
+    def district_rhythm(self) -> pd.DataFrame:
+        hourly = self.hourly.copy()
+        hourly["activity_norm"] = (
+            hourly.groupby("district")["unique_users"]
+            .transform(lambda x: (x - x.min()) / (x.max() - x.min() + 1e-9) * 100)
+        )
+        rhythm = (
+            hourly.groupby("district")
+            .agg(
+                # As in the notebook: the row label of the maximum, modulo 24.
+                peak_hour=("activity_norm", lambda x: x.idxmax() % 24),
+                activity_amplitude=("activity_norm", lambda x: x.max() - x.min()),
+                avg_activity=("activity_norm", "mean"),
+            )
+            .reset_index()
+        )
+        rhythm["rhythm_score"] = (0.5 * rhythm["activity_amplitude"] + 0.5 * rhythm["avg_activity"]).round(1)
+        return rhythm.sort_values("rhythm_score", ascending=False)
+
+    def social_availability(self) -> pd.DataFrame:
+        hourly = self.hourly.copy()
+        hourly["norm_activity"] = (
+            hourly.groupby("district")["unique_users"]
+                  .transform(lambda x: x / x.max() if x.max() > 0 else 0)
+        )
+        active_hours = (
+            hourly.groupby("district")["norm_activity"]
+                  .apply(lambda x: (x > ACTIVE_THRESHOLD).sum())
+                  .reset_index(name="active_hours")
+        )
+        vals = active_hours["active_hours"]
+        active_hours["social_availability_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+        return active_hours.sort_values("social_availability_score", ascending=False)
+
+    def digital_noise(self) -> pd.DataFrame:
+        # Every row with a district, parsed timestamp or not, as in the notebook.
+        agg = self._district_totals(self.district >= 0)
+        agg["noise_index_raw"] = (agg["total_obs"] / agg["unique_users"]) * agg["avg_tech_weight"]
+        vals = agg["noise_index_raw"]
+        agg["digital_noise_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+        return agg.sort_values("digital_noise_score", ascending=False).reset_index(drop=True)
+
+    def life_balance(self, digital_noise: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        presence_df = _read_back(digital_noise if digital_noise is not None else self.digital_noise())
+        presence_df["presence_ratio"] = presence_df["unique_users"] / presence_df["total_obs"]
+        presence_df["inverse_noise"] = 100 - presence_df["digital_noise_score"]
+        presence_df["life_balance_raw"] = (
+            0.6 * presence_df["presence_ratio"].rank(pct=True) * 100 + 0.4 * presence_df["inverse_noise"]
+        )
+        vals = presence_df["life_balance_raw"]
+        presence_df["life_balance_score"] = ((vals - vals.min()) / (vals.max() - vals.min()) * 100).round(1)
+        return presence_df.sort_values("life_balance_score", ascending=False).reset_index(drop=True)
+
+    def green_places(self) -> Optional[pd.DataFrame]:
+        if self.green_areas is None:
+            return None
+        import geopandas as gpd
+
+        green = prepare_green_areas(self.green_areas)
+        points = gpd.GeoDataFrame(
+            {"point": np.arange(len(self.points[0]))},
+            geometry=gpd.points_from_xy(*self.points),
+            crs="EPSG:4326",
+        )
+        joined = gpd.sjoin(points, green[["green_id", "geometry"]], how="inner", predicate="intersects")
+        # A left join repeats a row once per green area it falls in.
+        matches = np.bincount(joined["point"].to_numpy(), minlength=len(self.points[0]))[self.point]
+
+        rows = self.district >= 0
+        district = self.district[rows]
+        matches = matches[rows]
+        known = self.user[rows] >= 0
+        size = len(self.districts)
+        total = np.bincount(district[known], weights=np.maximum(matches[known], 1), minlength=size)
+        green_obs = np.bincount(district, weights=matches, minlength=size)
+        totals = self._district_totals(rows)
+        present = self.districts.get_indexer(totals["district"])
+
+        green_stats = pd.DataFrame(
+            {
+                "district": totals["district"],
+                "total_obs": total[present].astype(np.int64),
+                "green_obs": green_obs[present].astype(np.int64),
+                "unique_users": totals["unique_users"],
+            }
+        )
+        green_stats["green_ratio"] = (green_stats["green_obs"] / green_stats["total_obs"]).fillna(0)
+        green_stats["green_life_score"] = (green_stats["green_ratio"] * 100).round(1)
+        return green_stats.sort_values("green_life_score", ascending=False).reset_index(drop=True)
+
+    def social_life(self) -> pd.DataFrame:
+        distinct = self.slot_users[self.slot_users["cell"] >= 0]
+        counts = self._unique_users(distinct, ["district", "cell", "slot"], "n_users")
+        g = pd.DataFrame(
+            {
+                "district": _names(self.districts, counts["district"].to_numpy()),
+                "cell_rk": self.cells.take(counts["cell"].to_numpy()),
+                "time_slot": self.slots.take(counts["slot"].to_numpy()),
+                "n_users": counts["n_users"].to_numpy(dtype=np.int64),
+            }
+        ).sort_values(["district", "cell_rk", "time_slot"], ignore_index=True)
+        g["co_presence"] = g["n_users"] * (g["n_users"] - 1) / 2
+        g["co_presence_w"] = _winsorize(
+            g["co_presence"].to_numpy(), g.groupby(["district", "cell_rk"]).ngroup().to_numpy(), 0.01, 0.99
+        )
+        cell_medians = (
+            g.groupby(["district", "cell_rk"], as_index=False)["co_presence_w"]
+             .median()
+             .rename(columns={"co_presence_w": "cell_median_copres"})
+        )
+        district_cells = cell_medians.groupby("district")["cell_rk"].nunique().rename("n_active_cells")
+        district_score = (
+            cell_medians.groupby("district", as_index=False)["cell_median_copres"].median()
+                        .rename(columns={"cell_median_copres": "median_copres_per_cell"})
+            .merge(district_cells, on="district", how="left")
+        )
+        district_score["normalized_copres"] = (
+            district_score["median_copres_per_cell"] * np.sqrt(district_score["n_active_cells"])
+        )
+        slots_per_district = g.groupby("district")["time_slot"].nunique().rename("n_slots")
+        district_score = district_score.merge(slots_per_district, on="district", how="left")
+        district_score = district_score[district_score["n_slots"] >= MIN_SLOTS_PER_DISTRICT].copy()
+
+        vals = district_score["normalized_copres"]
+        lo, hi = vals.quantile(SOCIAL_LOWER_Q), vals.quantile(SOCIAL_UPPER_Q)
+        if hi == lo:
+            district_score["social_life_score"] = 100.0
+        else:
+            district_score["social_life_score"] = ((vals.clip(lo, hi) - lo) / (hi - lo) * 100).round(1)
+        return (
+            district_score[["district", "social_life_score", "median_copres_per_cell", "n_active_cells", "n_slots"]]
+            .sort_values("social_life_score", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def sociotech(self, green_places: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """The feature table ml_dl/sociotech_index trains its autoencoder on.
+
+        That notebook first drops rows without a timestamp, district or user id.
+        """
+        traffic = self.bucket_users(known_users_only=True)
+        traffic_score = (
+            traffic.groupby("district")["unique_users"].sum()
+                   .pipe(scale_0_100)
+                   .rename("city_traffic")
+        )
+
+        known = self.slot_users[self.slot_users["user"] >= 0]
+        half_hours = pd.DataFrame(
+            {
+                "district": known["district"].to_numpy(),
+                "slot_30": self.slots.take(known["slot"].to_numpy()).floor("30min"),
+                "user": known["user"].to_numpy(),
+            }
+        ).drop_duplicates()
+        dt = half_hours.groupby(["district", "slot_30"]).size().rename("n").reset_index()
+        dt["district"] = _names(self.districts, dt["district"].to_numpy())
+        dt["copres"] = dt["n"] * (dt["n"] - 1) / 2
+        social_life = (
+            dt.groupby("district")["copres"].median()
+              .pipe(scale_0_100)
+              .rename("social_life")
+        )
+
+        known_hours = self.hourly_known
+        hourly = known_hours.set_index(["district", "hour"])["unique_users"].unstack(fill_value=0)
+        hourly_norm = hourly.div(hourly.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+        amplitude = (hourly_norm.max(axis=1) - hourly_norm.min(axis=1))
+        avg_act = hourly_norm.mean(axis=1)
+        rhythm_raw = 0.5 * amplitude + 0.5 * avg_act
+        rhythm = scale_0_100(rhythm_raw).rename("rhythm")
+
+        active_hours = (hourly_norm > ACTIVE_THRESHOLD).sum(axis=1)
+        social_availability = scale_0_100(active_hours).rename("social_availability")
+
+        rows = self.valid & (self.district >= 0) & (self.user >= 0)
+        noise_agg = self._district_totals(rows).set_index("district")
+        noise_raw = (noise_agg["total_obs"] / noise_agg["unique_users"].replace(0, np.nan)) * noise_agg["avg_tech_weight"]
+        digital_noise = scale_0_100(noise_raw.fillna(0)).rename("digital_noise")
+
+        presence_ratio = (noise_agg["unique_users"] / noise_agg["total_obs"].replace(0, np.nan)).fillna(0)
+        presence_rank = (presence_ratio.rank(pct=True) * 100)
+        inverse_noise = 100 - digital_noise
+        life_balance = scale_0_100(0.6 * presence_rank + 0.4 * inverse_noise).rename("life_balance")
+
+        if green_places is not None:
+            green = green_places.set_index("district")["green_life_score"]
+        else:
+            green = pd.Series(np.nan, index=hourly_norm.index, name="green_life")
+        if self.incidents is not None:
+            inc = self.incidents.set_index("district")["incidents"]
+            inc_norm = (inc - inc.min()) / (inc.max() - inc.min() + 1e-9)
+            safety = ((1 - inc_norm) * 100).rename("safety_index")
+        else:
+            safety = pd.Series(np.nan, index=hourly_norm.index, name="safety_index")
+
+        ind = pd.DataFrame(index=hourly_norm.index)
+        ind["city_traffic"] = traffic_score
+        ind["social_life"] = social_life
+        ind["rhythm"] = rhythm
+        ind["green_life"] = green.reindex(ind.index)
+        ind["digital_noise"] = digital_noise
+        ind["life_balance"] = life_balance
+        ind["social_availability"] = social_availability
+        ind["safety_index"] = safety.reindex(ind.index)
+        ind.reset_index(names="district", inplace=True)
+        return ind
+
+    def run(self) -> Dict[str, pd.DataFrame]:
+        """Every indicator, keyed like OUTPUT_FILES; green_places only with green areas."""
+        results: Dict[str, pd.DataFrame] = {}
+        steps: Dict[str, Callable[[], Optional[pd.DataFrame]]] = {
+            "city_traffic": self.city_traffic,
+            "district_rhythm": self.district_rhythm,
+            "social_availability": self.social_availability,
+            "digital_noise": self.digital_noise,
+            "green_places": self.green_places,
+            "social_life": self.social_life,
+            "life_balance": lambda: self.life_balance(results["digital_noise"]),
+            "sociotech": lambda: self.sociotech(results.get("green_places")),
+        }
+        for name, step in steps.items():
+            result = step()
+            if result is not None:
+                results[name] = result
+        return results
+
+
+def write(results: Dict[str, pd.DataFrame], directory: Union[str, Path]) -> None:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, frame in results.items():
+        frame.to_csv(directory / OUTPUT_FILES[name], index=False)